@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 import yaml
 from pydantic import BaseModel, Field
@@ -41,16 +41,71 @@ class GeneratorConfig(BaseModel):
     cache_strategy: str = "default"  # default, overwrite, ignore
 
 
+class VariantConfig(BaseModel):
+    """One (backend, model, parameters) cell of a runner matrix.
+
+    Unset limit fields inherit the enclosing ``RunnerConfig`` values; each variant
+    still gets its own concurrency window and rate limiter.
+    """
+    name: Optional[str] = None
+    backend: str
+    model: Optional[str] = None
+    parameters: Dict[str, Any] = Field(default_factory=dict)
+    backend_options: Dict[str, Any] = Field(default_factory=dict)
+    max_concurrency: Optional[int] = None
+    rate_limit_per_second: Optional[float] = None
+    rate_limit_burst: Optional[int] = None
+    tokens_per_minute: Optional[float] = None
+
+
 class RunnerConfig(BaseModel):
     """Configuration for the execution runner."""
     max_concurrency: int = 2
+    adaptive_concurrency: bool = False  # resize the window with an AIMD controller during the run
+    min_concurrency: int = 1
+    adaptive_max_concurrency: Optional[int] = None  # ceiling for adaptive mode (default: 4 x max_concurrency)
+    adaptive_latency_tolerance: float = 2.0  # shrink when smoothed latency exceeds this x best latency
+    task_window_factor: int = 4  # live tasks are capped at max_concurrency * task_window_factor
+    result_buffer_size: int = 256  # finished results buffered for sync consumers before scheduling pauses
+    ordered_output: bool = False  # yield results in dispatch order through a bounded reorder buffer
+    reorder_buffer_max_bytes: int = 64 * 1024 * 1024  # memory held by out-of-order results
+    reorder_overflow: Literal["throttle", "spill"] = "throttle"  # at the cap: pause scheduling or spill to disk
+    dispatch_order: Literal["dataset", "shuffle", "lpt"] = "dataset"  # lpt = longest expected first
+    dispatch_seed: Optional[int] = None  # seed for dispatch_order="shuffle"
+    dispatch_history_path: Optional[Path] = None  # previous run_results.jsonl whose latencies drive "lpt"
+    warmup_requests: int = 0  # warmup with this many requests before measuring
+    warmup_seconds: float = 0.0  # or for this long (used when warmup_requests is 0)
+    warmup_mode: Literal["synthetic", "tagged"] = "synthetic"  # throwaway prompts, or tag the first real samples
+    warmup_prompt: str = "Hello"  # prompt for synthetic warmup requests
     timeout_seconds: float = 60.0
     max_retries: int = 2
     retry_backoff_factor: float = 2.0
     retry_backoff_jitter: float = 0.5
+    retry_budget_ratio: Optional[float] = None  # job-wide retries allowed per request (0.1 = 10%); None = unlimited
+    retry_budget_min: int = 10  # retries always allowed before the ratio applies
+    retry_after_max_seconds: float = 60.0  # cap on server Retry-After hints
+    hedge_percentile: Optional[float] = None  # duplicate attempts slower than this latency percentile (e.g. 95); None disables
+    hedge_budget: float = 0.05  # max hedged requests as a fraction of primary requests
+    hedge_min_samples: int = 20  # latencies observed before hedging starts
+    circuit_breaker_threshold: Optional[int] = None  # consecutive outage failures that open the breaker; None disables it
+    circuit_breaker_reset_seconds: float = 30.0  # how long the breaker stays open before probing
+    circuit_breaker_probes: int = 1  # concurrent probe requests while half-open
+    circuit_breaker_max_open_seconds: Optional[float] = None  # drain the job if the backend stays down this long
+    max_tokens_budget: Optional[int] = None  # stop scheduling once finished samples used this many tokens
+    max_cost: Optional[float] = None  # stop scheduling once spend (priced with price_table) reaches this
+    deadline_seconds: Optional[float] = None  # stop scheduling this many seconds after the job starts
+    price_table: Dict[str, Dict[str, float]] = Field(default_factory=dict)  # model -> {"input", "output"} per 1M tokens
     rate_limit_per_second: Optional[float] = None
+    rate_limit_burst: Optional[int] = None  # requests allowed back-to-back when idle (default 1)
+    tokens_per_minute: Optional[float] = None  # prompt+completion token budget (TPM)
+    token_burst: Optional[int] = None  # token bucket capacity (default: tokens_per_minute)
+    rate_limit_completion_tokens: int = 256  # completion estimate when max_tokens is not set
     trace_prefix: str = "run"
+    cache_path: Optional[Path] = None  # SQLite response cache; None disables caching
+    cache_ttl_seconds: Optional[float] = None
+    cache_max_bytes: Optional[int] = None
     output_dir: Optional[Path] = None
+    variants: List[VariantConfig] = Field(default_factory=list)  # matrix mode; one output subdir per variant
 
     def to_metadata_dict(self) -> Dict[str, Any]:
         return self.model_dump(mode="json")
@@ -84,4 +139,5 @@ __all__ = [
     "GeneratorConfig",
     "StructureConfig",
     "RunnerConfig",
+    "VariantConfig",
 ]
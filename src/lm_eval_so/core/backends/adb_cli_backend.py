@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import re
 import shlex
 import subprocess
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from ..exceptions import BackendError
 from ..models import ChatResponse, Message, RunRequest, TokenUsage
@@ -28,13 +29,130 @@ INFO_TSK_PATTERN = re.compile(
     r"\[INFO_TSK\]\s*(\d+),\s*(\d+),\s*([\d.]+),\s*([\d.]+),\s*([\d.]+)"
 )
 
+# longest response line a session may return
+_SESSION_LINE_LIMIT = 16 * 1024 * 1024
+
+
+def _adb_failure(message: str, prefix: str) -> BackendError:
+    lowered = message.lower()
+    if ("device '" in lowered and "not found" in lowered) or "no devices/emulators found" in lowered:
+        return BackendError(f"{prefix}: {message}", error_type="device_not_found", retryable=False)
+    return BackendError(f"{prefix}: {message}", error_type="adb_exit", retryable=True)
+
+
+class _AdbSession:
+    """Long-lived ``adb shell`` process exchanging one JSON object per line.
+
+    Each request line carries an ``id``; lines that are not JSON objects (device
+    logging) and replies with another ``id`` (left over from an abandoned request)
+    are skipped.
+    """
+
+    def __init__(self, command: List[str]) -> None:
+        self.command = command
+        self.proc: Optional[asyncio.subprocess.Process] = None
+        self._stderr_tail = b""
+        self._stderr_task: Optional["asyncio.Task[None]"] = None
+        self._next_id = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.returncode is None
+
+    async def start(self) -> None:
+        try:
+            self.proc = await asyncio.create_subprocess_exec(
+                *self.command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=_SESSION_LINE_LIMIT,
+            )
+        except FileNotFoundError as exc:
+            raise BackendError("adb binary not found", error_type="adb_missing", retryable=False) from exc
+        self._stderr_task = asyncio.ensure_future(self._drain_stderr())
+
+    async def _drain_stderr(self) -> None:
+        assert self.proc is not None and self.proc.stderr is not None
+        while True:
+            chunk = await self.proc.stderr.read(4096)
+            if not chunk:
+                return
+            self._stderr_tail = (self._stderr_tail + chunk)[-2000:]
+
+    async def request(self, payload: Dict[str, Any]) -> str:
+        assert self.proc is not None and self.proc.stdin is not None and self.proc.stdout is not None
+        self._next_id += 1
+        request_id = self._next_id
+        line = json.dumps({**payload, "id": request_id}, ensure_ascii=False) + "\n"
+        try:
+            self.proc.stdin.write(line.encode("utf-8"))
+            await self.proc.stdin.drain()
+            while True:
+                raw = await self.proc.stdout.readline()
+                if not raw:
+                    raise await self._died()
+                text = raw.decode("utf-8", errors="ignore").strip()
+                try:
+                    data = json.loads(text)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(data, dict) and data.get("id", request_id) == request_id:
+                    return text
+        except (BrokenPipeError, ConnectionResetError) as exc:
+            raise await self._died() from exc
+        except ValueError as exc:  # reply line over the stream limit
+            raise BackendError(str(exc), error_type="adb_response", retryable=False) from exc
+
+    async def _died(self) -> BackendError:
+        assert self.proc is not None
+        try:
+            code = await asyncio.wait_for(self.proc.wait(), timeout=1.0)
+        except asyncio.TimeoutError:
+            code = None
+        if self._stderr_task is not None:
+            try:
+                await asyncio.wait_for(self._stderr_task, timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+        message = self._stderr_tail.decode("utf-8", errors="ignore").strip() or "session closed"
+        return _adb_failure(message, f"ADB session exited with code {code}")
+
+    async def close(self) -> None:
+        if self.proc is not None and self.proc.returncode is None:
+            try:
+                self.proc.kill()
+            except ProcessLookupError:
+                pass
+            await self.proc.wait()
+        if self._stderr_task is not None:
+            self._stderr_task.cancel()
+        self.proc = None
+
 
 @register_backend("adb-cli")
 class AdbCliBackend(ChatBackend):
-    """Executes a CLI binary inside an ADB-connected device."""
+    """Executes a CLI binary inside an ADB-connected device.
+
+    By default every sample runs ``adb shell <binary>`` with the request JSON on stdin.
+    With ``persistent_session=true`` the backend keeps one ``adb shell <binary>
+    <binary_args> <session_args>`` process open for the device and writes each request
+    as one JSON line (plus an ``id``), reading the reply line with the same ``id``.
+    Requests share the session one at a time. A session that dies or is abandoned
+    mid-reply (timeout, cancellation) is restarted; after ``session_max_restarts``
+    consecutive failed starts or crashes the backend falls back to per-call mode.
+    """
+
+    supports_session = True
+
+    def __init__(self, context=None) -> None:
+        super().__init__(context=context)
+        self._session: Optional[_AdbSession] = None
+        self._session_lock: Optional[asyncio.Lock] = None
+        self._session_failures = 0
+        self._session_stats = {"starts": 0, "requests": 0, "crashes": 0, "fallback": False}
 
     async def send(self, request: RunRequest) -> ChatResponse:
-        command = self._build_adb_command()
         payload = {
             "sample_id": request.sample.id,
             "messages": _messages_to_dict(request.messages),
@@ -42,6 +160,11 @@ class AdbCliBackend(ChatBackend):
             "parameters": request.run_config.parameters,
             "metadata": request.sample.metadata,
         }
+        if self._use_session():
+            stdout = await self._send_session(payload, request.timeout_seconds)
+            if stdout is not None:
+                return self._parse_response(stdout)
+        command = self._build_adb_command()
         input_bytes = json.dumps(payload, ensure_ascii=False).encode("utf-8")
         stdout = await run_in_thread(
             self._invoke_subprocess,
@@ -51,6 +174,77 @@ class AdbCliBackend(ChatBackend):
         )
         return self._parse_response(stdout)
 
+    def _use_session(self) -> bool:
+        return (
+            self.supports_session
+            and bool(self.backend_options.get("persistent_session"))
+            and not self._session_stats["fallback"]
+        )
+
+    async def _send_session(self, payload: Dict[str, Any], timeout: float | None) -> Optional[str]:
+        """Send through the persistent session; ``None`` means fall back to per-call mode."""
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+        async with self._session_lock:
+            max_restarts = int(self.backend_options.get("session_max_restarts", 3))
+            while self._use_session():
+                session = self._session
+                try:
+                    if session is None or not session.alive:
+                        if session is not None:
+                            await session.close()
+                        session = self._session = _AdbSession(self._build_session_command())
+                        self._session_stats["starts"] += 1
+                        await session.start()
+                    self._session_stats["requests"] += 1
+                    stdout = await asyncio.wait_for(session.request(payload), timeout=timeout)
+                except asyncio.TimeoutError as exc:
+                    # the device may still be generating; a fresh session drops that reply
+                    await self._drop_session()
+                    raise BackendError("ADB session request timed out", error_type="timeout", retryable=True) from exc
+                except BackendError as exc:
+                    await self._drop_session()
+                    if exc.error_type != "adb_exit":
+                        raise
+                    self._session_stats["crashes"] += 1
+                    self._session_failures += 1
+                    if self._session_failures > max_restarts:
+                        self._session_stats["fallback"] = True
+                        self.context.logger.warning(
+                            "adb session failed %d times in a row; falling back to per-call mode: %s",
+                            self._session_failures,
+                            exc,
+                        )
+                    continue
+                except BaseException:
+                    await self._drop_session()
+                    raise
+                self._session_failures = 0
+                return stdout
+        return None
+
+    async def _drop_session(self) -> None:
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+
+    def _build_session_command(self) -> List[str]:
+        command = self._build_adb_command()
+        session_args = self.backend_options.get("session_args")
+        if isinstance(session_args, str):
+            session_args = shlex.split(session_args)
+        if isinstance(session_args, list):
+            command += [str(a) for a in session_args]
+        return command
+
+    async def aclose(self) -> None:
+        await self._drop_session()
+
+    def to_metadata(self) -> Optional[Dict[str, Any]]:
+        if not self._session_stats["starts"]:
+            return None
+        return {"adb_session": dict(self._session_stats)}
+
     def _build_adb_command(self) -> List[str]:
         adb_path = self.backend_options.get("adb_path", "adb")
         binary = self.backend_options.get("binary")
@@ -85,22 +279,8 @@ class AdbCliBackend(ChatBackend):
             raise BackendError(str(exc), error_type="adb_error", retryable=False) from exc
 
         if proc.returncode != 0:
-            stderr = proc.stderr.decode("utf-8", errors="ignore")
-            message = stderr.strip()
-            error_type = "adb_exit"
-            retryable = True
-            lowered = message.lower()
-            if "device '" in lowered and "not found" in lowered:
-                error_type = "device_not_found"
-                retryable = False
-            elif "no devices/emulators found" in lowered:
-                error_type = "device_not_found"
-                retryable = False
-            raise BackendError(
-                f"ADB binary exited with code {proc.returncode}: {message}",
-                error_type=error_type,
-                retryable=retryable,
-            )
+            message = proc.stderr.decode("utf-8", errors="ignore").strip()
+            raise _adb_failure(message, f"ADB binary exited with code {proc.returncode}")
         stdout = proc.stdout.decode("utf-8", errors="ignore").strip()
         if not stdout:
             raise BackendError("ADB binary returned empty response", error_type="adb_response", retryable=False)
@@ -152,9 +332,12 @@ class LlamaCliFreeformAdbBackend(AdbCliBackend):
 
     This backend does *not* require the device binary to output JSON. It tries to
     extract a useful answer text from arbitrary stdout and optionally parse
-    [INFO_TSK] lines as token usage metadata.
+    [INFO_TSK] lines as token usage metadata. Free-form output cannot be framed, so
+    ``persistent_session`` is ignored and every sample runs as its own call.
     """
 
+    supports_session = False
+
     def _parse_response(self, stdout: str) -> ChatResponse:
         usage: TokenUsage | None = None
         input_tokens = None
@@ -68,6 +68,23 @@ class ChatBackend(abc.ABC):
         if options:
             self.backend_options.update(options)
 
+    async def aclose(self) -> None:
+        """Release resources held across requests (connection pools, device sessions).
+
+        @extension-point: Override when the backend keeps connections or processes open.
+        The runner calls this once the job has finished.
+        """
+
+    def to_metadata(self) -> Optional[Dict[str, Any]]:
+        """Return job-level backend statistics for the run metadata.
+
+        @extension-point: Override to report state kept across requests (e.g. per-replica counts).
+
+        Returns:
+            Optional[Dict[str, Any]]: Stored under ``backend`` in the job metadata; ``None`` to omit.
+        """
+        return None
+
 
 class BackendRegistry:
     """Registry for discovering and instantiating backends.
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import re
+from typing import Any, Dict, List, Mapping, Optional
+from urllib.parse import urlsplit
+
+from jinja2 import Environment, StrictUndefined, TemplateError, Undefined
+
+from ..exceptions import BackendError
+from ..models import ChatResponse, Message, RunRequest, TokenUsage
+from .base import ChatBackend, register_backend
+from .http_pool import PoolTrace, client_kwargs, current_pool_trace, pool_settings
+
+DEFAULT_REQUEST_TEMPLATE = (
+    '{"model": {{ model | tojson }}, "messages": {{ messages | tojson }}, "parameters": {{ parameters | tojson }}}'
+)
+
+_FORWARDED_HEADERS = ("retry-after", "retry-after-ms", "x-request-id")
+
+_INDEX = re.compile(r"\[(\d+)\]")
+
+
+def extract_path(data: Any, path: str) -> Any:
+    """Follow a dotted path such as ``choices.0.message.content`` or ``$.data[0].reply``.
+
+    Returns ``None`` when any step is missing.
+    """
+    path = path.strip()
+    if path.startswith("$"):
+        path = path[1:].lstrip(".")
+    current = data
+    for part in _INDEX.sub(r".\1", path).split("."):
+        if part == "":
+            continue
+        if isinstance(current, Mapping):
+            current = current.get(part)
+        elif isinstance(current, list) and part.isdigit() and int(part) < len(current):
+            current = current[int(part)]
+        else:
+            return None
+        if current is None:
+            return None
+    return current
+
+
+def extract_usage(data: Any, options: Mapping[str, Any]) -> Optional[TokenUsage]:
+    """Read token usage from ``data`` at the ``{input,output,total}_tokens_path`` options."""
+    values: Dict[str, Optional[int]] = {}
+    for field in ("input_tokens", "output_tokens", "total_tokens"):
+        path = options.get(f"{field}_path")
+        value = extract_path(data, str(path)) if path else None
+        values[field] = int(value) if isinstance(value, (int, float)) else None
+    if not any(v is not None for v in values.values()):
+        return None
+    if values["total_tokens"] is None and values["input_tokens"] is not None and values["output_tokens"] is not None:
+        values["total_tokens"] = values["input_tokens"] + values["output_tokens"]
+    return TokenUsage(**values)
+
+
+class JsonTemplate:
+    """Jinja template that renders a JSON request body from a ``RunRequest``.
+
+    Variables: ``messages``, ``prompt`` (last user message), ``system``, ``model``,
+    ``parameters``, ``sample_id``, ``trace_id``, ``metadata``.
+
+    A string template is rendered as text and must produce JSON. A mapping or list
+    template is filled leaf by leaf: a string that is exactly one ``{{ expr }}`` is
+    replaced by the expression's value (so ``{"q": "{{ prompt }}"}`` sends the prompt
+    as a properly escaped JSON string), other strings are rendered as text.
+    """
+
+    def __init__(self, source: Any = None) -> None:
+        source = source or DEFAULT_REQUEST_TEMPLATE
+        self._env = Environment(undefined=StrictUndefined, autoescape=False)
+        self._template = self._env.from_string(source) if isinstance(source, str) else None
+        self._structure = None if isinstance(source, str) else self._compile(source)
+
+    def render(self, request: RunRequest, **extra: Any) -> Any:
+        context = {**_template_context(request), **extra}
+        try:
+            if self._template is None:
+                return _fill(self._structure, context)
+            rendered = self._template.render(**context)
+        except TemplateError as exc:
+            raise BackendError(f"request_template failed: {exc}", error_type="config", retryable=False) from exc
+        try:
+            return json.loads(rendered)
+        except json.JSONDecodeError as exc:
+            raise BackendError(
+                "request_template did not render valid JSON",
+                error_type="config",
+                retryable=False,
+                details={"rendered": rendered[:2000]},
+            ) from exc
+
+    def _compile(self, node: Any) -> Any:
+        if isinstance(node, Mapping):
+            return {str(key): self._compile(value) for key, value in node.items()}
+        if isinstance(node, (list, tuple)):
+            return [self._compile(value) for value in node]
+        if isinstance(node, str):
+            match = _SINGLE_EXPRESSION.match(node)
+            if match:
+                return _Expression(self._env.compile_expression(match.group(1), undefined_to_none=False))
+            if "{{" in node or "{%" in node:
+                return _Text(self._env.from_string(node))
+        return node
+
+
+# a template leaf that is exactly one ``{{ expr }}``
+_SINGLE_EXPRESSION = re.compile(r"^\s*\{\{((?:(?!\}\}).)*)\}\}\s*$", re.DOTALL)
+
+
+class _Expression:
+    def __init__(self, expression: Any) -> None:
+        self.expression = expression
+
+    def __call__(self, context: Mapping[str, Any]) -> Any:
+        value = self.expression(**context)
+        if isinstance(value, Undefined):
+            str(value)  # StrictUndefined raises the usual "is undefined" error
+        return value
+
+
+class _Text:
+    def __init__(self, template: Any) -> None:
+        self.template = template
+
+    def __call__(self, context: Mapping[str, Any]) -> Any:
+        return self.template.render(**context)
+
+
+def _fill(node: Any, context: Mapping[str, Any]) -> Any:
+    if isinstance(node, dict):
+        return {key: _fill(value, context) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_fill(value, context) for value in node]
+    if isinstance(node, (_Expression, _Text)):
+        return node(context)
+    return node
+
+
+def _template_context(request: RunRequest) -> Dict[str, Any]:
+    messages: List[Dict[str, Any]] = []
+    for msg in request.messages:
+        entry: Dict[str, Any] = {"role": msg.role, "content": msg.content}
+        if msg.name:
+            entry["name"] = msg.name
+        messages.append(entry)
+    return {
+        "messages": messages,
+        "prompt": _last_content(request.messages, "user"),
+        "system": _first_content(request.messages, "system"),
+        "model": request.run_config.model,
+        "parameters": request.run_config.parameters,
+        "sample_id": request.sample.id,
+        "trace_id": request.trace_id,
+        "metadata": request.sample.metadata,
+    }
+
+
+def _last_content(messages: List[Message], role: str) -> Optional[str]:
+    for msg in reversed(messages):
+        if msg.role == role:
+            return msg.content
+    return None
+
+
+def _first_content(messages: List[Message], role: str) -> Optional[str]:
+    for msg in messages:
+        if msg.role == role:
+            return msg.content
+    return None
+
+
+@register_backend("http-json")
+class HttpJsonBackend(ChatBackend):
+    """Calls an arbitrary JSON-over-HTTP chatbot through one shared connection pool.
+
+    Options:
+        url: Endpoint (required). ``method`` defaults to POST; ``headers`` are sent as-is.
+        request_template: Jinja template rendering the JSON body. Variables:
+            ``messages``, ``prompt`` (last user message), ``system``, ``model``,
+            ``parameters``, ``sample_id``, ``trace_id``, ``metadata``. May also be a
+            mapping whose string leaves are templates (see ``JsonTemplate``).
+        text_path: Where the reply text is in the response JSON (default ``text``).
+        input_tokens_path / output_tokens_path / total_tokens_path: Optional usage paths.
+        limit_per_host: Cap on concurrent requests per host on top of the pool limit.
+        gzip_request: Send the body gzip-compressed (responses are always decompressed).
+        Pool options shared with the OpenAI backend: ``max_connections``,
+        ``max_keepalive_connections``, ``keepalive_expiry``, ``http2``,
+        ``connect_timeout``, ``read_timeout``, ``pool_timeout``.
+    """
+
+    def __init__(self, context=None) -> None:
+        super().__init__(context=context)
+        self._client: Any = None
+        self._template: Optional[JsonTemplate] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _get_client(self) -> Any:
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                headers={"Accept-Encoding": "gzip", **dict(self.backend_options.get("headers") or {})},
+                **client_kwargs(pool_settings(self.backend_options, self.context.options)),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    def _render_body(self, request: RunRequest) -> Any:
+        if self._template is None:
+            self._template = JsonTemplate(self.backend_options.get("request_template"))
+        return self._template.render(request)
+
+    def _host_limit(self, url: str) -> Optional[asyncio.Semaphore]:
+        limit = self.backend_options.get("limit_per_host")
+        if not limit:
+            return None
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(int(limit))
+        return self._host_limits[host]
+
+    async def send(self, request: RunRequest) -> ChatResponse:
+        url = self.backend_options.get("url")
+        if not url:
+            raise BackendError("http-json backend requires 'url' option", error_type="config", retryable=False)
+        import httpx
+
+        client = self._get_client()
+        body = json.dumps(self._render_body(request), ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self.backend_options.get("gzip_request"):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        method = str(self.backend_options.get("method") or "POST").upper()
+
+        trace = PoolTrace()
+        trace_token = current_pool_trace.set(trace)
+        host_limit = self._host_limit(url)
+        try:
+            if host_limit is not None:
+                await host_limit.acquire()
+            try:
+                resp = await client.request(method, url, content=body, headers=headers)
+            finally:
+                if host_limit is not None:
+                    host_limit.release()
+        except httpx.TimeoutException as exc:
+            raise BackendError(str(exc) or "HTTP timeout", error_type="timeout", retryable=True) from exc
+        except httpx.TransportError as exc:
+            raise BackendError(str(exc) or "HTTP transport error", error_type="connection_error", retryable=True) from exc
+        finally:
+            current_pool_trace.reset(trace_token)
+
+        forwarded = {k.lower(): v for k, v in resp.headers.items() if k.lower() in _FORWARDED_HEADERS} or None
+        if resp.status_code >= 400:
+            retryable = resp.status_code == 429 or resp.status_code >= 500
+            raise BackendError(
+                f"HTTP {resp.status_code}: {resp.text[:500]}",
+                error_type="rate_limit" if resp.status_code == 429 else ("server_error" if retryable else "request_error"),
+                status_code=resp.status_code,
+                retryable=retryable,
+                details={"headers": forwarded} if forwarded else None,
+            )
+        try:
+            data = resp.json()
+        except ValueError as exc:
+            raise BackendError(
+                "Invalid JSON from endpoint",
+                error_type="parse_error",
+                status_code=resp.status_code,
+                retryable=False,
+                details={"body_head": resp.text[:2000]},
+            ) from exc
+
+        text_path = str(self.backend_options.get("text_path") or "text")
+        text = extract_path(data, text_path)
+        if text is None:
+            raise BackendError(
+                f"Response has nothing at text_path {text_path!r}",
+                error_type="response_format",
+                status_code=resp.status_code,
+                retryable=False,
+            )
+        return ChatResponse(
+            text=str(text),
+            raw=data if isinstance(data, Mapping) else {"body": data},
+            usage=extract_usage(data, self.backend_options),
+            status_code=resp.status_code,
+            headers=forwarded,
+            pool_wait_ms=trace.pool_wait_ms,
+        )
+
+
+__all__ = ["DEFAULT_REQUEST_TEMPLATE", "HttpJsonBackend", "JsonTemplate", "extract_path", "extract_usage"]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Mapping, Optional
+
+from ..exceptions import BackendError
+
+
+def pool_settings(backend_options: Mapping[str, Any], context_options: Mapping[str, Any]) -> Dict[str, Any]:
+    """Connection pool / timeout settings, defaulting to the runner's concurrency.
+
+    ``max_connections`` and ``max_keepalive_connections`` default to the most
+    requests the runner can have in flight, so a concurrency-200 run does not queue on
+    httpx's default pool of 100 or churn through its 20 keep-alive connections.
+    """
+    concurrency = int(context_options.get("max_concurrency") or 10)
+    read_timeout = float(backend_options.get("read_timeout") or context_options.get("timeout_seconds") or 600.0)
+    max_connections = int(backend_options.get("max_connections") or concurrency)
+    return {
+        "max_connections": max_connections,
+        "max_keepalive_connections": int(backend_options.get("max_keepalive_connections") or max_connections),
+        "keepalive_expiry": float(backend_options.get("keepalive_expiry") or 30.0),
+        "http2": bool(backend_options.get("http2", False)),
+        "connect_timeout": float(backend_options.get("connect_timeout") or 10.0),
+        "read_timeout": read_timeout,
+        "pool_timeout": float(backend_options.get("pool_timeout") or read_timeout),
+    }
+
+
+def client_kwargs(settings: Mapping[str, Any]) -> Dict[str, Any]:
+    """``httpx.AsyncClient`` keyword arguments for ``pool_settings`` output.
+
+    Requests get a trace hook so ``PoolTrace`` can measure the pool wait.
+    """
+    import httpx
+
+    if settings["http2"]:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            raise BackendError(
+                "http2=true needs the 'h2' package (pip install 'httpx[http2]')",
+                error_type="config",
+                retryable=False,
+            )
+    return {
+        "limits": httpx.Limits(
+            max_connections=settings["max_connections"],
+            max_keepalive_connections=settings["max_keepalive_connections"],
+            keepalive_expiry=settings["keepalive_expiry"],
+        ),
+        "timeout": httpx.Timeout(
+            settings["read_timeout"], connect=settings["connect_timeout"], pool=settings["pool_timeout"]
+        ),
+        "http2": settings["http2"],
+        "event_hooks": {"request": [attach_pool_trace]},
+    }
+
+
+class PoolTrace:
+    """httpcore trace callback that measures the wait for a pooled connection.
+
+    The wait runs from the httpx request hook until the connection the pool handed
+    out starts its first operation (TCP connect for a new connection, sending
+    headers for a reused one). Client-side retries restart the clock.
+    """
+
+    def __init__(self) -> None:
+        self.pool_wait_ms: Optional[float] = None
+        self._started: Optional[float] = None
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self.pool_wait_ms = None
+
+    async def __call__(self, event_name: str, info: Mapping[str, Any]) -> None:
+        if self.pool_wait_ms is not None or self._started is None or not event_name.endswith(".started"):
+            return
+        if event_name.startswith("connection.") or "send_request_headers" in event_name:
+            self.pool_wait_ms = (time.perf_counter() - self._started) * 1000.0
+
+
+# Set by a backend around a request so the client-wide hook can find this request's trace.
+current_pool_trace: ContextVar[Optional[PoolTrace]] = ContextVar("http_pool_trace", default=None)
+
+
+async def attach_pool_trace(request: Any) -> None:
+    trace = current_pool_trace.get()
+    if trace is not None:
+        trace.start()
+        request.extensions["trace"] = trace
+
+
+__all__ = ["PoolTrace", "attach_pool_trace", "client_kwargs", "current_pool_trace", "pool_settings"]
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import random
+import time
+from typing import Any, Dict, List, Mapping, Optional
+
+from ..exceptions import BackendError
+from ..models import ChatResponse, RunRequest
+from ..utils import percentile
+from .base import ChatBackend, backend_registry, register_backend
+
+# failures that say something about the replica rather than the request
+_UNHEALTHY_ERRORS = {"timeout", "connection_error", "server_error"}
+
+
+def _is_unhealthy(exc: BackendError) -> bool:
+    """Backends name their errors differently (``openai`` reports 5xx and connection
+    failures as ``api_error``), so fall back to retryable non-429 errors without a 4xx."""
+    if exc.error_type in _UNHEALTHY_ERRORS:
+        return True
+    if not exc.retryable or exc.error_type == "rate_limit":
+        return False
+    return exc.status_code is None or exc.status_code >= 500
+
+
+class Replica:
+    """One endpoint behind the balancer with its load and health bookkeeping."""
+
+    def __init__(self, name: str, backend: ChatBackend, ewma_alpha: float, window: int = 20) -> None:
+        self.name = name
+        self.backend = backend
+        self.ewma_alpha = ewma_alpha
+        self.outstanding = 0
+        self.peak_outstanding = 0
+        self.latency_ewma_ms: Optional[float] = None
+        self.latencies_ms: List[float] = []
+        self.requests = 0
+        self.ok = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        # recent outcomes (True = unhealthy failure) for the windowed failure rate
+        self.outcomes: "collections.deque[bool]" = collections.deque(maxlen=max(1, window))
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def score(self) -> float:
+        """Expected wait: queued requests times typical latency (unknown latency counts as 1)."""
+        return (self.outstanding + 1) * (self.latency_ewma_ms or 1.0)
+
+    def begin(self) -> None:
+        self.requests += 1
+        self.outstanding += 1
+        self.peak_outstanding = max(self.peak_outstanding, self.outstanding)
+
+    def observe(self, latency_ms: float, success: bool = True) -> None:
+        """Fold a latency into the EWMA; failures pass their penalty as ``latency_ms``."""
+        if success:
+            self.latencies_ms.append(latency_ms)
+        if self.latency_ewma_ms is None:
+            self.latency_ewma_ms = latency_ms
+        else:
+            self.latency_ewma_ms += self.ewma_alpha * (latency_ms - self.latency_ewma_ms)
+
+    def failure_rate(self) -> float:
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def to_metadata(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "requests": self.requests,
+            "ok": self.ok,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "ejections": self.ejections,
+            "peak_outstanding": self.peak_outstanding,
+            "latency_ewma_ms": self.latency_ewma_ms,
+            "latency_p50_ms": percentile(self.latencies_ms, 50),
+            "latency_p95_ms": percentile(self.latencies_ms, 95),
+        }
+
+
+@register_backend("load-balanced")
+class LoadBalancedBackend(ChatBackend):
+    """Spreads requests over replicas of the same model served by another backend.
+
+    Each request goes to the better of two randomly chosen healthy replicas, scored by
+    outstanding requests weighted with the replica's latency EWMA (power of two
+    choices). A timeout, connection error or 5xx enters the EWMA as ``failure_penalty_ms``
+    (default: the request timeout), so a replica that fails fast scores worse, not
+    better. When at least ``eject_failure_rate`` of the last ``eject_window`` requests
+    (and no fewer than ``eject_min_requests``) failed that way, the replica is ejected
+    for ``eject_seconds``; if every replica is ejected, all of them are used again
+    rather than failing the request. A call cancelled before the request timeout (a
+    hedge that lost, a consumer that stopped early) counts for neither.
+
+    Options:
+        endpoints: List of endpoints (required). An item is either a URL, set as the
+            inner backend's ``endpoint_key`` option, or a dict of inner backend options
+            with an optional ``name``. A comma-separated string is also accepted.
+        backend: Inner backend name (default ``openai``).
+        endpoint_key: Option a URL endpoint is assigned to (default ``base_url`` for
+            ``openai``, ``url`` otherwise).
+        ewma_alpha: Weight of the newest latency in the EWMA (default 0.3).
+        eject_window / eject_failure_rate / eject_min_requests / eject_seconds: Ejection
+            policy (default 20 / 0.5 / 5 / 30s).
+        Every other option is passed to each inner backend.
+
+    The replica that served a request is recorded as ``response.replica`` (or
+    ``error.details.replica``); per-replica counts and latency are in the job metadata
+    under ``backend.replicas``.
+    """
+
+    def __init__(self, context=None) -> None:
+        super().__init__(context=context)
+        self._replicas: Optional[List[Replica]] = None
+        self._rng = random.Random()
+
+    @property
+    def replicas(self) -> List[Replica]:
+        if self._replicas is None:
+            self._replicas = self._build_replicas()
+        return self._replicas
+
+    def _build_replicas(self) -> List[Replica]:
+        options = dict(self.backend_options)
+        endpoints = options.pop("endpoints", None)
+        if isinstance(endpoints, str):
+            endpoints = [item.strip() for item in endpoints.split(",") if item.strip()]
+        if not endpoints:
+            raise BackendError("load-balanced backend requires 'endpoints' option", error_type="config", retryable=False)
+        inner = str(options.pop("backend", None) or "openai")
+        if inner == "load-balanced":
+            raise BackendError("load-balanced backend cannot wrap itself", error_type="config", retryable=False)
+        endpoint_key = str(options.pop("endpoint_key", None) or ("base_url" if inner == "openai" else "url"))
+        alpha = float(options.pop("ewma_alpha", None) or 0.3)
+        window = int(options.pop("eject_window", None) or 20)
+        for key in ("eject_failure_rate", "eject_min_requests", "eject_seconds", "failure_penalty_ms"):
+            options.pop(key, None)
+
+        replicas: List[Replica] = []
+        for index, endpoint in enumerate(endpoints):
+            if isinstance(endpoint, Mapping):
+                overrides = dict(endpoint)
+                name = str(overrides.pop("name", None) or overrides.get(endpoint_key) or f"replica-{index}")
+            else:
+                overrides = {endpoint_key: str(endpoint)}
+                name = str(endpoint)
+            try:
+                backend = backend_registry.create(inner, context=self.context, **{**options, **overrides})
+            except ValueError as exc:
+                raise BackendError(str(exc), error_type="config", retryable=False) from exc
+            replicas.append(Replica(name, backend, alpha, window))
+        return replicas
+
+    def _pick(self) -> Replica:
+        now = time.monotonic()
+        candidates = [r for r in self.replicas if r.healthy(now)] or self.replicas
+        if len(candidates) == 1:
+            return candidates[0]
+        first, second = self._rng.sample(candidates, 2)
+        return first if first.score() <= second.score() else second
+
+    async def send(self, request: RunRequest) -> ChatResponse:
+        replica = self._pick()
+        replica.begin()
+        start = time.perf_counter()
+        try:
+            response = await replica.backend.send(request)
+        except BackendError as exc:
+            replica.errors += 1
+            if _is_unhealthy(exc):
+                self._record_unhealthy(replica, start, request.timeout_seconds)
+            else:
+                replica.outcomes.append(False)
+            exc.details = {**(exc.details or {}), "replica": replica.name}
+            raise
+        except asyncio.CancelledError:
+            elapsed = time.perf_counter() - start
+            if request.timeout_seconds and elapsed >= request.timeout_seconds * 0.99:
+                # cancelled by the runner's per-attempt timeout
+                replica.errors += 1
+                self._record_unhealthy(replica, start, request.timeout_seconds)
+            else:
+                replica.cancelled += 1
+            raise
+        except Exception:
+            replica.errors += 1
+            replica.outcomes.append(False)
+            raise
+        finally:
+            replica.outstanding -= 1
+        replica.observe((time.perf_counter() - start) * 1000.0)
+        replica.ok += 1
+        replica.outcomes.append(False)
+        response.replica = replica.name
+        return response
+
+    def _record_unhealthy(self, replica: Replica, start: float, timeout_seconds: Optional[float]) -> None:
+        latency_ms = (time.perf_counter() - start) * 1000.0
+        penalty = self.backend_options.get("failure_penalty_ms")
+        if penalty is None:
+            penalty = (timeout_seconds or self.context.options.get("timeout_seconds") or 10.0) * 1000.0
+        replica.observe(max(latency_ms, float(penalty)), success=False)
+        replica.outcomes.append(True)
+
+        min_requests = int(self.backend_options.get("eject_min_requests") or 5)
+        threshold = float(self.backend_options.get("eject_failure_rate") or 0.5)
+        if len(replica.outcomes) >= min_requests and replica.failure_rate() >= threshold:
+            rate = replica.failure_rate()
+            replica.outcomes.clear()
+            replica.ejections += 1
+            replica.ejected_until = time.monotonic() + float(self.backend_options.get("eject_seconds") or 30.0)
+            self.context.logger.warning("replica=%s ejected at failure rate %.0f%%", replica.name, rate * 100)
+
+    async def aclose(self) -> None:
+        for replica in self._replicas or ():
+            await replica.backend.aclose()
+
+    def to_metadata(self) -> Optional[Dict[str, Any]]:
+        if self._replicas is None:
+            return None
+        return {"replicas": [replica.to_metadata() for replica in self._replicas]}
+
+
+__all__ = ["LoadBalancedBackend", "Replica"]
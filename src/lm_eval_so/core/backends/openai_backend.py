@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, List
+import time
+from typing import Any, Dict, List, Mapping, Optional
 
+import openai
 from openai import AsyncOpenAI
 from openai import APIConnectionError, APIError, RateLimitError, BadRequestError, AuthenticationError
 
-from ..models import ChatResponse, Message, RunRequest, TokenUsage
+from ..models import ChatResponse, Message, RunRequest, StreamTimings, TokenUsage
 from ..exceptions import BackendError
 from .base import ChatBackend, register_backend
+from .http_pool import PoolTrace, client_kwargs, current_pool_trace, pool_settings
 
 
 def _build_messages(messages: List[Message]) -> List[Dict[str, Any]]:
@@ -21,9 +24,38 @@ def _build_messages(messages: List[Message]) -> List[Dict[str, Any]]:
     return payload
 
 
+_FORWARDED_HEADER_PREFIXES = ("x-ratelimit-",)
+_FORWARDED_HEADERS = ("retry-after", "retry-after-ms", "x-request-id")
+
+
+def _select_headers(headers: Optional[Mapping[str, str]]) -> Optional[Dict[str, str]]:
+    """Keep the rate-limit and retry headers the runner reacts to."""
+    if not headers:
+        return None
+    selected = {
+        key.lower(): value
+        for key, value in headers.items()
+        if key.lower().startswith(_FORWARDED_HEADER_PREFIXES) or key.lower() in _FORWARDED_HEADERS
+    }
+    return selected or None
+
+
+def _error_headers(exc: Exception) -> Optional[Dict[str, str]]:
+    response = getattr(exc, "response", None)
+    return _select_headers(getattr(response, "headers", None))
+
+
 @register_backend("openai")
 class OpenAIChatBackend(ChatBackend):
-    """Adapter that calls OpenAI-compatible chat completion endpoints."""
+    """Adapter that calls OpenAI-compatible chat completion endpoints.
+
+    With ``backend_options["stream"] = True`` the completion is streamed and the
+    response carries ``StreamTimings`` (TTFT, inter-token latency, decode tokens/s).
+    The HTTP pool is sized by ``pool_settings`` (``max_connections``,
+    ``max_keepalive_connections``, ``keepalive_expiry``, ``http2``, ``connect_timeout``,
+    ``read_timeout``, ``pool_timeout`` backend options) and every response reports
+    how long it waited for a connection in ``pool_wait_ms``.
+    """
 
     def __init__(self, context=None) -> None:
         super().__init__(context=context)
@@ -36,9 +68,18 @@ class OpenAIChatBackend(ChatBackend):
         if not api_key:
             raise BackendError("OPENAI_API_KEY is not set", error_type="auth", retryable=False)
         base_url = self.backend_options.get("base_url") or os.getenv("OPENAI_BASE_URL")
-        self._client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+        kwargs = client_kwargs(pool_settings(self.backend_options, self.context.options))
+        http_client = openai.DefaultAsyncHttpxClient(**kwargs)
+        self._client = AsyncOpenAI(
+            api_key=api_key, base_url=base_url, timeout=kwargs["timeout"], http_client=http_client
+        )
         return self._client
 
+    async def aclose(self) -> None:
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.close()
+
     async def send(self, request: RunRequest) -> ChatResponse:
         client = self._get_client()
         model = request.run_config.model or self.backend_options.get("model")
@@ -52,17 +93,42 @@ class OpenAIChatBackend(ChatBackend):
         params.update(self.backend_options.get("request_defaults", {}))
         params.update(request.run_config.parameters)
 
+        trace = PoolTrace()
+        trace_token = current_pool_trace.set(trace)
         try:
-            resp = await client.chat.completions.create(**params)  # type: ignore[arg-type]
+            if self.backend_options.get("stream", False):
+                response = await self._send_streaming(client, params)
+                response.pool_wait_ms = trace.pool_wait_ms
+                return response
+            raw_resp = await client.chat.completions.with_raw_response.create(**params)  # type: ignore[arg-type]
+            resp = raw_resp.parse()
+        except BackendError:
+            raise
         except RateLimitError as exc:
-            raise BackendError(str(exc), error_type="rate_limit", status_code=429, retryable=True)
+            headers = _error_headers(exc)
+            raise BackendError(
+                str(exc),
+                error_type="rate_limit",
+                status_code=429,
+                retryable=True,
+                details={"headers": headers} if headers else None,
+            )
         except (APIConnectionError, APIError) as exc:
             retryable = getattr(exc, "status_code", 500) >= 500
-            raise BackendError(str(exc), error_type="api_error", status_code=getattr(exc, "status_code", None), retryable=retryable)
+            headers = _error_headers(exc)
+            raise BackendError(
+                str(exc),
+                error_type="api_error",
+                status_code=getattr(exc, "status_code", None),
+                retryable=retryable,
+                details={"headers": headers} if headers else None,
+            )
         except (BadRequestError, AuthenticationError) as exc:
             raise BackendError(str(exc), error_type="request_error", status_code=getattr(exc, "status_code", None), retryable=False)
         except Exception as exc:  # pragma: no cover
             raise BackendError(str(exc), error_type="unknown", retryable=False)
+        finally:
+            current_pool_trace.reset(trace_token)
 
         choice = resp.choices[0]
         text = choice.message.content or ""
@@ -80,4 +146,66 @@ class OpenAIChatBackend(ChatBackend):
             usage=usage,
             finish_reason=choice.finish_reason,
             status_code=200,
+            headers=_select_headers(raw_resp.headers),
+            pool_wait_ms=trace.pool_wait_ms,
+        )
+
+    async def _send_streaming(self, client: AsyncOpenAI, params: Dict[str, Any]) -> ChatResponse:
+        params = {**params, "stream": True}
+        params.setdefault("stream_options", {"include_usage": True})
+
+        start = time.perf_counter()
+        raw_resp = await client.chat.completions.with_raw_response.create(**params)  # type: ignore[arg-type]
+        stream = raw_resp.parse()
+        parts: List[str] = []
+        chunk_times: List[float] = []
+        finish_reason: Optional[str] = None
+        usage: Optional[TokenUsage] = None
+        response_id: Optional[str] = None
+        response_model: Optional[str] = None
+        async for chunk in stream:
+            response_id = response_id or getattr(chunk, "id", None)
+            response_model = response_model or getattr(chunk, "model", None)
+            if getattr(chunk, "usage", None) is not None:
+                usage = TokenUsage(
+                    input_tokens=chunk.usage.prompt_tokens,
+                    output_tokens=chunk.usage.completion_tokens,
+                    total_tokens=chunk.usage.total_tokens,
+                )
+            for choice in chunk.choices:
+                if choice.index != 0:
+                    continue
+                delta = choice.delta.content if choice.delta is not None else None
+                if delta:
+                    chunk_times.append(time.perf_counter())
+                    parts.append(delta)
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+        end = time.perf_counter()
+
+        text = "".join(parts)
+        timings = StreamTimings.from_chunk_times(
+            start,
+            chunk_times,
+            end,
+            output_tokens=usage.output_tokens if usage is not None else None,
+        )
+        raw = {
+            "id": response_id,
+            "model": response_model,
+            "object": "chat.completion",
+            "stream": True,
+            "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": finish_reason}
+            ],
+            "usage": usage.to_dict() if usage is not None else None,
+        }
+        return ChatResponse(
+            text=text,
+            raw=raw,
+            usage=usage,
+            finish_reason=finish_reason,
+            status_code=200,
+            headers=_select_headers(raw_resp.headers),
+            timings=timings,
         )
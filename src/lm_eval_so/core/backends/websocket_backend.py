@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Set
+
+from ..exceptions import BackendError
+from ..models import ChatResponse, RunRequest, StreamTimings
+from .base import ChatBackend, register_backend
+from .http_json_backend import JsonTemplate, extract_path, extract_usage
+
+# bound on the close handshake so dropping a connection never stalls a caller
+_CLOSE_TIMEOUT = 1.0
+
+_CLOSED = object()
+
+
+class _Connection:
+    """One pooled WebSocket. Multiplexed connections route frames by correlation id."""
+
+    def __init__(self, ws: Any, id_field: Optional[str]) -> None:
+        self.ws = ws
+        self.id_field = id_field
+        self.active = 0
+        self.closed = False
+        self.waiters: Dict[str, "asyncio.Queue[Any]"] = {}
+        self.reader: Optional["asyncio.Task[None]"] = None
+        if id_field:
+            self.reader = asyncio.ensure_future(self._read_loop())
+
+    async def _read_loop(self) -> None:
+        try:
+            async for raw in self.ws:
+                frame = _decode(raw)
+                cid = extract_path(frame, self.id_field) if isinstance(frame, dict) else None
+                queue = self.waiters.get(str(cid)) if cid is not None else None
+                if queue is not None:
+                    queue.put_nowait(frame)
+                # frames for cancelled/unknown requests are dropped
+        except Exception:  # noqa: BLE001 - any failure ends the connection for every waiter
+            pass
+        finally:
+            self.closed = True
+            for queue in self.waiters.values():
+                queue.put_nowait(_CLOSED)
+
+    async def close(self) -> None:
+        self.closed = True
+        if self.reader is not None:
+            self.reader.cancel()
+        try:
+            await asyncio.wait_for(self.ws.close(), timeout=_CLOSE_TIMEOUT)
+        except Exception:  # noqa: BLE001 - includes the close handshake timing out
+            pass
+
+
+def _decode(raw: Any) -> Any:
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8", errors="replace")
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return {"text": raw}
+
+
+@register_backend("websocket")
+class WebSocketBackend(ChatBackend):
+    """Chat over long-lived WebSocket connections with streamed replies.
+
+    Options:
+        url: ``ws://`` or ``wss://`` endpoint (required); ``headers`` are sent on connect.
+        request_template: Jinja JSON template, as for ``http-json`` (``request_id`` is
+            also available).
+        id_field: Top-level field carrying a correlation id. When set, requests are
+            multiplexed over each connection (up to ``max_streams_per_connection``) and
+            replies are routed by that field; otherwise a connection serves one request
+            at a time.
+        chunk_path: Field holding a streamed text chunk. done_path: field that is truthy
+            on the final frame. error_path: field that marks an error frame.
+            Without ``chunk_path``/``done_path`` the first frame is the whole reply;
+            ``chunk_path`` requires ``done_path``.
+        text_path: Full reply text on the final frame (default: joined chunks).
+        input_tokens_path / output_tokens_path / total_tokens_path: usage on the final frame.
+        pool_size: Connections to keep open (default: runner concurrency, or 1 when
+            multiplexing). connect_timeout: handshake timeout in seconds.
+
+    A request cancelled by the runner's timeout discards its connection when the
+    connection is not multiplexed, since late frames would otherwise reach the next
+    request.
+    """
+
+    def __init__(self, context=None) -> None:
+        super().__init__(context=context)
+        self._connections: List[_Connection] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._template: Optional[JsonTemplate] = None
+        self._closing: Set["asyncio.Task[None]"] = set()
+
+    @property
+    def _id_field(self) -> Optional[str]:
+        return self.backend_options.get("id_field") or None
+
+    def _per_connection(self) -> int:
+        return int(self.backend_options.get("max_streams_per_connection") or 100) if self._id_field else 1
+
+    def _pool_size(self) -> int:
+        default = 1 if self._id_field else int(self.context.options.get("max_concurrency") or 4)
+        return max(1, int(self.backend_options.get("pool_size") or default))
+
+    async def _connect(self) -> _Connection:
+        url = self.backend_options.get("url")
+        if not url:
+            raise BackendError("websocket backend requires 'url' option", error_type="config", retryable=False)
+        try:
+            from websockets.asyncio.client import connect
+        except ImportError:
+            raise BackendError(
+                "websocket backend needs the 'websockets' package (pip install websockets)",
+                error_type="config",
+                retryable=False,
+            )
+        try:
+            ws = await connect(
+                url,
+                additional_headers=self.backend_options.get("headers") or None,
+                open_timeout=float(self.backend_options.get("connect_timeout") or 10.0),
+                close_timeout=_CLOSE_TIMEOUT,
+                max_size=None,
+            )
+        except (OSError, asyncio.TimeoutError) as exc:
+            raise BackendError(f"WebSocket connect failed: {exc}", error_type="connection_error", retryable=True) from exc
+        except Exception as exc:  # handshake rejected (e.g. HTTP 4xx/5xx)
+            raise BackendError(f"WebSocket handshake failed: {exc}", error_type="connection_error", retryable=True) from exc
+        return _Connection(ws, self._id_field)
+
+    async def _acquire(self) -> _Connection:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._pool_size() * self._per_connection())
+            self._lock = asyncio.Lock()
+        await self._slots.acquire()
+        try:
+            assert self._lock is not None
+            async with self._lock:
+                self._connections = [c for c in self._connections if not c.closed]
+                usable = [c for c in self._connections if c.active < self._per_connection()]
+                if usable:
+                    conn = min(usable, key=lambda c: c.active)
+                else:
+                    # the slot semaphore guarantees the pool is below pool_size here
+                    conn = await self._connect()
+                    self._connections.append(conn)
+                conn.active += 1
+                return conn
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def aclose(self) -> None:
+        connections, self._connections = self._connections, []
+        await asyncio.gather(*(conn.close() for conn in connections), *self._closing, return_exceptions=True)
+
+    def _release(self, conn: _Connection, discard: bool) -> None:
+        conn.active -= 1
+        if discard and not conn.closed:
+            # close in the background: the caller may be unwinding a runner timeout
+            conn.closed = True
+            task = asyncio.ensure_future(conn.close())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        assert self._slots is not None
+        self._slots.release()
+
+    async def send(self, request: RunRequest) -> ChatResponse:
+        if self._template is None:
+            if self.backend_options.get("chunk_path") and not self.backend_options.get("done_path"):
+                raise BackendError(
+                    "websocket backend needs 'done_path' to know when a chunked reply ends",
+                    error_type="config",
+                    retryable=False,
+                )
+            self._template = JsonTemplate(self.backend_options.get("request_template"))
+        request_id = uuid.uuid4().hex
+        payload = self._template.render(request, request_id=request_id)
+        if self._id_field and isinstance(payload, dict):
+            payload[self._id_field] = request_id
+
+        conn = await self._acquire()
+        queue: Optional["asyncio.Queue[Any]"] = None
+        if conn.reader is not None:
+            queue = asyncio.Queue()
+            conn.waiters[request_id] = queue
+        discard = False
+        try:
+            start = time.perf_counter()
+            try:
+                await conn.ws.send(json.dumps(payload, ensure_ascii=False))
+            except Exception as exc:  # noqa: BLE001
+                discard = True
+                raise BackendError(f"WebSocket send failed: {exc}", error_type="connection_error", retryable=True) from exc
+            return await self._collect(conn, queue, start)
+        except BackendError as exc:
+            discard = discard or exc.error_type == "connection_error"
+            raise
+        except BaseException:
+            # cancelled (runner timeout) mid-reply: an exclusive connection still has frames in flight
+            discard = queue is None
+            raise
+        finally:
+            conn.waiters.pop(request_id, None)
+            self._release(conn, discard)
+
+    async def _next_frame(self, conn: _Connection, queue: Optional["asyncio.Queue[Any]"]) -> Any:
+        if queue is not None:
+            frame = await queue.get()
+        else:
+            try:
+                frame = _decode(await conn.ws.recv())
+            except Exception:  # noqa: BLE001 - closed or broken socket
+                frame = _CLOSED
+        if frame is _CLOSED:
+            raise BackendError("WebSocket closed mid-reply", error_type="connection_error", retryable=True)
+        return frame
+
+    async def _collect(self, conn: _Connection, queue: Optional["asyncio.Queue[Any]"], start: float) -> ChatResponse:
+        options = self.backend_options
+        chunk_path = options.get("chunk_path")
+        done_path = options.get("done_path")
+        error_path = options.get("error_path")
+        chunks: List[str] = []
+        chunk_times: List[float] = []
+        while True:
+            frame = await self._next_frame(conn, queue)
+            if error_path and extract_path(frame, error_path):
+                raise BackendError(
+                    f"Error frame: {extract_path(frame, error_path)}",
+                    error_type="server_error",
+                    retryable=bool(options.get("retry_error_frames", False)),
+                    details={"frame": frame},
+                )
+            if chunk_path:
+                chunk = extract_path(frame, chunk_path)
+                if chunk:
+                    chunks.append(str(chunk))
+                    chunk_times.append(time.perf_counter())
+            if not (chunk_path or done_path) or (done_path and extract_path(frame, done_path)):
+                break
+        end = time.perf_counter()
+
+        text_path = options.get("text_path") or (None if chunk_path else "text")
+        text = extract_path(frame, text_path) if text_path else None
+        if text is None:
+            if not chunk_path:
+                raise BackendError(
+                    f"Final frame has nothing at text_path {text_path!r}", error_type="response_format", retryable=False
+                )
+            text = "".join(chunks)
+        usage = extract_usage(frame, self.backend_options)
+        timings = None
+        if chunk_times:
+            timings = StreamTimings.from_chunk_times(
+                start, chunk_times, end, usage.output_tokens if usage is not None else None
+            )
+        return ChatResponse(
+            text=str(text),
+            raw=frame if isinstance(frame, dict) else {"frame": frame},
+            usage=usage,
+            status_code=None,
+            timings=timings,
+        )
+
+
+__all__ = ["WebSocketBackend"]
@@ -71,6 +71,8 @@ class TestSample:
 from datetime import datetime
 from enum import Enum
 
+from .utils import percentile
+
 
 class RunResultStatus(str, Enum):
     """Execution status persisted with each sample."""
@@ -87,6 +89,14 @@ class TokenUsage:
     output_tokens: Optional[int] = None
     total_tokens: Optional[int] = None
 
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "TokenUsage":
+        return cls(
+            input_tokens=data.get("input"),
+            output_tokens=data.get("output"),
+            total_tokens=data.get("total"),
+        )
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "input": self.input_tokens,
@@ -95,6 +105,73 @@ class TokenUsage:
         }
 
 
+@dataclass(slots=True)
+class StreamTimings:
+    """Token-level timings measured while consuming a streamed response.
+
+    ``ttft_ms`` is measured from request start to the first content chunk. Inter-token
+    latency (ITL) percentiles come from the gaps between content chunks, and
+    ``output_tokens_per_second`` is the decode rate after the first token.
+    """
+
+    ttft_ms: Optional[float] = None
+    itl_mean_ms: Optional[float] = None
+    itl_p50_ms: Optional[float] = None
+    itl_p90_ms: Optional[float] = None
+    itl_p99_ms: Optional[float] = None
+    output_tokens_per_second: Optional[float] = None
+    chunks: int = 0
+    total_ms: Optional[float] = None
+
+    @classmethod
+    def from_chunk_times(
+        cls,
+        start: float,
+        chunk_times: List[float],
+        end: float,
+        output_tokens: Optional[int] = None,
+    ) -> "StreamTimings":
+        """Build timings from ``perf_counter`` stamps of each content chunk."""
+        gaps = [(b - a) * 1000.0 for a, b in zip(chunk_times, chunk_times[1:])]
+        tokens = output_tokens if output_tokens is not None else len(chunk_times)
+        decode_s = chunk_times[-1] - chunk_times[0] if len(chunk_times) > 1 else 0.0
+        return cls(
+            ttft_ms=(chunk_times[0] - start) * 1000.0 if chunk_times else None,
+            itl_mean_ms=sum(gaps) / len(gaps) if gaps else None,
+            itl_p50_ms=percentile(gaps, 50),
+            itl_p90_ms=percentile(gaps, 90),
+            itl_p99_ms=percentile(gaps, 99),
+            output_tokens_per_second=(tokens - 1) / decode_s if decode_s > 0 and tokens > 1 else None,
+            chunks=len(chunk_times),
+            total_ms=(end - start) * 1000.0,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "StreamTimings":
+        return cls(
+            ttft_ms=data.get("ttft_ms"),
+            itl_mean_ms=data.get("itl_mean_ms"),
+            itl_p50_ms=data.get("itl_p50_ms"),
+            itl_p90_ms=data.get("itl_p90_ms"),
+            itl_p99_ms=data.get("itl_p99_ms"),
+            output_tokens_per_second=data.get("output_tokens_per_second"),
+            chunks=int(data.get("chunks") or 0),
+            total_ms=data.get("total_ms"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ttft_ms": self.ttft_ms,
+            "itl_mean_ms": self.itl_mean_ms,
+            "itl_p50_ms": self.itl_p50_ms,
+            "itl_p90_ms": self.itl_p90_ms,
+            "itl_p99_ms": self.itl_p99_ms,
+            "output_tokens_per_second": self.output_tokens_per_second,
+            "chunks": self.chunks,
+            "total_ms": self.total_ms,
+        }
+
+
 @dataclass(slots=True)
 class ChatResponse:
     text: str
@@ -103,6 +180,25 @@ class ChatResponse:
     finish_reason: Optional[str] = None
     status_code: Optional[int] = None
     headers: Optional[Mapping[str, str]] = None
+    timings: Optional[StreamTimings] = None
+    pool_wait_ms: Optional[float] = None  # time the HTTP client waited for a pooled connection
+    replica: Optional[str] = None  # endpoint that served the request when load-balanced
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "ChatResponse":
+        tokens = data.get("tokens")
+        timings = data.get("timings")
+        return cls(
+            text=str(data.get("text", "")),
+            raw=data.get("raw"),
+            usage=TokenUsage.from_dict(tokens) if tokens else None,
+            finish_reason=data.get("finish_reason"),
+            status_code=data.get("status_code"),
+            headers=dict(data["headers"]) if data.get("headers") else None,
+            timings=StreamTimings.from_dict(timings) if timings else None,
+            pool_wait_ms=data.get("pool_wait_ms"),
+            replica=data.get("replica"),
+        )
 
     def to_dict(self) -> Dict[str, Any]:
         payload: Dict[str, Any] = {"text": self.text}
@@ -114,6 +210,12 @@ class ChatResponse:
             payload["tokens"] = self.usage.to_dict()
         if self.headers is not None:
             payload["headers"] = dict(self.headers)
+        if self.timings is not None:
+            payload["timings"] = self.timings.to_dict()
+        if self.pool_wait_ms is not None:
+            payload["pool_wait_ms"] = self.pool_wait_ms
+        if self.replica is not None:
+            payload["replica"] = self.replica
         if self.raw is not None:
             payload["raw"] = self.raw
         return payload
@@ -191,6 +293,46 @@ class RunError:
         return payload
 
 
+@dataclass(slots=True)
+class AttemptPhases:
+    """Where the wall-clock time of one attempt went.
+
+    ``send_ms`` is backend service time. The other phases are harness-induced
+    waiting: scheduler queueing (first attempt only), an open circuit breaker,
+    rate limiting, the concurrency semaphore, and the backoff sleep after a
+    failed attempt. ``pool_wait_ms`` is the part of ``send_ms`` the HTTP client
+    spent waiting for a pooled connection, when the backend reports it.
+    """
+
+    attempt: int
+    queue_wait_ms: float = 0.0
+    circuit_wait_ms: float = 0.0
+    rate_limit_wait_ms: float = 0.0
+    semaphore_wait_ms: float = 0.0
+    send_ms: float = 0.0
+    backoff_ms: float = 0.0
+    pool_wait_ms: float = 0.0
+
+    PHASES = (
+        "queue_wait_ms",
+        "circuit_wait_ms",
+        "rate_limit_wait_ms",
+        "semaphore_wait_ms",
+        "send_ms",
+        "backoff_ms",
+        "pool_wait_ms",
+    )
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "AttemptPhases":
+        return cls(attempt=int(data.get("attempt") or 0), **{p: float(data.get(p) or 0.0) for p in cls.PHASES})
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"attempt": self.attempt}
+        out.update({p: getattr(self, p) for p in self.PHASES})
+        return out
+
+
 @dataclass(slots=True)
 class RunResult:
     sample_id: str
@@ -207,6 +349,7 @@ class RunResult:
     attempts: int
     trace_id: str
     error: Optional[RunError] = None
+    phases: List[AttemptPhases] = field(default_factory=list)
 
     def to_record(self) -> Dict[str, Any]:
         return {
@@ -226,4 +369,5 @@ class RunResult:
             },
             "response": self.response.to_dict() if self.response else None,
             "error": self.error.to_dict() if self.error else None,
+            "phases": [p.to_dict() for p in self.phases],
         }
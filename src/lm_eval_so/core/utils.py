@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import asyncio
 import functools
-from typing import Any, Callable
+import math
+from typing import Any, Callable, Optional, Sequence
 
 
 async def run_in_thread(func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
@@ -15,4 +16,19 @@ async def run_in_thread(func: Callable[..., Any], /, *args: Any, **kwargs: Any)
     bound = functools.partial(func, *args, **kwargs)
     return await loop.run_in_executor(None, bound)
 
-__all__ = ["run_in_thread"]
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    """Linear-interpolated percentile (``pct`` in 0..100) of ``values``; ``None`` if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return float(ordered[0])
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return float(ordered[low])
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+__all__ = ["percentile", "run_in_thread"]
@@ -5,17 +5,37 @@ for executing chatbot evaluation datasets against heterogeneous targets (API, AD
 etc.).
 """
 
-from .runner_core import RunnerConfig, run_async_job, run_job
+from .runner_core import (
+    JobControl,
+    RunnerConfig,
+    graceful_shutdown,
+    run_async_job,
+    run_async_matrix_stream_job,
+    run_job,
+    run_matrix_stream_job,
+    run_stream_job,
+)
+from .matrix import MatrixVariant, build_matrix_variants
 from .dataset import load_dataset
 from lm_eval_so.core.backends.base import backend_registry, ChatBackend, register_backend
 
 # ensure built-in backends register
 import lm_eval_so.core.backends.openai_backend
 import lm_eval_so.core.backends.adb_cli_backend
+import lm_eval_so.core.backends.http_json_backend
+import lm_eval_so.core.backends.websocket_backend
+import lm_eval_so.core.backends.load_balanced_backend
 
 __all__ = [
+    "JobControl",
+    "graceful_shutdown",
     "RunnerConfig",
     "run_job",
+    "run_stream_job",
+    "run_matrix_stream_job",
+    "run_async_matrix_stream_job",
+    "MatrixVariant",
+    "build_matrix_variants",
     "run_async_job",
     "load_dataset",
     "backend_registry",
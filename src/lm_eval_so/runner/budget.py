@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Union
+
+from .models import RunResult, TokenUsage
+
+# USD per 1M tokens: {"model": {"input": 0.15, "output": 0.60}}
+PriceTable = Mapping[str, Mapping[str, float]]
+
+
+def load_price_table(path: Union[str, Path]) -> Dict[str, Dict[str, float]]:
+    """Read a JSON price table mapping model names to per-1M-token input/output prices."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError(f"Price table {path} must be a JSON object of model -> prices")
+    table: Dict[str, Dict[str, float]] = {}
+    for model, prices in data.items():
+        if not isinstance(prices, dict) or not {"input", "output"} <= set(prices):
+            raise ValueError(f"Price table entry {model!r} needs 'input' and 'output' prices")
+        table[str(model)] = {"input": float(prices["input"]), "output": float(prices["output"])}
+    return table
+
+
+def lookup_price(prices: PriceTable, model: Optional[str]) -> Optional[Mapping[str, float]]:
+    """Exact match first, then the longest table key that prefixes ``model``.
+
+    This lets ``gpt-4o-mini`` price dated snapshots such as ``gpt-4o-mini-2024-07-18``.
+    """
+    if not model:
+        return None
+    if model in prices:
+        return prices[model]
+    candidates = [key for key in prices if model.startswith(key)]
+    return prices[max(candidates, key=len)] if candidates else None
+
+
+class JobBudget:
+    """Live token/cost/time accounting for one job.
+
+    Tokens come from ``ChatResponse.usage`` of finished samples (cache hits are free).
+    ``exhausted_reason`` returns ``"tokens"``, ``"cost"`` or ``"deadline"`` once a limit
+    is reached; the scheduler then stops admitting samples and drains in-flight ones,
+    so the final spend can overshoot a limit by what was already in flight.
+    """
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        max_cost: Optional[float] = None,
+        deadline_seconds: Optional[float] = None,
+        prices: Optional[PriceTable] = None,
+    ) -> None:
+        self.model = model
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.deadline_seconds = deadline_seconds
+        self.price = lookup_price(prices or {}, model)
+        if max_cost is not None and self.price is None:
+            raise ValueError(f"max_cost is set but the price table has no entry for model {model!r}")
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.total_tokens = 0
+        self.cost = 0.0
+        self.truncated_by: Optional[str] = None
+        self._started = time.monotonic()
+
+    def observe(self, result: RunResult) -> None:
+        if result.request_context.get("cache") in ("hit", "coalesced"):
+            return
+        usage = result.response.usage if result.response is not None else None
+        if usage is not None:
+            self.charge(usage)
+
+    def charge(self, usage: TokenUsage) -> None:
+        """Add usage that has no result of its own, such as a losing hedge."""
+        input_tokens = usage.input_tokens or 0
+        output_tokens = usage.output_tokens or 0
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        self.total_tokens += usage.total_tokens if usage.total_tokens is not None else input_tokens + output_tokens
+        if self.price is not None:
+            self.cost += (input_tokens * self.price["input"] + output_tokens * self.price["output"]) / 1_000_000
+
+    def exhausted_reason(self) -> Optional[str]:
+        if self.truncated_by is None:
+            if self.max_tokens is not None and self.total_tokens >= self.max_tokens:
+                self.truncated_by = "tokens"
+            elif self.max_cost is not None and self.cost >= self.max_cost:
+                self.truncated_by = "cost"
+            elif self.deadline_seconds is not None and time.monotonic() - self._started >= self.deadline_seconds:
+                self.truncated_by = "deadline"
+        return self.truncated_by
+
+    def to_metadata(self) -> Dict[str, Any]:
+        return {
+            "truncated": self.truncated_by is not None,
+            "truncated_by": self.truncated_by,
+            "max_tokens": self.max_tokens,
+            "max_cost": self.max_cost,
+            "deadline_seconds": self.deadline_seconds,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": self.total_tokens,
+            "cost": round(self.cost, 6) if self.price is not None else None,
+            "elapsed_seconds": round(time.monotonic() - self._started, 3),
+        }
+
+
+__all__ = ["JobBudget", "PriceTable", "load_price_table", "lookup_price"]
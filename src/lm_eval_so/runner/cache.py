@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence, Union
+
+from .models import ChatResponse, Message
+from .utils import run_in_thread
+
+logger = logging.getLogger("lm_eval_so.runner.cache")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses(accessed_at);
+"""
+
+
+# backend options that never change which service answers or what it says: secrets
+# (kept out of the key material) and connection/pool/health tuning
+_KEY_EXCLUDED_OPTIONS = frozenset(
+    {
+        "api_key",
+        "headers",
+        "max_connections",
+        "max_keepalive_connections",
+        "keepalive_expiry",
+        "http2",
+        "connect_timeout",
+        "read_timeout",
+        "pool_timeout",
+        "pool_size",
+        "limit_per_host",
+        "max_streams_per_connection",
+        "gzip_request",
+        "ewma_alpha",
+        "eject_window",
+        "eject_failure_rate",
+        "eject_min_requests",
+        "eject_seconds",
+        "failure_penalty_ms",
+        "session_max_restarts",
+    }
+)
+
+
+def _key_options(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {str(k): _key_options(v) for k, v in value.items() if k not in _KEY_EXCLUDED_OPTIONS}
+    if isinstance(value, (list, tuple)):
+        return [_key_options(v) for v in value]
+    return value
+
+
+def build_cache_key(
+    backend: str,
+    model: Optional[str],
+    parameters: Mapping[str, Any],
+    messages: Sequence[Message],
+    backend_options: Optional[Mapping[str, Any]] = None,
+) -> str:
+    """Content hash of everything that determines a backend response.
+
+    ``backend_options`` such as ``url``/``base_url``/``endpoints``/``request_template``
+    decide which service answers, so they are part of the key; secrets and pool
+    tuning are left out.
+    """
+    normalized = [
+        {"role": m.role, "content": (m.content or "").strip(), "name": m.name}
+        for m in messages
+    ]
+    material: Dict[str, Any] = {
+        "backend": backend,
+        "model": model,
+        "parameters": parameters,
+        "messages": normalized,
+    }
+    options = _key_options(backend_options or {})
+    if options:
+        # only added when present, so keys of option-less runs stay the same
+        material["backend_options"] = options
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Persistent SQLite cache of successful ``ChatResponse`` payloads.
+
+    Entries older than ``ttl_seconds`` are treated as misses and purged on open. When
+    ``max_bytes`` is set, least-recently-used entries are evicted after each insert
+    until the stored payload size fits.
+
+    The runner uses ``aget``/``aput``, which run the SQLite calls in a worker thread.
+    Writes are committed every ``commit_every`` changes and on ``close``, so a crash
+    can lose the most recent entries but never corrupts the cache.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        commit_every: int = 32,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.commit_every = max(1, commit_every)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._purge_expired()
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self._total_bytes = int(row[0])
+
+    def get(self, key: str) -> Optional[ChatResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            payload, created_at = row
+            now = time.time()
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._changed()
+        try:
+            return ChatResponse.from_dict(json.loads(payload))
+        except (json.JSONDecodeError, TypeError, ValueError):
+            logger.warning("discarding undecodable cache entry %s", key)
+            return None
+
+    def put(self, key: str, response: ChatResponse) -> None:
+        payload = json.dumps(response.to_dict(), ensure_ascii=False, default=str)
+        size = len(payload.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, payload, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, size, now, now),
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self._evict()
+            self._changed()
+
+    async def aget(self, key: str) -> Optional[ChatResponse]:
+        return await run_in_thread(self.get, key)
+
+    async def aput(self, key: str, response: ChatResponse) -> None:
+        await run_in_thread(self.put, key, response)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pending:
+                self._conn.commit()
+            self._conn.close()
+
+    def _changed(self) -> None:
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self._conn.commit()
+            self._pending = 0
+
+    def _purge_expired(self) -> None:
+        if self.ttl_seconds is None:
+            return
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        self._conn.commit()
+
+    def _evict(self) -> None:
+        if self.max_bytes is None:
+            return
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at ASC LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total_bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"path": str(self.path), "entries": count, "bytes": self._total_bytes}
+
+
+__all__ = ["ResponseCache", "build_cache_key"]
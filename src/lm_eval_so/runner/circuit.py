@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .exceptions import BackendError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Per-backend circuit breaker that pauses scheduling during outages.
+
+    - closed: calls pass through; ``failure_threshold`` consecutive outage failures
+      (retryable errors other than rate limiting) trip the breaker.
+    - open: callers wait in ``acquire`` instead of burning retries. After
+      ``reset_seconds`` the breaker moves to half-open.
+    - half-open: up to ``half_open_probes`` callers go through as probes. A
+      successful probe closes the breaker, a failed one re-opens it.
+
+    If the breaker has not closed ``max_open_seconds`` after the first trip of an
+    outage, it gives up: ``on_give_up`` is called (the runner uses it to drain the
+    job) and waiting callers fail fast with ``error_type="circuit_open"``.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_seconds: float = 30.0,
+        half_open_probes: int = 1,
+        max_open_seconds: Optional[float] = None,
+        on_give_up: Optional[Callable[[], None]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = max(0.0, reset_seconds)
+        self.half_open_probes = max(1, half_open_probes)
+        self.max_open_seconds = max_open_seconds
+        self.on_give_up = on_give_up
+        self.logger = logger or logging.getLogger("lm_eval_so.runner")
+        self.state = CLOSED
+        self.events: List[Dict[str, Any]] = []
+        self._started = time.monotonic()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._outage_started: Optional[float] = None
+        self._open_seconds = 0.0
+        self._probes = 0
+        self._trips = 0
+        self._given_up = False
+        self._changed = asyncio.Event()
+
+    @property
+    def given_up(self) -> bool:
+        return self._given_up
+
+    async def acquire(self) -> bool:
+        """Wait until a call may proceed; returns ``True`` when the call is a probe."""
+        while True:
+            if self._given_up:
+                raise BackendError(
+                    "Circuit breaker is open; backend looks unavailable",
+                    error_type="circuit_open",
+                    retryable=False,
+                )
+            if self.state == CLOSED:
+                return False
+            now = time.monotonic()
+            if self.state == OPEN:
+                assert self._outage_started is not None
+                if self.max_open_seconds is not None and now - self._outage_started >= self.max_open_seconds:
+                    self._give_up()
+                    continue
+                if now >= self._opened_at + self.reset_seconds:
+                    self._transition(HALF_OPEN, "reset_timeout")
+                    continue
+                deadline = self._opened_at + self.reset_seconds
+                if self.max_open_seconds is not None:
+                    deadline = min(deadline, self._outage_started + self.max_open_seconds)
+                await self._wait(deadline - now)
+                continue
+            if self._probes < self.half_open_probes:
+                self._probes += 1
+                return True
+            await self._wait(None)
+
+    def record_success(self, probe: bool) -> None:
+        if probe:
+            self._probes -= 1
+        if self.state == HALF_OPEN and probe:
+            self._transition(CLOSED, "probe_succeeded")
+        if self.state == CLOSED:
+            self._failures = 0
+
+    def record_failure(self, probe: bool) -> None:
+        """Count an outage-like failure (timeouts, 5xx, connection errors)."""
+        if probe:
+            self._probes -= 1
+        if self.state == HALF_OPEN and probe:
+            self._trip("probe_failed")
+        elif self.state == CLOSED:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._trip("consecutive_failures")
+
+    def release(self, probe: bool) -> None:
+        """Give back a probe slot without an outcome (cancelled or rate limited)."""
+        if not probe:
+            return
+        self._probes -= 1
+        self._notify()
+
+    def _trip(self, reason: str) -> None:
+        self._trips += 1
+        self._opened_at = time.monotonic()
+        if self._outage_started is None:
+            self._outage_started = self._opened_at
+        self._transition(OPEN, reason)
+
+    def _give_up(self) -> None:
+        self._given_up = True
+        self._transition(OPEN, "max_open_exceeded")
+        self.logger.error("circuit breaker gave up after %.1fs open", self.max_open_seconds or 0.0)
+        if self.on_give_up is not None:
+            self.on_give_up()
+
+    def _transition(self, state: str, reason: str) -> None:
+        now = time.monotonic()
+        if self.state != CLOSED and state == CLOSED and self._outage_started is not None:
+            self._open_seconds += now - self._outage_started
+            self._outage_started = None
+        old, self.state = self.state, state
+        if state == CLOSED:
+            self._failures = 0
+        self.events.append(
+            {
+                "elapsed_s": round(now - self._started, 3),
+                "from": old,
+                "to": state,
+                "reason": reason,
+            }
+        )
+        self.logger.warning("circuit breaker %s -> %s (%s)", old, state, reason)
+        self._notify()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def _wait(self, timeout: Optional[float]) -> None:
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def to_metadata(self) -> Dict[str, Any]:
+        open_seconds = self._open_seconds
+        if self._outage_started is not None:
+            open_seconds += time.monotonic() - self._outage_started
+        return {
+            "state": self.state,
+            "trips": self._trips,
+            "gave_up": self._given_up,
+            "open_seconds": round(open_seconds, 3),
+            "events": self.events,
+        }
+
+
+__all__ = ["CircuitBreaker"]
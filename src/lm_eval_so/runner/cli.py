@@ -3,19 +3,36 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import sys
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Sequence
 
 from lm_eval_so.core.logging import configure_logging
+from lm_eval_so.core.storage import LocalFileSystemStorage
 
 from lm_eval_so.core.backends import backend_registry
-from . import RunnerConfig, load_dataset, run_job, __version__
-from .models import RunConfig
-from .storage import write_run_metadata, write_run_results
+from . import JobControl, RunnerConfig, graceful_shutdown, load_dataset, run_matrix_stream_job, run_stream_job, __version__
+from .journal import (
+    RERUNNABLE_STATUSES,
+    ResultJournal,
+    compact_journal,
+    iter_journal_records,
+    load_completed_sample_ids,
+    sort_journal,
+)
+from .budget import load_price_table, lookup_price
+from .matrix import build_matrix_variants, load_variant_file
+from .metrics import serve_metrics
+from .models import DatasetInfo, RunConfig, TestSample
+from .sharding import merge_shard_results, run_sharded_job
+from .storage import write_run_metadata
 
 
 def _build_parser() -> argparse.ArgumentParser:
-    p = argparse.ArgumentParser(prog="lm-eval-runner", description="Chatbot Test Runner")
+    p = argparse.ArgumentParser(
+        prog="lm-eval-runner",
+        description="Chatbot Test Runner (see also: lm-eval-runner loadtest|sweep --help)",
+    )
     p.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
 
     # dataset
@@ -23,25 +40,153 @@ def _build_parser() -> argparse.ArgumentParser:
     p.add_argument("--metadata", default=None, help="Optional metadata.json path (if not in dataset dir)")
 
     # backend selection
-    p.add_argument("--backend", required=True, help="Backend name (e.g. openai, adb-cli)")
+    p.add_argument("--backend", default=None, help="Backend name (e.g. openai, adb-cli); required unless --matrix")
     p.add_argument("--model", default=None, help="Model id/name for the backend")
 
     # run config parameters / backend options
     p.add_argument("--param", action="append", default=[], help="Run parameter key=value (can repeat)")
     p.add_argument("--backend-opt", action="append", default=[], help="Backend option key=value (can repeat)")
+    p.add_argument(
+        "--matrix",
+        default=None,
+        help="YAML/JSON list of (backend, model, parameters) variants to run in one pass; "
+        "results go to one output subdirectory per variant",
+    )
 
     # runner options
     p.add_argument("--engine", choices=["sync"], default="sync", help="Execution engine (currently only sync exposed)")
     p.add_argument("--max-concurrency", type=int, default=2)
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Shard samples by id across N processes; concurrency and rate limits are split between them",
+    )
+    p.add_argument(
+        "--adaptive-concurrency",
+        action="store_true",
+        help="Resize concurrency during the run from latency, 429s and rate-limit headers",
+    )
+    p.add_argument("--min-concurrency", type=int, default=1, help="Lower bound for --adaptive-concurrency")
+    p.add_argument("--adaptive-max-concurrency", type=int, default=None, help="Upper bound for --adaptive-concurrency")
+    p.add_argument(
+        "--dispatch-order",
+        choices=["dataset", "shuffle", "lpt"],
+        default="dataset",
+        help="Order samples are sent in: dataset order, shuffled, or longest expected first (lpt)",
+    )
+    p.add_argument(
+        "--ordered-output",
+        action="store_true",
+        help="Write run_results.jsonl in dispatch order through a bounded reorder buffer",
+    )
+    p.add_argument(
+        "--reorder-buffer-mb", type=float, default=64.0, help="Memory for out-of-order results with --ordered-output"
+    )
+    p.add_argument(
+        "--reorder-overflow",
+        choices=["throttle", "spill"],
+        default="throttle",
+        help="When the reorder buffer is full: pause scheduling (throttle) or spill results to disk",
+    )
+    p.add_argument("--dispatch-seed", type=int, default=None, help="Seed for --dispatch-order shuffle")
+    p.add_argument(
+        "--latency-history",
+        default=None,
+        help="Previous run_results.jsonl whose per-sample latencies rank samples for --dispatch-order lpt",
+    )
+    p.add_argument("--warmup-requests", type=int, default=0, help="Warm up with this many requests before measuring")
+    p.add_argument("--warmup-seconds", type=float, default=0.0, help="Warm up for this many seconds before measuring")
+    p.add_argument(
+        "--warmup-mode",
+        choices=["synthetic", "tagged"],
+        default="synthetic",
+        help="synthetic: throwaway prompts before the run; tagged: first real samples are marked warmup",
+    )
+    p.add_argument("--warmup-prompt", default="Hello", help="Prompt used by synthetic warmup requests")
     p.add_argument("--timeout", type=float, default=60.0, help="Per-sample timeout in seconds")
     p.add_argument("--max-retries", type=int, default=2, help="Number of retries on retryable errors")
+    p.add_argument(
+        "--retry-budget",
+        type=float,
+        default=None,
+        metavar="RATIO",
+        help="Job-wide cap on retries as a fraction of requests (e.g. 0.1), checked before --max-retries",
+    )
+    p.add_argument(
+        "--retry-after-max", type=float, default=60.0, help="Longest server Retry-After hint to honor, in seconds"
+    )
+    p.add_argument(
+        "--hedge-percentile",
+        type=float,
+        default=None,
+        help="Send a duplicate request when an attempt is slower than this latency percentile (e.g. 95)",
+    )
+    p.add_argument(
+        "--hedge-budget", type=float, default=0.05, help="Max hedged requests as a fraction of requests (default 0.05)"
+    )
+    p.add_argument(
+        "--circuit-breaker",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Pause scheduling after N consecutive timeouts/5xx/connection errors and probe before resuming",
+    )
+    p.add_argument("--circuit-reset", type=float, default=30.0, help="Seconds the circuit stays open before probing")
+    p.add_argument(
+        "--circuit-max-open",
+        type=float,
+        default=None,
+        help="Drain the run if the backend is still down this many seconds after the circuit opened",
+    )
+    p.add_argument(
+        "--max-tokens-budget",
+        type=int,
+        default=None,
+        help="Stop scheduling new samples once responses used this many tokens (in-flight samples drain)",
+    )
+    p.add_argument(
+        "--max-cost",
+        type=float,
+        default=None,
+        help="Stop scheduling new samples once spend reaches this amount (needs --price-table)",
+    )
+    p.add_argument(
+        "--price-table",
+        default=None,
+        help='JSON file of per-1M-token prices, e.g. {"gpt-4o-mini": {"input": 0.15, "output": 0.6}}',
+    )
+    p.add_argument("--deadline", type=float, default=None, help="Stop scheduling new samples after this many seconds")
     p.add_argument("--rate-limit", type=float, default=None, help="Max requests per second (float)")
+    p.add_argument("--rate-limit-burst", type=int, default=None, help="Requests allowed in a burst when idle")
+    p.add_argument("--tokens-per-minute", type=float, default=None, help="Max prompt+completion tokens per minute")
+    p.add_argument("--cache", default=None, help="SQLite response cache path (enables caching)")
+    p.add_argument("--cache-ttl", type=float, default=None, help="Ignore cached responses older than this many seconds")
+    p.add_argument("--cache-max-mb", type=float, default=None, help="Evict least-recently-used entries above this size")
     p.add_argument("--trace-prefix", default="run", help="Prefix for trace_id values")
 
     # output
     p.add_argument("--output-dir", required=True, help="Directory to store run_results.jsonl and run_metadata.json")
+    p.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from an existing run_results.jsonl, skipping samples already recorded",
+    )
+    p.add_argument(
+        "--rerun-status",
+        action="append",
+        default=[],
+        choices=list(RERUNNABLE_STATUSES),
+        help="With --resume, run samples recorded with this status again (can repeat)",
+    )
 
     # misc
+    p.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve live Prometheus metrics on http://127.0.0.1:PORT/metrics (with --workers, worker i uses PORT+i)",
+    )
     p.add_argument("--log-level", default="INFO", help="Logging level (DEBUG, INFO, WARNING, ERROR)")
 
     return p
@@ -63,8 +208,31 @@ def _parse_kv_list(items: list[str]) -> Dict[str, Any]:
 
 
 def main(argv: list[str] | None = None) -> None:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv and argv[0] == "loadtest":
+        from .loadgen import main as loadtest_main
+
+        loadtest_main(argv[1:])
+        return
+    if argv and argv[0] == "sweep":
+        from .sweep import main as sweep_main
+
+        sweep_main(argv[1:])
+        return
+
     parser = _build_parser()
     args = parser.parse_args(argv)
+    if not args.backend and not args.matrix:
+        parser.error("--backend is required unless --matrix is given")
+    if args.matrix and args.workers > 1:
+        parser.error("--workers is not supported with --matrix")
+    # checked before any output is opened: a failure later would truncate run_results.jsonl
+    price_table = load_price_table(Path(args.price_table).resolve()) if args.price_table else {}
+    variants = load_variant_file(Path(args.matrix).resolve()) if args.matrix else []
+    if args.max_cost is not None:
+        for model in [v.model for v in variants] if args.matrix else [args.model]:
+            if lookup_price(price_table, model) is None:
+                parser.error(f"--max-cost needs a --price-table entry for model {model!r}")
 
     configure_logging(level=getattr(logging, str(args.log_level).upper(), logging.INFO))
     logger = logging.getLogger("lm_eval_so.runner")
@@ -78,25 +246,60 @@ def main(argv: list[str] | None = None) -> None:
     params = _parse_kv_list(list(args.param or []))
     backend_opts = _parse_kv_list(list(args.backend_opt or []))
 
-    run_config = RunConfig(
-        backend=args.backend,
-        model=args.model,
-        parameters=params,
-        backend_options=backend_opts,
-    )
-
     options = RunnerConfig(
         max_concurrency=int(args.max_concurrency or 1),
+        adaptive_concurrency=bool(args.adaptive_concurrency),
+        min_concurrency=int(args.min_concurrency or 1),
+        adaptive_max_concurrency=args.adaptive_max_concurrency,
+        ordered_output=bool(args.ordered_output),
+        reorder_buffer_max_bytes=int(args.reorder_buffer_mb * 1024 * 1024),
+        reorder_overflow=args.reorder_overflow,
+        dispatch_order=args.dispatch_order,
+        dispatch_seed=args.dispatch_seed,
+        dispatch_history_path=Path(args.latency_history).resolve() if args.latency_history else None,
+        warmup_requests=int(args.warmup_requests or 0),
+        warmup_seconds=float(args.warmup_seconds or 0.0),
+        warmup_mode=args.warmup_mode,
+        warmup_prompt=args.warmup_prompt,
         timeout_seconds=float(args.timeout or 60.0),
         max_retries=int(args.max_retries or 0),
+        retry_budget_ratio=args.retry_budget,
+        retry_after_max_seconds=float(args.retry_after_max),
+        hedge_percentile=args.hedge_percentile,
+        hedge_budget=float(args.hedge_budget),
+        circuit_breaker_threshold=args.circuit_breaker,
+        circuit_breaker_reset_seconds=float(args.circuit_reset),
+        circuit_breaker_max_open_seconds=args.circuit_max_open,
+        max_tokens_budget=args.max_tokens_budget,
+        max_cost=args.max_cost,
+        deadline_seconds=args.deadline,
+        price_table=price_table,
         rate_limit_per_second=float(args.rate_limit) if args.rate_limit is not None else None,
+        rate_limit_burst=args.rate_limit_burst,
+        tokens_per_minute=args.tokens_per_minute,
         trace_prefix=str(args.trace_prefix or "run"),
+        cache_path=Path(args.cache).resolve() if args.cache else None,
+        cache_ttl_seconds=args.cache_ttl,
+        cache_max_bytes=int(args.cache_max_mb * 1024 * 1024) if args.cache_max_mb else None,
         output_dir=output_dir,
     )
 
-    if args.backend not in backend_registry.names():
-        available = ", ".join(backend_registry.names())
-        raise SystemExit(f"Unknown backend '{args.backend}'. Available: {available}")
+    if args.matrix:
+        options.variants = variants
+        _run_matrix(args, dataset_info, samples, options, logger)
+        return
+
+    run_config = RunConfig(
+        backend=args.backend,
+        model=args.model,
+        parameters=params,
+        backend_options=backend_opts,
+    )
+    _ensure_backend(args.backend)
+
+    if args.workers > 1:
+        _run_sharded(args, dataset_path, metadata_path, dataset_info, samples, run_config, options, logger)
+        return
 
     logger.info(
         "Starting run: dataset=%s backend=%s model=%s samples=%d",
@@ -106,24 +309,219 @@ def main(argv: list[str] | None = None) -> None:
         len(samples),
     )
 
-    from lm_eval_so.core.storage import LocalFileSystemStorage
-    
-    # ... (skipping logs)
+    storage = LocalFileSystemStorage(output_dir)
+    results_path = storage.get_path("run_results.jsonl")
+    done_ids = _load_done_ids(args, results_path, logger)
+    pending = (s for s in samples if s.id not in done_ids)
 
-    results = run_job(
-        dataset=dataset_info,
+    control = JobControl()
+    with serve_metrics(args.metrics_port) as metrics, graceful_shutdown(control, logger), ResultJournal(
+        results_path, resume=args.resume
+    ) as journal:
+        control.metrics = metrics
+        for result in run_stream_job(
+            dataset=dataset_info,
+            samples=pending,
+            backend_name=args.backend,
+            run_config=run_config,
+            options=options,
+            logger=logger,
+            control=control,
+        ):
+            journal.append(result)
+
+    metadata_path = _finish_run(
+        args,
+        storage,
+        dataset_info,
+        run_config,
+        options,
+        control=control,
         samples=samples,
+        skipped=sum(1 for s in samples if s.id in done_ids),
+        executed=journal.appended,
+        extra=control.metadata,
+    )
+    logger.info("Run completed. results=%s metadata=%s", results_path, metadata_path)
+
+
+def _run_matrix(
+    args: argparse.Namespace,
+    dataset_info: DatasetInfo,
+    samples: List[TestSample],
+    options: RunnerConfig,
+    logger: logging.Logger,
+) -> None:
+    variants = build_matrix_variants(options)
+    for variant in variants:
+        _ensure_backend(variant.run_config.backend)
+
+    storages: Dict[str, LocalFileSystemStorage] = {}
+    journals: Dict[str, ResultJournal] = {}
+    skipped: Dict[str, int] = {}
+    for variant in variants:
+        storage = LocalFileSystemStorage(variant.options.output_dir or Path(args.output_dir) / variant.name)
+        results_path = storage.get_path("run_results.jsonl")
+        done_ids = _load_done_ids(args, results_path, logger)
+        variant.samples = [s for s in samples if s.id not in done_ids]
+        skipped[variant.name] = len(samples) - len(variant.samples)
+        storages[variant.name] = storage
+        journals[variant.name] = ResultJournal(results_path, resume=args.resume)
+
+    logger.info(
+        "Starting matrix run: dataset=%s variants=%s samples=%d",
+        dataset_info.dataset_id or args.dataset,
+        ", ".join(v.name for v in variants),
+        len(samples),
+    )
+
+    control = JobControl()
+    try:
+        with serve_metrics(args.metrics_port) as metrics, graceful_shutdown(control, logger):
+            control.metrics = metrics
+            for name, result in run_matrix_stream_job(
+                dataset=dataset_info,
+                samples=samples,
+                variants=variants,
+                logger=logger,
+                control=control,
+            ):
+                journals[name].append(result)
+    finally:
+        for journal in journals.values():
+            journal.close()
+
+    per_variant = control.metadata.get("variants", {})
+    for variant in variants:
+        metadata_path = _finish_run(
+            args,
+            storages[variant.name],
+            dataset_info,
+            variant.run_config,
+            variant.options,
+            control=control,
+            samples=samples,
+            skipped=skipped[variant.name],
+            executed=journals[variant.name].appended,
+            extra={"variant": variant.name, **per_variant.get(variant.name, {})},
+        )
+        logger.info("Variant %s completed. metadata=%s", variant.name, metadata_path)
+
+
+def _run_sharded(
+    args: argparse.Namespace,
+    dataset_path: Path,
+    metadata_path: Path | None,
+    dataset_info: DatasetInfo,
+    samples: List[TestSample],
+    run_config: RunConfig,
+    options: RunnerConfig,
+    logger: logging.Logger,
+) -> None:
+    output_dir = Path(args.output_dir).resolve()
+    storage = LocalFileSystemStorage(output_dir)
+    results_path = storage.get_path("run_results.jsonl")
+    with ResultJournal(results_path, resume=args.resume) as journal:
+        if args.resume:
+            recovered = merge_shard_results(output_dir, journal)
+            if recovered:
+                logger.info("Recovered %d results from an interrupted sharded run", recovered)
+    done_ids = _load_done_ids(args, results_path, logger)
+
+    logger.info(
+        "Starting sharded run: dataset=%s backend=%s model=%s samples=%d workers=%d",
+        dataset_info.dataset_id or dataset_path,
+        args.backend,
+        args.model,
+        len(samples),
+        args.workers,
+    )
+    states = run_sharded_job(
+        dataset_path=dataset_path,
+        metadata_path=metadata_path,
         backend_name=args.backend,
         run_config=run_config,
         options=options,
+        output_dir=output_dir,
+        workers=args.workers,
+        skip_ids=done_ids,
         logger=logger,
+        metrics_port=args.metrics_port,
     )
+    with ResultJournal(results_path, resume=True) as journal:
+        executed = merge_shard_results(output_dir, journal)
 
-    storage = LocalFileSystemStorage(output_dir)
-    results_path = write_run_results(results, storage)
-    metadata_path = write_run_metadata(dataset_info, run_config, options, results, storage)
+    control = JobControl()
+    for state in states:
+        if state.get("stop_reason"):
+            control.request_stop(str(state["stop_reason"]))
+    metadata_path_out = _finish_run(
+        args,
+        storage,
+        dataset_info,
+        run_config,
+        options,
+        control=control,
+        samples=samples,
+        skipped=sum(1 for s in samples if s.id in done_ids),
+        executed=executed,
+        extra={"workers": args.workers, "shards": states},
+    )
+    logger.info("Run completed. results=%s metadata=%s", results_path, metadata_path_out)
 
-    logger.info("Run completed. results=%s metadata=%s", results_path, metadata_path)
+
+def _ensure_backend(name: str) -> None:
+    if name not in backend_registry.names():
+        available = ", ".join(backend_registry.names())
+        raise SystemExit(f"Unknown backend '{name}'. Available: {available}")
+
+
+def _load_done_ids(args: argparse.Namespace, results_path: str, logger: logging.Logger) -> set[str]:
+    if not args.resume:
+        return set()
+    done_ids = load_completed_sample_ids(results_path, rerun_statuses=args.rerun_status)
+    logger.info("Resuming: %d samples already recorded in %s", len(done_ids), results_path)
+    return done_ids
+
+
+def _finish_run(
+    args: argparse.Namespace,
+    storage: LocalFileSystemStorage,
+    dataset_info: DatasetInfo,
+    run_config: RunConfig,
+    options: RunnerConfig,
+    *,
+    control: JobControl,
+    samples: Sequence[TestSample],
+    skipped: int,
+    executed: int,
+    extra: Dict[str, Any],
+) -> str:
+    results_path = storage.get_path("run_results.jsonl")
+    if args.resume:
+        compact_journal(results_path)
+    if options.dispatch_order != "dataset" or (options.ordered_output and args.workers > 1):
+        # results land in completion (or shard) order; restore dataset order for a stable output
+        sort_journal(results_path, (s.id for s in samples))
+    budget_truncated = bool((extra.get("budget") or {}).get("truncated")) or any(
+        (shard.get("budget") or {}).get("truncated") for shard in extra.get("shards", [])
+    )
+    run_state = {
+        "completed": not control.stopped and not budget_truncated,
+        "budget_truncated": budget_truncated,
+        "stop_reason": control.stop_reason,
+        "resumed": bool(args.resume),
+        "skipped_samples": skipped,
+        "executed_samples": executed,
+    }
+    return write_run_metadata(
+        dataset_info,
+        run_config,
+        options,
+        iter_journal_records(results_path),
+        storage,
+        extra={"run_state": run_state, **extra},
+    )
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Mapping, Optional
+
+
+class ConcurrencyLimiter:
+    """Semaphore whose limit can be changed while waiters are queued.
+
+    Raising the limit wakes queued waiters immediately; lowering it lets in-flight
+    holders finish and only admits new ones once ``in_flight`` drops below the limit.
+    Deferred waiters (retries) are only admitted when no regular waiter is queued, so
+    retries never take a slot ahead of fresh work.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self._limit = max(1, int(limit))
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._deferred: Deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def set_limit(self, limit: int) -> None:
+        self._limit = max(1, int(limit))
+        self._wake()
+
+    async def acquire(self, deferred: bool = False) -> None:
+        if self._in_flight < self._limit and not self._waiters and not (deferred and self._deferred):
+            self._in_flight += 1
+            return
+        queue = self._deferred if deferred else self._waiters
+        fut = asyncio.get_running_loop().create_future()
+        queue.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # the slot was handed over just before cancellation; pass it on
+                self.release()
+            else:
+                try:
+                    queue.remove(fut)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while (self._waiters or self._deferred) and self._in_flight < self._limit:
+            fut = self._waiters.popleft() if self._waiters else self._deferred.popleft()
+            if fut.done():
+                continue
+            self._in_flight += 1
+            fut.set_result(None)
+
+    def deferred(self) -> "_DeferredSlot":
+        """``async with limiter.deferred():`` acquires a slot behind regular waiters."""
+        return _DeferredSlot(self)
+
+    async def __aenter__(self) -> "ConcurrencyLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self.release()
+
+
+class _DeferredSlot:
+    def __init__(self, limiter: ConcurrencyLimiter) -> None:
+        self._limiter = limiter
+
+    async def __aenter__(self) -> ConcurrencyLimiter:
+        await self._limiter.acquire(deferred=True)
+        return self._limiter
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self._limiter.release()
+
+
+def _header_int(headers: Optional[Mapping[str, str]], name: str) -> Optional[int]:
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveConcurrencyController:
+    """AIMD controller that resizes a ``ConcurrencyLimiter`` during a run.
+
+    - Additive increase: +1 after a full window of successful requests, as long as
+      smoothed latency stays within ``latency_tolerance`` x the best observed latency
+      and the provider's ``x-ratelimit-remaining-*`` headers leave headroom.
+    - Multiplicative decrease: x ``decrease_factor`` on ``rate_limit``/``timeout``
+      errors, on exhausted rate-limit headers, or when latency inflates past the
+      tolerance. Decreases are spaced by one window of completions so a burst of
+      failures from the same congestion event only shrinks the window once.
+
+    Every change is recorded in ``changes`` for ``run_metadata.json``.
+    """
+
+    DECREASE_ERROR_TYPES = frozenset({"rate_limit", "timeout"})
+
+    def __init__(
+        self,
+        limiter: ConcurrencyLimiter,
+        min_limit: int,
+        max_limit: int,
+        latency_tolerance: float = 2.0,
+        decrease_factor: float = 0.7,
+        ewma_alpha: float = 0.2,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.limiter = limiter
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.latency_tolerance = latency_tolerance
+        self.decrease_factor = decrease_factor
+        self.ewma_alpha = ewma_alpha
+        self.logger = logger or logging.getLogger("lm_eval_so.runner")
+        self.changes: List[Dict[str, Any]] = []
+        self._started = time.monotonic()
+        self._completed = 0
+        self._successes_since_change = 0
+        self._completions_since_decrease = self.max_limit
+        self._smoothed_latency: Optional[float] = None
+        self._best_latency: Optional[float] = None
+        self.limiter.set_limit(min(max(limiter.limit, self.min_limit), self.max_limit))
+
+    @property
+    def limit(self) -> int:
+        return self.limiter.limit
+
+    def on_success(self, latency_ms: float, headers: Optional[Mapping[str, str]] = None) -> None:
+        self._completed += 1
+        self._completions_since_decrease += 1
+        self._observe_latency(latency_ms)
+
+        remaining_requests = _header_int(headers, "x-ratelimit-remaining-requests")
+        remaining_tokens = _header_int(headers, "x-ratelimit-remaining-tokens")
+        if remaining_requests == 0 or remaining_tokens == 0:
+            self._decrease("ratelimit_headers_exhausted")
+            return
+        if (
+            self._smoothed_latency is not None
+            and self._best_latency
+            and self._smoothed_latency > self._best_latency * self.latency_tolerance
+        ):
+            self._decrease("latency_inflation")
+            return
+
+        self._successes_since_change += 1
+        if self._successes_since_change < self.limit:
+            return
+        if remaining_requests is not None and remaining_requests < self.limit:
+            # provider headroom is smaller than one more window; hold steady
+            self._successes_since_change = 0
+            return
+        self._resize(self.limit + 1, "additive_increase")
+
+    def on_error(self, error_type: Optional[str]) -> None:
+        self._completed += 1
+        self._completions_since_decrease += 1
+        if error_type in self.DECREASE_ERROR_TYPES:
+            self._decrease(error_type or "error")
+
+    def _observe_latency(self, latency_ms: float) -> None:
+        if self._smoothed_latency is None:
+            self._smoothed_latency = latency_ms
+        else:
+            self._smoothed_latency += self.ewma_alpha * (latency_ms - self._smoothed_latency)
+        if self._best_latency is None or self._smoothed_latency < self._best_latency:
+            self._best_latency = self._smoothed_latency
+
+    def _decrease(self, reason: str) -> None:
+        if self._completions_since_decrease < self.limit:
+            return
+        self._completions_since_decrease = 0
+        self._resize(int(self.limit * self.decrease_factor), reason)
+        # let the baseline re-learn at the new operating point
+        self._best_latency = self._smoothed_latency
+
+    def _resize(self, new_limit: int, reason: str) -> None:
+        new_limit = min(max(new_limit, self.min_limit), self.max_limit)
+        self._successes_since_change = 0
+        if new_limit == self.limit:
+            return
+        old = self.limit
+        self.limiter.set_limit(new_limit)
+        self.changes.append(
+            {
+                "elapsed_s": round(time.monotonic() - self._started, 3),
+                "completed": self._completed,
+                "from": old,
+                "to": new_limit,
+                "reason": reason,
+                "smoothed_latency_ms": self._smoothed_latency,
+            }
+        )
+        self.logger.info("concurrency %d -> %d (%s)", old, new_limit, reason)
+
+    def to_metadata(self) -> Dict[str, Any]:
+        return {
+            "mode": "adaptive",
+            "min": self.min_limit,
+            "max": self.max_limit,
+            "final": self.limit,
+            "peak": max([c["to"] for c in self.changes] + [self.limit]),
+            "changes": self.changes,
+        }
+
+
+__all__ = ["AdaptiveConcurrencyController", "ConcurrencyLimiter"]
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from lm_eval_so.core.utils import percentile
+
+from .models import ChatResponse
+
+
+class HedgePolicy:
+    """Decides when a slow attempt gets a duplicate request.
+
+    The threshold is the ``percentile`` of the last ``window`` successful send
+    latencies; no hedging happens until ``min_samples`` latencies are known. Hedges
+    are capped at ``budget`` x the number of primary requests (0.05 = 5% extra).
+    ``rate_limited`` counts hedges skipped because no rate-limit permit was free.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        window: int = 1000,
+    ) -> None:
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = max(1, min_samples)
+        self.primaries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.rate_limited = 0
+        self._latencies: Deque[float] = deque(maxlen=max(self.min_samples, window))
+        self._threshold_ms: Optional[float] = None
+        self._stale = 0
+
+    def observe(self, latency_ms: float) -> None:
+        self._latencies.append(latency_ms)
+        self._stale += 1
+        # recomputing the percentile is O(n log n); refresh it every few observations
+        if self._threshold_ms is None or self._stale >= 16:
+            self._refresh()
+
+    def threshold_seconds(self) -> Optional[float]:
+        if len(self._latencies) < self.min_samples:
+            return None
+        if self._threshold_ms is None:
+            self._refresh()
+        return self._threshold_ms / 1000.0 if self._threshold_ms is not None else None
+
+    def try_acquire(self, admit: Optional[Callable[[], bool]] = None) -> bool:
+        """Reserve one hedge if the budget allows it and ``admit`` (if given) agrees."""
+        if self.hedges + 1 > self.budget * self.primaries:
+            return False
+        if admit is not None and not admit():
+            self.rate_limited += 1
+            return False
+        self.hedges += 1
+        return True
+
+    def _refresh(self) -> None:
+        self._stale = 0
+        if len(self._latencies) >= self.min_samples:
+            self._threshold_ms = percentile(list(self._latencies), self.percentile)
+
+    def to_metadata(self) -> Dict[str, Any]:
+        return {
+            "percentile": self.percentile,
+            "budget": self.budget,
+            "primaries": self.primaries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "rate_limited": self.rate_limited,
+            "threshold_ms": self._threshold_ms,
+        }
+
+
+async def hedged_send(
+    policy: HedgePolicy,
+    send: Callable[[], Awaitable[ChatResponse]],
+    on_hedge: Optional[Callable[[], None]] = None,
+    admit: Optional[Callable[[], bool]] = None,
+    on_loser: Optional[Callable[[ChatResponse], None]] = None,
+) -> Tuple[ChatResponse, bool]:
+    """Run ``send`` and, if it outlives the hedge threshold, race a duplicate.
+
+    The first successful response wins and the other request is cancelled. If one
+    request fails while the other is still running, the survivor is awaited.
+    ``admit`` is asked before the duplicate is sent (e.g. for a rate-limit permit) and
+    ``on_hedge`` is called once it is. ``on_loser`` receives the losing response when
+    it completed before it could be cancelled, so its usage can still be accounted.
+
+    Returns:
+        ``(response, hedge_won)``.
+    """
+    policy.primaries += 1
+    primary = asyncio.ensure_future(send())
+    winner: Optional["asyncio.Future[ChatResponse]"] = None
+    tasks: List["asyncio.Future[ChatResponse]"] = [primary]
+    try:
+        delay = policy.threshold_seconds()
+        if delay is not None:
+            await asyncio.wait({primary}, timeout=delay)
+            if not primary.done() and policy.try_acquire(admit):
+                tasks.append(asyncio.ensure_future(send()))
+                if on_hedge is not None:
+                    on_hedge()
+        pending = set(tasks)
+        first_error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    winner = task
+                    won = task is not primary
+                    if won:
+                        policy.hedge_wins += 1
+                    return task.result(), won
+                first_error = first_error or task.exception()
+        assert first_error is not None
+        raise first_error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        # consume exceptions of losers so they are not reported as never retrieved, and
+        # report losers that finished before the cancel landed
+        for task in tasks:
+            if task.done() and not task.cancelled() and task.exception() is None and task is not winner:
+                if on_loser is not None:
+                    on_loser(task.result())
+
+
+__all__ = ["HedgePolicy", "hedged_send"]
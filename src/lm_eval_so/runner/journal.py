@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple, Union
+
+from .models import RunResult
+
+logger = logging.getLogger("lm_eval_so.runner.journal")
+
+RERUNNABLE_STATUSES = ("timeout", "error", "retry")
+
+
+class ResultJournal:
+    """Append-only ``run_results.jsonl`` writer that flushes every result.
+
+    Each completed ``RunResult`` is written as one line and flushed immediately, so a
+    crashed or interrupted run keeps everything that finished before the failure.
+    Opening with ``resume=True`` keeps the existing file (dropping a torn last line);
+    otherwise the journal is truncated.
+    """
+
+    def __init__(self, path: Union[str, Path], resume: bool = False) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.path.exists():
+            _truncate_partial_tail(self.path)
+            mode = "a"
+        else:
+            mode = "w"
+        self._fh = self.path.open(mode, encoding="utf-8")
+        self.appended = 0
+
+    def append(self, result: Union[RunResult, Dict[str, Any]]) -> None:
+        record = result.to_record() if isinstance(result, RunResult) else result
+        self._fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._fh.flush()
+        self.appended += 1
+
+    def close(self) -> None:
+        if not self._fh.closed:
+            self._fh.close()
+
+    def __enter__(self) -> "ResultJournal":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def iter_journal_records(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Yield records from a journal, skipping blank and undecodable lines."""
+    p = Path(path)
+    if not p.exists():
+        return
+    with p.open("r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("skipping corrupt journal line %d in %s", lineno, p)
+
+
+def load_completed_sample_ids(
+    path: Union[str, Path],
+    rerun_statuses: Optional[Iterable[str]] = None,
+) -> Set[str]:
+    """Return sample ids whose latest journal record does not need to run again.
+
+    Args:
+        path: Journal (``run_results.jsonl``) path.
+        rerun_statuses: Statuses (e.g. ``timeout``/``error``/``retry``) that should be
+            treated as not done, so those samples are executed again.
+    """
+    rerun = set(rerun_statuses or ())
+    latest: Dict[str, str] = {}
+    for record in iter_journal_records(path):
+        sample_id = record.get("sample_id")
+        if sample_id is not None:
+            latest[str(sample_id)] = str(record.get("status"))
+    return {sid for sid, status in latest.items() if status not in rerun}
+
+
+def compact_journal(path: Union[str, Path]) -> int:
+    """Rewrite the journal keeping only the latest record per sample id.
+
+    Resumed runs append re-executed samples after their earlier attempts; compaction
+    restores the one-line-per-sample invariant that the evaluator expects. Runs in two
+    streaming passes so the file is never loaded into memory.
+
+    Returns:
+        Number of records dropped.
+    """
+    p = Path(path)
+    if not p.exists():
+        return 0
+    last_index: Dict[str, int] = {}
+    records = 0
+    for idx, record in enumerate(iter_journal_records(p)):
+        last_index[str(record.get("sample_id"))] = idx
+        records = idx + 1
+    if len(last_index) == records:
+        return 0
+
+    tmp = p.with_suffix(p.suffix + ".tmp")
+    with tmp.open("w", encoding="utf-8") as out:
+        for idx, record in enumerate(iter_journal_records(p)):
+            if last_index.get(str(record.get("sample_id"))) == idx:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    os.replace(tmp, p)
+    return records - len(last_index)
+
+
+def sort_journal(path: Union[str, Path], sample_order: Iterable[str]) -> None:
+    """Rewrite the journal in ``sample_order`` (e.g. dataset order).
+
+    Records are written in completion order; runs that dispatch out of dataset order
+    use this to make the output order stable. Only line offsets are held in memory.
+    The latest record per sample wins, and ids missing from ``sample_order`` go last
+    in journal order.
+    """
+    p = Path(path)
+    if not p.exists():
+        return
+    offsets: Dict[str, Tuple[int, int]] = {}
+    with p.open("rb") as f:
+        pos = 0
+        for line in f:
+            if line.strip():
+                try:
+                    offsets[str(json.loads(line).get("sample_id"))] = (pos, len(line))
+                except json.JSONDecodeError:
+                    logger.warning("skipping corrupt journal line at byte %d in %s", pos, p)
+            pos += len(line)
+    rank: Dict[str, int] = {}
+    for sample_id in sample_order:
+        rank.setdefault(sample_id, len(rank))
+    ordered = sorted(offsets.items(), key=lambda item: (rank.get(item[0], len(rank)), item[1][0]))
+
+    tmp = p.with_suffix(p.suffix + ".tmp")
+    with p.open("rb") as src, tmp.open("wb") as out:
+        for _, (offset, length) in ordered:
+            src.seek(offset)
+            line = src.read(length)
+            out.write(line if line.endswith(b"\n") else line + b"\n")
+    os.replace(tmp, p)
+
+
+def _truncate_partial_tail(path: Path) -> None:
+    """Drop a trailing line that was cut off mid-write by a crash."""
+    with path.open("rb+") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        pos = size - 1
+        while pos > 0:
+            chunk = min(4096, pos)
+            pos -= chunk
+            f.seek(pos)
+            data = f.read(chunk)
+            nl = data.rfind(b"\n")
+            if nl != -1:
+                f.truncate(pos + nl + 1)
+                return
+        f.truncate(0)
+
+
+__all__ = [
+    "RERUNNABLE_STATUSES",
+    "ResultJournal",
+    "compact_journal",
+    "iter_journal_records",
+    "load_completed_sample_ids",
+    "sort_journal",
+]
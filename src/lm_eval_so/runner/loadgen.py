@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import random
+import time
+import uuid
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Literal, Optional, Sequence
+
+from lm_eval_so.core.backends.base import backend_registry
+from lm_eval_so.core.context import RunnerContext
+from lm_eval_so.core.logging import configure_logging
+from lm_eval_so.core.utils import percentile
+
+from .dataset import load_dataset
+from .exceptions import BackendError
+from .models import DatasetInfo, RunConfig, RunRequest, TestSample
+
+ArrivalProcess = Literal["constant", "poisson"]
+
+
+@dataclass
+class LoadTestConfig:
+    """Open-loop load test settings.
+
+    Requests are issued at ``rate`` per second for ``duration_seconds`` regardless of
+    completions. Arrivals in the first ``warmup_seconds`` are sent but excluded from
+    the report. An arrival that finds ``max_outstanding`` requests already in flight
+    is dropped, and one the generator dispatches more than ``late_tolerance_ms``
+    after its scheduled time is counted as late (the generator itself fell behind).
+    """
+
+    rate: float
+    duration_seconds: float
+    arrival: ArrivalProcess = "poisson"
+    warmup_seconds: float = 0.0
+    max_outstanding: int = 1000
+    timeout_seconds: float = 60.0
+    late_tolerance_ms: float = 10.0
+    seed: Optional[int] = None
+
+
+@dataclass
+class LoadTestReport:
+    """Measured outcome of a load test (warmup arrivals excluded)."""
+
+    offered_rate: float
+    arrival: str
+    duration_seconds: float
+    issued: int = 0
+    ok: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    dropped: int = 0
+    late: int = 0
+    achieved_throughput: float = 0.0
+    latency_ms: Dict[str, Optional[float]] = field(default_factory=dict)
+    error_types: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def arrival_offsets(rate: float, process: ArrivalProcess, rng: random.Random) -> Iterator[float]:
+    """Yield arrival times (seconds from start) for a constant or Poisson process."""
+    if rate <= 0:
+        raise ValueError("rate must be positive")
+    if process != "poisson":
+        # k / rate rather than a running sum, so arrivals don't drift across window edges
+        for k in itertools.count():
+            yield k / rate
+    t = 0.0
+    while True:
+        yield t
+        t += rng.expovariate(rate)
+
+
+async def run_load_test(
+    dataset: DatasetInfo,
+    samples: Sequence[TestSample],
+    backend_name: str,
+    run_config: RunConfig,
+    config: LoadTestConfig,
+    logger: Optional[logging.Logger] = None,
+) -> LoadTestReport:
+    """Drive ``backend_name`` with open-loop arrivals cycling through ``samples``.
+
+    Latency is measured from each request's *scheduled* arrival, so time the
+    generator spent behind schedule counts against the backend instead of being
+    hidden (no coordinated omission).
+    """
+    if not samples:
+        raise ValueError("load test needs at least one sample")
+    logger = logger or logging.getLogger("lm_eval_so.runner.loadgen")
+    context = RunnerContext(
+        options={
+            "backend": backend_name,
+            "run_config": run_config.to_dict(),
+            # size HTTP pools for the open-loop window, not the default of 10 connections
+            "max_concurrency": config.max_outstanding,
+            "timeout_seconds": config.timeout_seconds,
+        },
+        logger=logger,
+        trace_prefix="load",
+    )
+    backend = backend_registry.create(backend_name, context=context, **run_config.backend_options)
+    rng = random.Random(config.seed)
+    report = LoadTestReport(
+        offered_rate=config.rate,
+        arrival=config.arrival,
+        duration_seconds=config.duration_seconds,
+    )
+    latencies: List[float] = []
+    error_types: Counter = Counter()
+    outstanding: set = set()
+    measured_done: List[float] = []
+
+    async def _one(sample: TestSample, scheduled: float, measured: bool) -> None:
+        request = RunRequest(
+            sample=sample,
+            run_config=run_config,
+            dataset_info=dataset,
+            trace_id=f"load-{uuid.uuid4().hex[:12]}",
+            attempt=1,
+            timeout_seconds=config.timeout_seconds,
+        )
+        try:
+            await asyncio.wait_for(backend.send(request), timeout=config.timeout_seconds)
+        except asyncio.TimeoutError:
+            if measured:
+                report.timeouts += 1
+            return
+        except BackendError as exc:
+            if measured:
+                report.errors += 1
+                error_types[exc.error_type or "unknown"] += 1
+            return
+        except Exception as exc:  # noqa: BLE001 - a load test reports, it does not crash
+            if measured:
+                report.errors += 1
+                error_types[exc.__class__.__name__] += 1
+            return
+        if measured:
+            now = time.perf_counter()
+            report.ok += 1
+            latencies.append((now - scheduled) * 1000.0)
+            measured_done.append(now)
+
+    try:
+        start = time.perf_counter()
+        end = config.warmup_seconds + config.duration_seconds
+        sample_cycle = itertools.cycle(samples)
+        for offset in arrival_offsets(config.rate, config.arrival, rng):
+            # window edges are compared as offsets: adding a large clock value rounds
+            if offset >= end:
+                break
+            scheduled = start + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            measured = offset >= config.warmup_seconds
+            if measured:
+                report.issued += 1
+                if (time.perf_counter() - scheduled) * 1000.0 > config.late_tolerance_ms:
+                    report.late += 1
+            if len(outstanding) >= config.max_outstanding:
+                if measured:
+                    report.dropped += 1
+                continue
+            task = asyncio.create_task(_one(next(sample_cycle), scheduled, measured))
+            outstanding.add(task)
+            task.add_done_callback(outstanding.discard)
+
+        if outstanding:
+            logger.info("arrivals finished; waiting for %d outstanding requests", len(outstanding))
+            await asyncio.gather(*outstanding, return_exceptions=True)
+    finally:
+        await backend.aclose()
+
+    window = config.duration_seconds
+    if measured_done:
+        window = max(window, max(measured_done) - start - config.warmup_seconds)
+    report.achieved_throughput = report.ok / window if window > 0 else 0.0
+    report.latency_ms = {
+        "mean": sum(latencies) / len(latencies) if latencies else None,
+        "p50": percentile(latencies, 50),
+        "p90": percentile(latencies, 90),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies) if latencies else None,
+    }
+    report.error_types = dict(error_types)
+    return report
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="lm-eval-runner loadtest",
+        description="Open-loop load test: send dataset requests at a fixed arrival rate",
+    )
+    p.add_argument("--dataset", required=True, help="Dataset JSONL path or dataset directory")
+    p.add_argument("--metadata", default=None, help="Optional metadata.json path (if not in dataset dir)")
+    p.add_argument("--backend", required=True, help="Backend name (e.g. openai, adb-cli)")
+    p.add_argument("--model", default=None, help="Model id/name for the backend")
+    p.add_argument("--param", action="append", default=[], help="Run parameter key=value (can repeat)")
+    p.add_argument("--backend-opt", action="append", default=[], help="Backend option key=value (can repeat)")
+    p.add_argument("--rate", type=float, required=True, help="Offered load in requests per second")
+    p.add_argument("--arrival", choices=["constant", "poisson"], default="poisson", help="Arrival process")
+    p.add_argument("--duration", type=float, required=True, help="Measured duration in seconds")
+    p.add_argument("--warmup", type=float, default=0.0, help="Seconds of load sent before measuring")
+    p.add_argument("--max-outstanding", type=int, default=1000, help="Drop arrivals beyond this many in flight")
+    p.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    p.add_argument("--seed", type=int, default=None, help="Seed for Poisson arrivals")
+    p.add_argument("--output", default=None, help="Write the report JSON to this path")
+    p.add_argument("--log-level", default="INFO", help="Logging level (DEBUG, INFO, WARNING, ERROR)")
+    return p
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from .cli import _ensure_backend, _parse_kv_list
+
+    args = _build_parser().parse_args(argv)
+    configure_logging(level=getattr(logging, str(args.log_level).upper(), logging.INFO))
+    logger = logging.getLogger("lm_eval_so.runner.loadgen")
+    _ensure_backend(args.backend)
+    dataset_info, samples = load_dataset(
+        Path(args.dataset).resolve(), Path(args.metadata).resolve() if args.metadata else None
+    )
+    run_config = RunConfig(
+        backend=args.backend,
+        model=args.model,
+        parameters=_parse_kv_list(list(args.param or [])),
+        backend_options=_parse_kv_list(list(args.backend_opt or [])),
+    )
+    config = LoadTestConfig(
+        rate=args.rate,
+        duration_seconds=args.duration,
+        arrival=args.arrival,
+        warmup_seconds=args.warmup,
+        max_outstanding=args.max_outstanding,
+        timeout_seconds=args.timeout,
+        seed=args.seed,
+    )
+    report = asyncio.run(run_load_test(dataset_info, samples, args.backend, run_config, config, logger))
+    text = json.dumps(report.to_dict(), ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+        logger.info("Load test report written to %s", args.output)
+    print(text)
+
+
+__all__ = ["LoadTestConfig", "LoadTestReport", "arrival_offsets", "run_load_test"]
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import yaml
+
+from ..config import RunnerConfig, VariantConfig
+from .models import RunConfig, TestSample
+
+_VARIANT_LIMIT_FIELDS = ("max_concurrency", "rate_limit_per_second", "rate_limit_burst", "tokens_per_minute")
+
+
+@dataclass(slots=True)
+class MatrixVariant:
+    """A resolved matrix cell: output name, run config and per-variant runner options.
+
+    ``samples`` overrides the shared dataset for this variant, e.g. to skip samples
+    already recorded when resuming.
+    """
+
+    name: str
+    run_config: RunConfig
+    options: RunnerConfig
+    samples: Optional[Sequence[TestSample]] = None
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "-", value).strip("-") or "variant"
+
+
+def _default_name(variant: VariantConfig) -> str:
+    parts = [variant.backend]
+    if variant.model:
+        parts.append(variant.model)
+    parts += [f"{k}={variant.parameters[k]}" for k in sorted(variant.parameters)]
+    return _slug("_".join(str(p) for p in parts))
+
+
+def build_matrix_variants(options: RunnerConfig) -> List[MatrixVariant]:
+    """Resolve ``options.variants`` into runnable variants with unique names."""
+    resolved: List[MatrixVariant] = []
+    seen: Dict[str, int] = {}
+    for variant in options.variants:
+        name = _slug(variant.name) if variant.name else _default_name(variant)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}-{seen[name]}"
+        else:
+            seen[name] = 0
+        overrides: Dict[str, Any] = {
+            key: getattr(variant, key) for key in _VARIANT_LIMIT_FIELDS if getattr(variant, key) is not None
+        }
+        overrides["variants"] = []
+        if options.output_dir is not None:
+            overrides["output_dir"] = options.output_dir / name
+        resolved.append(
+            MatrixVariant(
+                name=name,
+                run_config=RunConfig(
+                    backend=variant.backend,
+                    model=variant.model,
+                    parameters=dict(variant.parameters),
+                    backend_options=dict(variant.backend_options),
+                    metadata={"variant": name},
+                ),
+                options=options.model_copy(update=overrides),
+            )
+        )
+    return resolved
+
+
+def load_variant_file(path: Union[str, Path]) -> List[VariantConfig]:
+    """Load matrix variants from YAML/JSON.
+
+    Accepts a bare list of variants, ``{"variants": [...]}``, or a tester config
+    with ``runner.variants``.
+    """
+    p = Path(path)
+    text = p.read_text(encoding="utf-8")
+    data: Any = yaml.safe_load(text) if p.suffix.lower() in {".yml", ".yaml"} else json.loads(text)
+    if isinstance(data, dict) and "runner" in data:
+        data = (data.get("runner") or {}).get("variants", [])
+    elif isinstance(data, dict):
+        data = data.get("variants", [])
+    if not isinstance(data, Sequence) or not data:
+        raise ValueError(f"No matrix variants found in {p}")
+    return [VariantConfig(**item) for item in data]
+
+
+__all__ = ["MatrixVariant", "build_matrix_variants", "load_variant_file"]
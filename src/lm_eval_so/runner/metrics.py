@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import contextlib
+import logging
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .models import RunResult
+
+logger = logging.getLogger("lm_eval_so.runner.metrics")
+
+# Upper bounds in seconds, shared by every latency/wait histogram.
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_PREFIX = "lm_eval_runner_"
+
+
+class _Histogram:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}{"," if labels else ""}le="{bound:g}"}} {cumulative}')
+        cumulative += self.counts[-1]
+        lines.append(f'{name}_bucket{{{labels}{"," if labels else ""}le="+Inf"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+def _labels(**values: str) -> str:
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in values.items())
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RunMetrics:
+    """Live counters/histograms for a runner job, rendered in Prometheus text format.
+
+    The scheduler calls ``track_lane`` for every lane and ``observe_result`` for every
+    finished sample; gauges (in-flight requests, concurrency limit) are read from the
+    lane callbacks at scrape time. Updates come from the event-loop thread and scrapes
+    from the HTTP thread, so all state is guarded by one lock.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self._lock = threading.Lock()
+        self._buckets = tuple(buckets)
+        self._samples: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._attempts: Dict[str, int] = defaultdict(int)
+        self._retried: Dict[str, int] = defaultdict(int)
+        self._tokens: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._latency: Dict[str, _Histogram] = {}
+        self._rate_limit_wait: Dict[str, _Histogram] = {}
+        self._gauges: Dict[str, Dict[str, Callable[[], float]]] = {}
+
+    def track_lane(self, lane: str, gauges: Dict[str, Callable[[], float]]) -> None:
+        """Register gauge callbacks (e.g. ``{"in_flight": ..., "concurrency_limit": ...}``)."""
+        with self._lock:
+            self._gauges[lane] = dict(gauges)
+
+    def observe_result(self, lane: str, result: RunResult) -> None:
+        with self._lock:
+            self._samples[(lane, result.status.value)] += 1
+            self._attempts[lane] += result.attempts
+            if result.attempts > 1:
+                self._retried[lane] += 1
+            if result.latency_ms is not None and result.request_context.get("cache") not in ("hit", "coalesced"):
+                self._histogram(self._latency, lane).observe(result.latency_ms / 1000.0)
+            if result.phases:
+                wait_ms = sum(p.rate_limit_wait_ms for p in result.phases)
+                self._histogram(self._rate_limit_wait, lane).observe(wait_ms / 1000.0)
+            usage = result.response.usage if result.response is not None else None
+            if usage is not None:
+                self._tokens[(lane, "input")] += usage.input_tokens or 0
+                self._tokens[(lane, "output")] += usage.output_tokens or 0
+
+    def _histogram(self, family: Dict[str, _Histogram], lane: str) -> _Histogram:
+        if lane not in family:
+            family[lane] = _Histogram(self._buckets)
+        return family[lane]
+
+    def render(self) -> str:
+        with self._lock:
+            lines: List[str] = []
+
+            def header(name: str, kind: str, help_text: str) -> str:
+                lines.append(f"# HELP {_PREFIX}{name} {help_text}")
+                lines.append(f"# TYPE {_PREFIX}{name} {kind}")
+                return _PREFIX + name
+
+            name = header("samples_total", "counter", "Finished samples by final status.")
+            for (lane, status), value in sorted(self._samples.items()):
+                lines.append(f"{name}{{{_labels(lane=lane, status=status)}}} {value}")
+            name = header("samples_failed_total", "counter", "Finished samples whose final status is not ok.")
+            failed: Dict[str, int] = defaultdict(int)
+            for (lane, status), value in self._samples.items():
+                if status != "ok":
+                    failed[lane] += value
+            for lane in sorted(set(lane for lane, _ in self._samples)):
+                lines.append(f"{name}{{{_labels(lane=lane)}}} {failed[lane]}")
+            name = header("samples_retried_total", "counter", "Finished samples that needed more than one attempt.")
+            for lane, value in sorted(self._retried.items()):
+                lines.append(f"{name}{{{_labels(lane=lane)}}} {value}")
+            name = header("attempts_total", "counter", "Backend attempts, including retries.")
+            for lane, value in sorted(self._attempts.items()):
+                lines.append(f"{name}{{{_labels(lane=lane)}}} {value}")
+            name = header("tokens_total", "counter", "Tokens reported by the backend.")
+            for (lane, kind), value in sorted(self._tokens.items()):
+                lines.append(f"{name}{{{_labels(lane=lane, kind=kind)}}} {value}")
+            name = header("sample_latency_seconds", "histogram", "Latency of the final attempt of each sample.")
+            for lane, hist in sorted(self._latency.items()):
+                lines.extend(hist.render(name, _labels(lane=lane)))
+            name = header("rate_limit_wait_seconds", "histogram", "Time each sample spent waiting on the rate limiter.")
+            for lane, hist in sorted(self._rate_limit_wait.items()):
+                lines.extend(hist.render(name, _labels(lane=lane)))
+            gauge_names = sorted({g for gauges in self._gauges.values() for g in gauges})
+            for gauge in gauge_names:
+                name = header(gauge, "gauge", f"Current {gauge.replace('_', ' ')}.")
+                for lane, gauges in sorted(self._gauges.items()):
+                    if gauge in gauges:
+                        lines.append(f"{name}{{{_labels(lane=lane)}}} {gauges[gauge]():g}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serve ``RunMetrics`` at ``http://host:port/metrics`` from a daemon thread."""
+
+    def __init__(self, metrics: RunMetrics, port: int, host: str = "127.0.0.1") -> None:
+        self.metrics = metrics
+        metrics_ref = metrics
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = metrics_ref.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug("metrics %s", format % args)
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> "MetricsServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="lm-eval-metrics", daemon=True)
+        self._thread.start()
+        logger.info("serving metrics on http://%s:%d/metrics", *self._server.server_address[:2])
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MetricsServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+@contextlib.contextmanager
+def serve_metrics(port: Optional[int], host: str = "127.0.0.1") -> Iterator[Optional[RunMetrics]]:
+    """Yield a served ``RunMetrics`` for ``port``, or ``None`` when ``port`` is not set."""
+    if port is None:
+        yield None
+        return
+    metrics = RunMetrics()
+    with MetricsServer(metrics, port, host=host):
+        yield metrics
+
+
+__all__ = ["DEFAULT_BUCKETS", "MetricsServer", "RunMetrics", "serve_metrics"]
@@ -1,6 +1,7 @@
 from typing import Any, List
 
 from lm_eval_so.core.models import (
+    AttemptPhases,
     ChatResponse,
     DatasetInfo,
     Message,
@@ -9,6 +10,7 @@ from lm_eval_so.core.models import (
     RunRequest,
     RunResult,
     RunResultStatus,
+    StreamTimings,
     TestSample,
     TokenUsage,
 )
@@ -29,6 +31,7 @@ def ensure_messages(value: Any) -> List[Message]:
     return [Message.from_dict(v) for v in value]
 
 __all__ = [
+    "AttemptPhases",
     "ChatResponse",
     "DatasetInfo",
     "Message",
@@ -37,6 +40,7 @@ __all__ = [
     "RunRequest",
     "RunResult",
     "RunResultStatus",
+    "StreamTimings",
     "TestSample",
     "TokenUsage",
     "ensure_messages",
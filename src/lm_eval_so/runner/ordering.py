@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+
+from .journal import iter_journal_records
+from .models import TestSample
+from .rate_limit import estimate_request_tokens
+
+DISPATCH_ORDERS = ("dataset", "shuffle", "lpt")
+
+
+def estimate_sample_cost(sample: TestSample) -> float:
+    """Prompt-size proxy for processing time (same char/token heuristic as rate limiting)."""
+    return float(estimate_request_tokens(sample.messages, {}, 0))
+
+
+def load_latency_history(path: Union[str, Path]) -> Dict[str, float]:
+    """Backend service time per sample id from a previous ``run_results.jsonl``.
+
+    Uses the summed ``send_ms`` phases when present, else ``latency_ms``. Only ``ok``
+    records count, since failures say little about how long a sample takes.
+    """
+    history: Dict[str, float] = {}
+    for record in iter_journal_records(path):
+        if record.get("status") != "ok":
+            continue
+        phases = record.get("phases") or []
+        latency = sum(p.get("send_ms") or 0.0 for p in phases) if phases else record.get("latency_ms")
+        if latency:
+            history[str(record.get("sample_id"))] = float(latency)
+    return history
+
+
+def order_samples(
+    samples: Sequence[TestSample],
+    order: str = "dataset",
+    *,
+    seed: Optional[int] = None,
+    history: Optional[Mapping[str, float]] = None,
+) -> List[TestSample]:
+    """Return samples in dispatch order.
+
+    - ``dataset``: unchanged.
+    - ``shuffle``: random permutation (reproducible with ``seed``).
+    - ``lpt``: longest-processing-time first, so long samples do not end up alone
+      in the tail of the run. Uses ``history`` latencies when given; samples
+      without history go first (ordered by prompt size) because their cost is unknown.
+    """
+    if order not in DISPATCH_ORDERS:
+        raise ValueError(f"Unknown dispatch order {order!r}; expected one of {', '.join(DISPATCH_ORDERS)}")
+    ordered = list(samples)
+    if order == "shuffle":
+        random.Random(seed).shuffle(ordered)
+    elif order == "lpt":
+        if history:
+            ordered.sort(
+                key=lambda s: (s.id in history, -history.get(s.id, 0.0), -estimate_sample_cost(s))
+            )
+        else:
+            ordered.sort(key=estimate_sample_cost, reverse=True)
+    return ordered
+
+
+__all__ = ["DISPATCH_ORDERS", "estimate_sample_cost", "load_latency_history", "order_samples"]
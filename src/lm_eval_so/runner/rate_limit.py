@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional, Sequence
+
+from .models import Message
+
+# Rough chars-per-token ratio used when no tokenizer is available.
+CHARS_PER_TOKEN = 4
+
+
+class TokenBucket:
+    """Token bucket that debits on reservation instead of holding a lock.
+
+    ``reserve`` takes ``amount`` immediately (the balance may go negative) and returns
+    how long the caller must wait for its share to be refilled. Because no await
+    happens between refill and debit, concurrent callers are served in arrival order
+    without serializing on a lock, and an idle bucket allows bursts up to ``capacity``.
+    """
+
+    def __init__(self, rate_per_sec: float, capacity: float) -> None:
+        self.rate = float(rate_per_sec)
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Debit ``amount`` and return seconds until the debit is covered."""
+        self._refill()
+        self._tokens -= min(float(amount), self.capacity)
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+    def adjust(self, delta: float) -> None:
+        """Credit (positive) or debit (negative) the bucket after the fact."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + delta)
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+
+@dataclass(slots=True)
+class RatePermit:
+    """Result of ``RateLimiter.acquire``; pass back to ``settle`` with the real usage."""
+
+    estimated_tokens: int = 0
+    wait_seconds: float = 0.0
+
+
+class RateLimiter:
+    """Request and token budgets enforced with independent token buckets.
+
+    Args:
+        requests_per_second: Sustained request rate (``None`` disables request limiting).
+        request_burst: Requests allowed back-to-back from an idle state.
+        tokens_per_minute: Sustained prompt+completion token budget (``None`` disables it).
+        token_burst: Token bucket capacity; defaults to one minute of budget.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        request_burst: Optional[int] = None,
+        tokens_per_minute: Optional[float] = None,
+        token_burst: Optional[int] = None,
+    ) -> None:
+        self._requests: Optional[TokenBucket] = None
+        self._tokens: Optional[TokenBucket] = None
+        if requests_per_second and requests_per_second > 0:
+            self._requests = TokenBucket(requests_per_second, request_burst or 1)
+        if tokens_per_minute and tokens_per_minute > 0:
+            self._tokens = TokenBucket(tokens_per_minute / 60.0, token_burst or tokens_per_minute)
+
+    @property
+    def enabled(self) -> bool:
+        return self._requests is not None or self._tokens is not None
+
+    @property
+    def tracks_tokens(self) -> bool:
+        return self._tokens is not None
+
+    async def acquire(self, estimated_tokens: int = 0) -> RatePermit:
+        permit = RatePermit(estimated_tokens=estimated_tokens if self._tokens is not None else 0)
+        wait = 0.0
+        if self._requests is not None:
+            wait = max(wait, self._requests.reserve(1))
+        if self._tokens is not None and permit.estimated_tokens > 0:
+            wait = max(wait, self._tokens.reserve(permit.estimated_tokens))
+        if wait > 0:
+            await asyncio.sleep(wait)
+        permit.wait_seconds = wait
+        return permit
+
+    def try_acquire(self, estimated_tokens: int = 0) -> Optional[RatePermit]:
+        """Take a permit only if it is available right now; never waits.
+
+        Returns ``None`` instead of going into debt, so optional work (hedges) can be
+        skipped rather than delaying the requests that are already queued.
+        """
+        permit = RatePermit(estimated_tokens=estimated_tokens if self._tokens is not None else 0)
+        if self._requests is not None and self._requests.available < 1:
+            return None
+        if self._tokens is not None and self._tokens.available < min(permit.estimated_tokens, self._tokens.capacity):
+            return None
+        if self._requests is not None:
+            self._requests.reserve(1)
+        if self._tokens is not None and permit.estimated_tokens > 0:
+            self._tokens.reserve(permit.estimated_tokens)
+        return permit
+
+    def settle(self, permit: RatePermit, actual_tokens: Optional[int]) -> None:
+        """Replace the token estimate with the count reported by the backend."""
+        if self._tokens is None or actual_tokens is None or not permit.estimated_tokens:
+            return
+        self._tokens.adjust(permit.estimated_tokens - actual_tokens)
+
+
+def estimate_request_tokens(
+    messages: Sequence[Message],
+    parameters: Mapping[str, Any],
+    default_completion_tokens: int,
+) -> int:
+    """Estimate prompt+completion tokens for rate limiting before a request is sent."""
+    prompt_chars = sum(len(m.content or "") for m in messages)
+    prompt_tokens = prompt_chars // CHARS_PER_TOKEN + 4 * len(messages)
+    completion = parameters.get("max_completion_tokens") or parameters.get("max_tokens")
+    try:
+        completion_tokens = int(completion) if completion is not None else default_completion_tokens
+    except (TypeError, ValueError):
+        completion_tokens = default_completion_tokens
+    return max(1, prompt_tokens + completion_tokens)
+
+
+__all__ = ["RateLimiter", "RatePermit", "TokenBucket", "estimate_request_tokens"]
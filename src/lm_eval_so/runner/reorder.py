@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+
+
+class ReorderBuffer(Generic[T]):
+    """Release items in sequence order from out-of-order completions.
+
+    Items that finish ahead of an earlier sequence number wait here. At most
+    ``max_bytes`` (pickled size) are held in memory; past that, ``spill=True`` writes
+    further early arrivals to a temporary file, while ``spill=False`` only raises
+    ``over_capacity`` so the scheduler can stop admitting work until the head arrives.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        spill: bool = False,
+        spill_dir: Optional[Union[str, Path]] = None,
+    ) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self.spill = spill
+        self._spill_dir = spill_dir
+        self._next = 0
+        self._memory: Dict[int, Tuple[T, int]] = {}
+        self._spilled: Dict[int, Tuple[int, int]] = {}
+        self._spill_file: Optional[Any] = None
+        self.memory_bytes = 0
+        self.peak_bytes = 0
+        self.peak_items = 0
+        self.spilled_items = 0
+
+    @property
+    def over_capacity(self) -> bool:
+        # an empty buffer never throttles, otherwise a zero cap would admit nothing
+        return not self.spill and bool(self._memory) and self.memory_bytes >= self.max_bytes
+
+    def __len__(self) -> int:
+        return len(self._memory) + len(self._spilled)
+
+    def push(self, seq: int, item: T) -> List[T]:
+        """Add item ``seq`` and return every item that is now in order."""
+        if seq != self._next:
+            self._hold(seq, item)
+            return []
+        ready = [item]
+        self._next += 1
+        while self._next in self._memory or self._next in self._spilled:
+            ready.append(self._take(self._next))
+            self._next += 1
+        return ready
+
+    def drain(self) -> List[T]:
+        """Return whatever is left in sequence order (gaps are skipped)."""
+        ready = [self._take(seq) for seq in sorted([*self._memory, *self._spilled])]
+        self._next += len(ready)
+        return ready
+
+    def close(self) -> None:
+        if self._spill_file is not None:
+            name = self._spill_file.name
+            self._spill_file.close()
+            self._spill_file = None
+            try:
+                os.unlink(name)
+            except OSError:
+                pass
+
+    def to_metadata(self) -> Dict[str, Any]:
+        return {
+            "max_bytes": self.max_bytes,
+            "overflow": "spill" if self.spill else "throttle",
+            "peak_items": self.peak_items,
+            "peak_bytes": self.peak_bytes,
+            "spilled_items": self.spilled_items,
+        }
+
+    def _hold(self, seq: int, item: T) -> None:
+        data = pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.spill and self.memory_bytes + len(data) > self.max_bytes:
+            if self._spill_file is None:
+                self._spill_file = tempfile.NamedTemporaryFile(
+                    prefix="lm-eval-reorder-", suffix=".pkl", dir=self._spill_dir, delete=False
+                )
+            self._spill_file.seek(0, os.SEEK_END)
+            offset = self._spill_file.tell()
+            self._spill_file.write(data)
+            self._spilled[seq] = (offset, len(data))
+            self.spilled_items += 1
+        else:
+            self._memory[seq] = (item, len(data))
+            self.memory_bytes += len(data)
+            self.peak_bytes = max(self.peak_bytes, self.memory_bytes)
+        self.peak_items = max(self.peak_items, len(self))
+
+    def _take(self, seq: int) -> T:
+        if seq in self._memory:
+            item, size = self._memory.pop(seq)
+            self.memory_bytes -= size
+            return item
+        offset, length = self._spilled.pop(seq)
+        assert self._spill_file is not None
+        self._spill_file.seek(offset)
+        item = pickle.loads(self._spill_file.read(length))
+        if not self._spilled:
+            self._spill_file.truncate(0)  # everything spilled is out; reclaim the disk space
+        return item
+
+
+__all__ = ["ReorderBuffer"]
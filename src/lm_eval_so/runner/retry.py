@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]], now: Optional[datetime] = None) -> Optional[float]:
+    """Seconds to wait according to ``retry-after-ms`` / ``retry-after`` response headers.
+
+    ``retry-after`` may be delta-seconds or an HTTP date. Returns ``None`` when no
+    usable hint is present.
+    """
+    if not headers:
+        return None
+    lowered = {str(k).lower(): v for k, v in headers.items()}
+    value = lowered.get("retry-after-ms")
+    if value is not None:
+        try:
+            return max(0.0, float(value) / 1000.0)
+        except (TypeError, ValueError):
+            pass
+    value = lowered.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        when = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+class RetryBudget:
+    """Job-wide cap on retries: at most ``min_retries + ratio * requests``.
+
+    ``requests`` counts first attempts, so with ``ratio=0.1`` a job may spend about one
+    retry per ten samples. ``min_retries`` lets small jobs retry a few transient
+    failures before the ratio means anything. The budget is checked before the
+    per-sample ``max_retries``, so a partial outage cannot multiply load.
+    """
+
+    def __init__(self, ratio: float, min_retries: int = 10) -> None:
+        self.ratio = max(0.0, ratio)
+        self.min_retries = max(0, min_retries)
+        self.requests = 0
+        self.retries = 0
+        self.denied = 0
+
+    def record_request(self) -> None:
+        self.requests += 1
+
+    def try_acquire(self) -> bool:
+        if self.retries + 1 > self.min_retries + self.ratio * self.requests:
+            self.denied += 1
+            return False
+        self.retries += 1
+        return True
+
+    def to_metadata(self) -> Dict[str, Any]:
+        return {
+            "ratio": self.ratio,
+            "min_retries": self.min_retries,
+            "requests": self.requests,
+            "retries": self.retries,
+            "denied": self.denied,
+        }
+
+
+__all__ = ["RetryBudget", "parse_retry_after"]
@@ -1,18 +1,53 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import itertools
 import logging
+import math
+import queue
 import random
+import signal
+import sqlite3
+import threading
 import time
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, AsyncIterator, Iterator, List, Optional, Sequence
+from typing import (
+    Any,
+    AsyncIterable,
+    Callable,
+    Dict,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Sized,
+    Tuple,
+    Union,
+)
 
-from lm_eval_so.core.backends.base import backend_registry
+from lm_eval_so.core.backends.base import ChatBackend, backend_registry
+from .budget import JobBudget
+from .circuit import CircuitBreaker
+from .concurrency import AdaptiveConcurrencyController, ConcurrencyLimiter
+from .cache import ResponseCache, build_cache_key
 from .exceptions import BackendError
+from .hedging import HedgePolicy, hedged_send
+from .matrix import MatrixVariant
+from .metrics import RunMetrics
+from .ordering import load_latency_history, order_samples
+from .rate_limit import RateLimiter, RatePermit, estimate_request_tokens
+from .reorder import ReorderBuffer
+from .retry import RetryBudget, parse_retry_after
+from .warmup import WarmupGate, WarmupReport, synthetic_warmup_sample
 from .models import (
+    AttemptPhases,
+    ChatResponse,
     DatasetInfo,
     RunConfig,
     RunError,
@@ -27,92 +62,509 @@ from ..config import RunnerConfig
 
 # RunnerConfig is replaced by RunnerConfig in ..config
 
+SampleSource = Union[Iterable[TestSample], AsyncIterable[TestSample]]
+
+
+async def _aiter_samples(samples: SampleSource) -> AsyncIterator[TestSample]:
+    if hasattr(samples, "__aiter__"):
+        async for sample in samples:  # type: ignore[union-attr]
+            yield sample
+    else:
+        for sample in samples:  # type: ignore[union-attr]
+            yield sample
 
-class _RateLimiter:
-    def __init__(self, rate_per_sec: Optional[float]) -> None:
-        self._min_interval = 1.0 / rate_per_sec if rate_per_sec and rate_per_sec > 0 else None
-        self._lock = asyncio.Lock()
-        self._last_call: float = 0.0
 
-    async def acquire(self) -> None:
-        if self._min_interval is None:
+async def _dispatch_samples(samples: SampleSource, options: RunnerConfig) -> AsyncIterator[TestSample]:
+    """Yield samples in ``options.dispatch_order``; orders other than "dataset" materialize the source."""
+    source = _aiter_samples(samples)
+    try:
+        if options.dispatch_order == "dataset":
+            async for sample in source:
+                yield sample
             return
-        async with self._lock:
-            now = time.monotonic()
-            wait_for = self._min_interval - (now - self._last_call)
-            if wait_for > 0:
-                await asyncio.sleep(wait_for)
-            self._last_call = time.monotonic()
+        collected = [sample async for sample in source]
+        history = (
+            load_latency_history(options.dispatch_history_path) if options.dispatch_history_path else None
+        )
+        for sample in order_samples(
+            collected, options.dispatch_order, seed=options.dispatch_seed, history=history
+        ):
+            yield sample
+    finally:
+        await source.aclose()
+
+
+@dataclass
+class JobControl:
+    """Cross-thread handle for a running job.
+
+    ``request_stop`` makes the scheduler stop pulling new samples while in-flight
+    requests drain normally. It is safe to call from signal handlers and other threads.
+    ``metadata`` collects job-level annotations destined for ``run_metadata.json``.
+    ``metrics``, when set, receives live per-lane counters (see ``MetricsServer``).
+    """
+
+    stop_event: threading.Event = field(default_factory=threading.Event)
+    stop_reason: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    metrics: Optional[RunMetrics] = None
+
+    def request_stop(self, reason: str) -> None:
+        if not self.stop_event.is_set():
+            self.stop_reason = reason
+            self.stop_event.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self.stop_event.is_set()
+
+
+@contextlib.contextmanager
+def graceful_shutdown(
+    control: JobControl,
+    logger: logging.Logger,
+    signals: Sequence[signal.Signals] = (signal.SIGINT, signal.SIGTERM),
+) -> Iterator[None]:
+    """Turn the first of ``signals`` into ``control.request_stop``; a second one aborts."""
+
+    previous: Dict[int, Any] = {}
+
+    def _handler(signum: int, frame: Any) -> None:
+        logger.warning("received %s; finishing in-flight samples (repeat to abort)", signal.Signals(signum).name)
+        control.request_stop("signal")
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+
+    for sig in signals:
+        try:
+            previous[sig] = signal.signal(sig, _handler)
+        except ValueError:  # pragma: no cover - not in main thread
+            pass
+    try:
+        yield
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+
+
+@dataclass
+class _JobRuntime:
+    """Per-job shared state handed to every sample task."""
+
+    dataset: DatasetInfo
+    backend: ChatBackend
+    backend_name: str
+    run_config: RunConfig
+    options: RunnerConfig
+    logger: logging.Logger
+    control: JobControl
+    limiter: ConcurrencyLimiter
+    rate_limiter: RateLimiter
+    concurrency: Optional[AdaptiveConcurrencyController] = None
+    cache: Optional[ResponseCache] = None
+    breaker: Optional[CircuitBreaker] = None
+    hedging: Optional[HedgePolicy] = None
+    budget: Optional[JobBudget] = None
+    retry_budget: Optional[RetryBudget] = None
+    warmup: Optional[WarmupReport] = None
+    warmup_gate: Optional[WarmupGate] = None  # tagged mode: marks the first real samples as warmup
+    reorder: Optional[ReorderBuffer[RunResult]] = None  # ordered_output: releases results in dispatch order
+    inflight: Dict[str, "asyncio.Future[Any]"] = field(default_factory=dict)
+
+
+def _build_runtime(
+    dataset: DatasetInfo,
+    backend_name: str,
+    run_config: RunConfig,
+    options: RunnerConfig,
+    logger: logging.Logger,
+    control: JobControl,
+) -> _JobRuntime:
+    context = RunnerContext(
+        options={
+            "backend": backend_name,
+            "run_config": run_config.to_dict(),
+            # lets HTTP backends size connection pools and timeouts to the scheduler
+            "max_concurrency": _peak_concurrency(options),
+            "timeout_seconds": options.timeout_seconds,
+        },
+        logger=logger,
+        trace_prefix=options.trace_prefix,
+    )
+    backend = backend_registry.create(backend_name, context=context, **run_config.backend_options)
+    limiter = ConcurrencyLimiter(max(1, options.max_concurrency))
+    concurrency = None
+    if options.adaptive_concurrency:
+        concurrency = AdaptiveConcurrencyController(
+            limiter,
+            min_limit=options.min_concurrency,
+            max_limit=options.adaptive_max_concurrency or max(1, options.max_concurrency) * 4,
+            latency_tolerance=options.adaptive_latency_tolerance,
+            logger=logger,
+        )
+    warmup_enabled = bool(options.warmup_requests or options.warmup_seconds)
+    return _JobRuntime(
+        dataset=dataset,
+        backend=backend,
+        backend_name=backend_name,
+        run_config=run_config,
+        options=options,
+        logger=logger,
+        control=control,
+        limiter=limiter,
+        rate_limiter=_build_rate_limiter(options),
+        concurrency=concurrency,
+        cache=(
+            ResponseCache(options.cache_path, ttl_seconds=options.cache_ttl_seconds, max_bytes=options.cache_max_bytes)
+            if options.cache_path is not None
+            else None
+        ),
+        breaker=(
+            CircuitBreaker(
+                options.circuit_breaker_threshold,
+                reset_seconds=options.circuit_breaker_reset_seconds,
+                half_open_probes=options.circuit_breaker_probes,
+                max_open_seconds=options.circuit_breaker_max_open_seconds,
+                on_give_up=lambda: control.request_stop("circuit_open"),
+                logger=logger,
+            )
+            if options.circuit_breaker_threshold
+            else None
+        ),
+        hedging=(
+            HedgePolicy(
+                percentile=options.hedge_percentile,
+                budget=options.hedge_budget,
+                min_samples=options.hedge_min_samples,
+            )
+            if options.hedge_percentile
+            else None
+        ),
+        budget=(
+            JobBudget(
+                model=run_config.model,
+                max_tokens=options.max_tokens_budget,
+                max_cost=options.max_cost,
+                deadline_seconds=options.deadline_seconds,
+                prices=options.price_table,
+            )
+            if options.max_tokens_budget or options.max_cost is not None or options.deadline_seconds or options.price_table
+            else None
+        ),
+        retry_budget=(
+            RetryBudget(options.retry_budget_ratio, min_retries=options.retry_budget_min)
+            if options.retry_budget_ratio is not None
+            else None
+        ),
+        warmup=WarmupReport(options.warmup_mode) if warmup_enabled else None,
+        reorder=(
+            ReorderBuffer(
+                options.reorder_buffer_max_bytes,
+                spill=options.reorder_overflow == "spill",
+                spill_dir=options.output_dir,
+            )
+            if options.ordered_output
+            else None
+        ),
+        warmup_gate=(
+            WarmupGate(options.warmup_requests, options.warmup_seconds)
+            if warmup_enabled and options.warmup_mode == "tagged"
+            else None
+        ),
+    )
+
+
+def _peak_concurrency(options: RunnerConfig) -> int:
+    """Most requests a lane can have in flight, including hedged duplicates."""
+    peak = max(1, options.max_concurrency)
+    if options.adaptive_concurrency:
+        peak = options.adaptive_max_concurrency or peak * 4
+    if options.hedge_percentile:
+        peak += max(1, math.ceil(peak * options.hedge_budget))
+    return peak
 
 
 async def run_async_stream_job(
     dataset: DatasetInfo,
-    samples: Sequence[TestSample],
+    samples: SampleSource,
     backend_name: str,
     run_config: RunConfig,
     options: RunnerConfig,
     logger: Optional[logging.Logger] = None,
+    control: Optional[JobControl] = None,
 ) -> AsyncIterator[RunResult]:
     """
     Run a job and yield results as they complete.
+
+    Samples are pulled lazily from ``samples`` (any iterable or async iterable) and
+    at most ``max_concurrency * task_window_factor`` tasks are alive at once, so
+    memory stays flat regardless of dataset size. When ``control`` requests a stop,
+    no new samples are scheduled and in-flight ones are drained.
     """
     logger = logger or logging.getLogger("lm_eval_so.runner")
-    total = len(samples)
-    completed = 0
-    progress_lock = asyncio.Lock()
-    
-    context = RunnerContext(
-        options={"backend": backend_name, "run_config": run_config.to_dict()},
-        logger=logger,
-        trace_prefix=options.trace_prefix,
+    control = control or JobControl()
+    total = len(samples) if isinstance(samples, Sized) else None
+    lane = _Lane(
+        name=backend_name,
+        runtime=_build_runtime(dataset, backend_name, run_config, options, logger, control),
+        samples=_dispatch_samples(samples, options),
     )
-    backend = backend_registry.create(backend_name, context=context, **run_config.backend_options)
-    semaphore = asyncio.Semaphore(max(1, options.max_concurrency))
-    rate_limiter = _RateLimiter(options.rate_limit_per_second)
-    
-    tasks = []
-    for sample in samples:
-        # Create a coroutine for each sample
-        coro = _run_single_sample(
-            sample=sample,
-            dataset=dataset,
-            backend=backend,
-            backend_name=backend_name,
-            run_config=run_config,
-            options=options,
-            semaphore=semaphore,
-            rate_limiter=rate_limiter,
-            logger=logger,
+    try:
+        async for _, result in _drive_lanes([lane], control, logger, total):
+            yield result
+    finally:
+        control.metadata.update(await _finalize_runtime(lane.runtime))
+
+
+async def run_async_matrix_stream_job(
+    dataset: DatasetInfo,
+    samples: Sequence[TestSample],
+    variants: Sequence[MatrixVariant],
+    logger: Optional[logging.Logger] = None,
+    control: Optional[JobControl] = None,
+) -> AsyncIterator[Tuple[str, RunResult]]:
+    """
+    Run every (variant, sample) pair through one scheduler, yielding ``(variant_name, result)``.
+
+    The dataset is loaded once and shared. Each variant keeps its own backend instance,
+    concurrency window and rate limiter, and the scheduler fills free slots
+    round-robin across variants so a slow variant cannot starve the others.
+    Per-variant job metadata is collected under ``control.metadata["variants"]``.
+    """
+    logger = logger or logging.getLogger("lm_eval_so.runner")
+    control = control or JobControl()
+    lanes = [
+        _Lane(
+            name=variant.name,
+            runtime=_build_runtime(
+                dataset,
+                variant.run_config.backend,
+                variant.run_config,
+                variant.options,
+                logger,
+                control,
+            ),
+            samples=_dispatch_samples(
+                variant.samples if variant.samples is not None else samples, variant.options
+            ),
+        )
+        for variant in variants
+    ]
+    total = len(samples) * len(lanes) if all(v.samples is None for v in variants) else None
+    try:
+        async for lane, result in _drive_lanes(lanes, control, logger, total):
+            yield lane.name, result
+    finally:
+        per_variant = control.metadata.setdefault("variants", {})
+        for lane in lanes:
+            per_variant[lane.name] = await _finalize_runtime(lane.runtime)
+
+
+@dataclass
+class _Lane:
+    """One stream of samples bound to a runtime, with its own task window."""
+
+    name: str
+    runtime: _JobRuntime
+    samples: AsyncIterator[TestSample]
+    pending: int = 0
+    dispatched: int = 0
+    exhausted: bool = False
+
+    def has_room(self) -> bool:
+        window = self.runtime.limiter.limit * max(1, self.runtime.options.task_window_factor)
+        return not self.exhausted and self.pending < window
+
+
+def _lane_gauges(lane: _Lane) -> Dict[str, Callable[[], float]]:
+    return {
+        "in_flight_requests": lambda: lane.runtime.limiter.in_flight,
+        "concurrency_limit": lambda: lane.runtime.limiter.limit,
+        "scheduled_samples": lambda: lane.pending,
+    }
+
+
+async def _drive_lanes(
+    lanes: Sequence[_Lane],
+    control: JobControl,
+    logger: logging.Logger,
+    total: Optional[int],
+) -> AsyncIterator[Tuple[_Lane, RunResult]]:
+    completed = 0
+    tasks: Dict["asyncio.Task[RunResult]", _Lane] = {}
+    sequence: Dict["asyncio.Task[RunResult]", int] = {}
+    stop_logged = False
+    if control.metrics is not None:
+        for lane in lanes:
+            control.metrics.track_lane(lane.name, _lane_gauges(lane))
+    try:
+        await asyncio.gather(
+            *(
+                _run_synthetic_warmup(lane.runtime, control)
+                for lane in lanes
+                if lane.runtime.warmup is not None and lane.runtime.warmup_gate is None
+            )
         )
-        # Wrap it to update progress before returning
-        async def _progress_wrapper(c):
-            res = await c
-            nonlocal completed
-            async with progress_lock:
+        while True:
+            if control.stopped and not stop_logged:
+                logger.info("stop requested (%s); draining %d in-flight samples", control.stop_reason, len(tasks))
+                stop_logged = True
+                for lane in lanes:
+                    lane.exhausted = True
+
+            scheduled = True
+            while scheduled:
+                scheduled = False
+                for lane in lanes:
+                    if not lane.has_room():
+                        continue
+                    if _budget_exhausted(lane, logger):
+                        continue
+                    if lane.runtime.reorder is not None and lane.runtime.reorder.over_capacity:
+                        continue  # throttle until the head-of-line result arrives
+                    try:
+                        sample = await lane.samples.__anext__()
+                    except StopAsyncIteration:
+                        lane.exhausted = True
+                        continue
+                    warmup = lane.runtime.warmup_gate is not None and lane.runtime.warmup_gate.take()
+                    task = asyncio.create_task(
+                        _run_single_sample(sample, lane.runtime, time.perf_counter(), warmup=warmup)
+                    )
+                    tasks[task] = lane
+                    sequence[task] = lane.dispatched
+                    lane.dispatched += 1
+                    lane.pending += 1
+                    scheduled = True
+
+            if not tasks:
+                break
+
+            done, _ = await asyncio.wait(tasks.keys(), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                lane = tasks.pop(task)
+                seq = sequence.pop(task)
+                lane.pending -= 1
+                result = task.result()
                 completed += 1
+                if lane.runtime.budget is not None:
+                    lane.runtime.budget.observe(result)
+                if lane.runtime.warmup is not None and result.request_context.get("warmup"):
+                    lane.runtime.warmup.observe(result.latency_ms, result.status == RunResultStatus.OK)
+                if control.metrics is not None:
+                    control.metrics.observe_result(lane.name, result)
                 logger.info(
-                    "progress %d/%d sample=%s status=%s",
+                    "progress %d/%s sample=%s status=%s",
                     completed,
-                    total,
-                    res.sample_id,
-                    res.status.value,
+                    total if total is not None else "?",
+                    result.sample_id,
+                    result.status.value,
                 )
-            return res
-            
-        tasks.append(asyncio.create_task(_progress_wrapper(coro)))
-    
-    for future in asyncio.as_completed(tasks):
-        result = await future
-        yield result
+                if lane.runtime.reorder is None:
+                    yield lane, result
+                else:
+                    for ready in lane.runtime.reorder.push(seq, result):
+                        yield lane, ready
+        for lane in lanes:
+            if lane.runtime.reorder is not None:
+                for ready in lane.runtime.reorder.drain():
+                    yield lane, ready
+    finally:
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for lane in lanes:
+            await lane.samples.aclose()  # type: ignore[attr-defined]
+
+
+async def _run_synthetic_warmup(runtime: _JobRuntime, control: JobControl) -> None:
+    """Send throwaway requests through the lane's limits before the first real sample.
+
+    They warm connection pools and cold models; outcomes only go to ``runtime.warmup``.
+    """
+    assert runtime.warmup is not None
+    options = runtime.options
+    gate = WarmupGate(options.warmup_requests, options.warmup_seconds)
+    counter = itertools.count()
+
+    async def _worker() -> None:
+        while not control.stopped and gate.take():
+            sample = synthetic_warmup_sample(next(counter), options.warmup_prompt)
+            request = RunRequest(
+                sample=sample,
+                run_config=runtime.run_config,
+                dataset_info=runtime.dataset,
+                trace_id=_build_trace_id(f"{options.trace_prefix}-warmup", sample.id),
+                attempt=1,
+                timeout_seconds=options.timeout_seconds,
+            )
+            await runtime.rate_limiter.acquire()
+            ok = True
+            async with runtime.limiter:
+                start = time.perf_counter()
+                try:
+                    await asyncio.wait_for(runtime.backend.send(request), timeout=options.timeout_seconds)
+                except Exception as exc:  # noqa: BLE001 - warmup failures are only reported
+                    ok = False
+                    runtime.logger.debug("warmup request %s failed: %s", sample.id, exc)
+                latency_ms = (time.perf_counter() - start) * 1000.0
+            runtime.warmup.observe(latency_ms, ok)
+
+    await asyncio.gather(*(_worker() for _ in range(runtime.limiter.limit)))
+    runtime.logger.info("warmup finished: %d requests", runtime.warmup.requests)
+
+
+def _budget_exhausted(lane: _Lane, logger: logging.Logger) -> bool:
+    """Stop a lane's scheduling once its budget runs out; in-flight samples still drain."""
+    budget = lane.runtime.budget
+    reason = budget.exhausted_reason() if budget is not None else None
+    if reason is None:
+        return False
+    logger.warning("%s budget exhausted (%s); draining in-flight samples", lane.name, reason)
+    lane.exhausted = True
+    return True
+
+
+async def _finalize_runtime(runtime: _JobRuntime) -> Dict[str, Any]:
+    """Release runtime resources and return its job-level metadata."""
+    metadata: Dict[str, Any] = {}
+    if runtime.concurrency is not None:
+        metadata["concurrency"] = runtime.concurrency.to_metadata()
+    if runtime.breaker is not None:
+        metadata["circuit_breaker"] = runtime.breaker.to_metadata()
+    if runtime.hedging is not None:
+        metadata["hedging"] = runtime.hedging.to_metadata()
+    if runtime.budget is not None:
+        metadata["budget"] = runtime.budget.to_metadata()
+    if runtime.retry_budget is not None:
+        metadata["retry_budget"] = runtime.retry_budget.to_metadata()
+    if runtime.warmup is not None:
+        metadata["warmup"] = runtime.warmup.to_metadata()
+    if runtime.reorder is not None:
+        metadata["reorder_buffer"] = runtime.reorder.to_metadata()
+        runtime.reorder.close()
+    backend_metadata = runtime.backend.to_metadata()
+    if backend_metadata:
+        metadata["backend"] = backend_metadata
+    try:
+        await runtime.backend.aclose()
+    except Exception:  # noqa: BLE001 - results are already written; don't fail the run on cleanup
+        runtime.logger.exception("backend %s failed to close", runtime.backend_name)
+    if runtime.cache is not None:
+        metadata["cache"] = runtime.cache.stats()
+        runtime.cache.close()
+    return metadata
 
 
 async def run_async_job(
     dataset: DatasetInfo,
-    samples: Sequence[TestSample],
+    samples: SampleSource,
     backend_name: str,
     run_config: RunConfig,
     options: RunnerConfig,
     logger: Optional[logging.Logger] = None,
+    control: Optional[JobControl] = None,
 ) -> List[RunResult]:
     """
     Run a job and return all results as a list.
@@ -125,6 +577,7 @@ async def run_async_job(
         run_config=run_config,
         options=options,
         logger=logger,
+        control=control,
     ):
         results.append(result)
     return results
@@ -132,15 +585,18 @@ async def run_async_job(
 
 def run_stream_job(
     dataset: DatasetInfo,
-    samples: Sequence[TestSample],
+    samples: SampleSource,
     backend_name: str,
     run_config: RunConfig,
     options: RunnerConfig,
     logger: Optional[logging.Logger] = None,
+    control: Optional[JobControl] = None,
 ) -> Iterator[RunResult]:
     """
     Sync wrapper for run_async_stream_job.
-    WARNING: This creates a new event loop for each iteration or manages the loop manually.
+
+    The job runs on a background event-loop thread; up to ``options.result_buffer_size``
+    finished results are buffered while the caller processes earlier ones.
     """
     async_gen = run_async_stream_job(
         dataset=dataset,
@@ -149,27 +605,112 @@ def run_stream_job(
         run_config=run_config,
         options=options,
         logger=logger,
+        control=control,
     )
-    
+    yield from _iterate_sync(async_gen, options.result_buffer_size)
+
+
+def run_matrix_stream_job(
+    dataset: DatasetInfo,
+    samples: Sequence[TestSample],
+    variants: Sequence[MatrixVariant],
+    logger: Optional[logging.Logger] = None,
+    control: Optional[JobControl] = None,
+) -> Iterator[Tuple[str, RunResult]]:
+    """
+    Sync wrapper for run_async_matrix_stream_job.
+    """
+    yield from _iterate_sync(
+        run_async_matrix_stream_job(
+            dataset=dataset,
+            samples=samples,
+            variants=variants,
+            logger=logger,
+            control=control,
+        ),
+        sum(v.options.result_buffer_size for v in variants) or 1,
+    )
+
+
+_BRIDGE_DONE = object()
+
+
+def _iterate_sync(async_gen: AsyncIterator[Any], buffer_size: int = 256) -> Iterator[Any]:
+    """Drive ``async_gen`` on a dedicated event-loop thread and yield its items.
+
+    Items are handed over through a thread-safe queue holding at most ``buffer_size``
+    results, so in-flight requests keep progressing while the consumer is busy. When
+    the buffer is full the pump stops pulling results, which stops the scheduler from
+    admitting new samples (backpressure). Because the loop lives in its own thread,
+    this also works when the caller already runs an event loop (Jupyter, MCP server).
+    """
+    handoff: "queue.Queue[Any]" = queue.Queue()
     loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    state: Dict[str, Any] = {}
+    ready = threading.Event()
+
+    async def _pump() -> None:
+        slots = asyncio.Semaphore(max(1, buffer_size))
+        state["slots"] = slots
+        state["task"] = asyncio.current_task()
+        ready.set()
+        try:
+            async for item in async_gen:
+                await slots.acquire()
+                handoff.put((item, None))
+        except asyncio.CancelledError:
+            pass
+        except BaseException as exc:  # surfaced to the consumer thread
+            handoff.put((None, exc))
+        finally:
+            await async_gen.aclose()  # type: ignore[attr-defined]
+            handoff.put((_BRIDGE_DONE, None))
+
+    def _run_loop() -> None:
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(_pump())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            ready.set()
+            loop.close()
+
+    thread = threading.Thread(target=_run_loop, name="lm-eval-runner-loop", daemon=True)
+    thread.start()
+    ready.wait()
+    finished = False
     try:
         while True:
-            try:
-                yield loop.run_until_complete(async_gen.__anext__())
-            except StopAsyncIteration:
+            item, exc = handoff.get()
+            if exc is not None:
+                raise exc
+            if item is _BRIDGE_DONE:
+                finished = True
                 break
+            _call_soon_threadsafe(loop, state["slots"].release)
+            yield item
     finally:
-        loop.close()
+        if not finished and "task" in state:
+            # consumer stopped early: cancel the pump so the job drains its tasks
+            _call_soon_threadsafe(loop, state["task"].cancel)
+        thread.join()
+
+
+def _call_soon_threadsafe(loop: asyncio.AbstractEventLoop, callback: Any) -> None:
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:
+        pass  # the loop already finished; nothing left to wake
 
 
 def run_job(
     dataset: DatasetInfo,
-    samples: Sequence[TestSample],
+    samples: SampleSource,
     backend_name: str,
     run_config: RunConfig,
     options: RunnerConfig,
     logger: Optional[logging.Logger] = None,
+    control: Optional[JobControl] = None,
 ) -> List[RunResult]:
     """
     Run a job synchronously and return all results.
@@ -181,65 +722,154 @@ def run_job(
         run_config=run_config,
         options=options,
         logger=logger,
+        control=control,
     ))
 
 
 async def _run_single_sample(
-    sample: TestSample,
-    dataset: DatasetInfo,
-    backend: Any,
-    backend_name: str,
-    run_config: RunConfig,
-    options: RunnerConfig,
-    semaphore: asyncio.Semaphore,
-    rate_limiter: _RateLimiter,
-    logger: logging.Logger,
+    sample: TestSample, runtime: _JobRuntime, queued_at: Optional[float] = None, warmup: bool = False
 ) -> RunResult:
+    backend = runtime.backend
+    run_config = runtime.run_config
+    options = runtime.options
+    rate_limiter = runtime.rate_limiter
+    logger = runtime.logger
     trace_id = _build_trace_id(options.trace_prefix, sample.id)
     max_attempts = max(1, options.max_retries + 1)
+    if runtime.retry_budget is not None:
+        runtime.retry_budget.record_request()
     attempt = 0
+    estimated_tokens = (
+        estimate_request_tokens(sample.messages, run_config.parameters, options.rate_limit_completion_tokens)
+        if rate_limiter.tracks_tokens
+        else 0
+    )
+    cache_key = (
+        build_cache_key(
+            runtime.backend_name, run_config.model, run_config.parameters, sample.messages, run_config.backend_options
+        )
+        if runtime.cache is not None
+        else None
+    )
     last_error: Optional[RunError] = None
+    phases: List[AttemptPhases] = []
+    hedges = 0
+
+    hedge_permits: List[RatePermit] = []
+
+    def _count_hedge() -> None:
+        nonlocal hedges
+        hedges += 1
+
+    def _admit_hedge() -> bool:
+        # a hedge is optional: take a permit only if one is free right now
+        hedge_permit = rate_limiter.try_acquire(estimated_tokens)
+        if hedge_permit is None:
+            return False
+        hedge_permits.append(hedge_permit)
+        return True
+
+    def _charge_loser(loser: ChatResponse) -> None:
+        if loser.usage is None:
+            return
+        if hedge_permits:
+            rate_limiter.settle(hedge_permits.pop(), loser.usage.total_tokens)
+        if runtime.budget is not None:
+            runtime.budget.charge(loser.usage)
 
     while attempt < max_attempts:
         attempt += 1
         started_at = datetime.now(timezone.utc)
         perf_start = time.perf_counter()
+        current = AttemptPhases(attempt=attempt)
+        if attempt == 1 and queued_at is not None:
+            current.queue_wait_ms = (perf_start - queued_at) * 1000.0
+        phases.append(current)
         request = RunRequest(
             sample=sample,
             run_config=run_config,
-            dataset_info=dataset,
+            dataset_info=runtime.dataset,
             trace_id=trace_id,
             attempt=attempt,
             timeout_seconds=options.timeout_seconds,
         )
+        context_extra: Dict[str, Any] = {"warmup": True} if warmup else {}
+        # None until the breaker admits this attempt; only then is there a slot to settle
+        probe: Optional[bool] = None
 
         try:
-            await rate_limiter.acquire()
-            async with semaphore:
-                response = await asyncio.wait_for(
-                    backend.send(request), timeout=options.timeout_seconds
-                )
+            response: Optional[ChatResponse] = None
+            leader: Optional["asyncio.Future[Any]"] = None
+            if cache_key is not None:
+                response, cache_status, leader = await _lookup_cache(runtime, cache_key)
+                context_extra["cache"] = cache_status
+            if response is None:
+                try:
+                    if runtime.breaker is not None:
+                        circuit_start = time.perf_counter()
+                        probe = await runtime.breaker.acquire()
+                        current.circuit_wait_ms = (time.perf_counter() - circuit_start) * 1000.0
+                    rate_start = time.perf_counter()
+                    permit = await rate_limiter.acquire(estimated_tokens)
+                    slot_start = time.perf_counter()
+                    current.rate_limit_wait_ms = (slot_start - rate_start) * 1000.0
+                    # retries queue behind fresh samples for a concurrency slot
+                    async with runtime.limiter if attempt == 1 else runtime.limiter.deferred():
+                        send_start = time.perf_counter()
+                        current.semaphore_wait_ms = (send_start - slot_start) * 1000.0
+                        try:
+                            if runtime.hedging is not None:
+                                response, hedge_won = await asyncio.wait_for(
+                                    hedged_send(
+                                        runtime.hedging,
+                                        lambda: backend.send(request),
+                                        _count_hedge,
+                                        admit=_admit_hedge,
+                                        on_loser=_charge_loser,
+                                    ),
+                                    timeout=options.timeout_seconds,
+                                )
+                                if hedge_won:
+                                    context_extra["hedge_won"] = True
+                            else:
+                                response = await asyncio.wait_for(
+                                    backend.send(request), timeout=options.timeout_seconds
+                                )
+                        finally:
+                            current.send_ms = (time.perf_counter() - send_start) * 1000.0
+                        if response.pool_wait_ms is not None:
+                            current.pool_wait_ms = response.pool_wait_ms
+                        if runtime.hedging is not None:
+                            runtime.hedging.observe(current.send_ms)
+                except BaseException as exc:
+                    _settle_inflight(runtime, cache_key, leader, None, exc)
+                    raise
+                _settle_inflight(runtime, cache_key, leader, response, None)
+                if leader is not None and cache_key is not None:
+                    await _store_cache(runtime, cache_key, response)
+                if runtime.breaker is not None and probe is not None:
+                    runtime.breaker.record_success(probe)
+                if runtime.concurrency is not None:
+                    runtime.concurrency.on_success(current.send_ms, response.headers)
+                if response.usage is not None:
+                    rate_limiter.settle(permit, response.usage.total_tokens)
             latency_ms = (time.perf_counter() - perf_start) * 1000.0
             completed_at = datetime.now(timezone.utc)
             logger.debug("sample=%s status=ok attempts=%d", sample.id, attempt)
-            return RunResult(
-                sample_id=sample.id,
-                dataset_id=dataset.dataset_id,
-                backend=backend_name,
-                run_config=run_config,
-                request_messages=sample.messages,
-                request_context={
-                    "sample_tags": sample.tags,
-                    "sample_metadata": sample.metadata,
-                    "attempt": attempt,
-                },
+            if hedges:
+                context_extra["hedges"] = hedges
+            return _make_result(
+                sample,
+                runtime,
+                trace_id=trace_id,
+                attempt=attempt,
                 response=response,
                 status=RunResultStatus.OK,
                 latency_ms=latency_ms,
                 started_at=started_at,
                 completed_at=completed_at,
-                attempts=attempt,
-                trace_id=trace_id,
+                context_extra=context_extra,
+                phases=phases,
             )
         except asyncio.TimeoutError:
             logger.warning("sample=%s attempt=%d timeout", sample.id, attempt)
@@ -264,6 +894,8 @@ async def _run_single_sample(
                 details=exc.details,
             )
         except asyncio.CancelledError:
+            if runtime.breaker is not None and probe is not None:
+                runtime.breaker.release(probe)
             raise
         except Exception as exc:
             logger.exception("sample=%s unexpected error", sample.id)
@@ -273,41 +905,168 @@ async def _run_single_sample(
                 retryable=False,
             )
 
+        if runtime.concurrency is not None and last_error is not None:
+            runtime.concurrency.on_error(last_error.error_type)
+        if runtime.breaker is not None and probe is not None and last_error is not None:
+            _settle_breaker(runtime.breaker, probe, last_error)
         latency_ms = (time.perf_counter() - perf_start) * 1000.0
         completed_at = datetime.now(timezone.utc)
         should_retry = bool(last_error and last_error.retryable and attempt < max_attempts)
+        if should_retry and runtime.retry_budget is not None and not runtime.retry_budget.try_acquire():
+            logger.warning("sample=%s retry budget exhausted; giving up after attempt %d", sample.id, attempt)
+            context_extra["retry_budget_exhausted"] = True
+            should_retry = False
         if should_retry:
-            await asyncio.sleep(_calc_backoff(attempt, options))
+            assert last_error is not None
+            retry_after = parse_retry_after((last_error.details or {}).get("headers"))
+            backoff_start = time.perf_counter()
+            await asyncio.sleep(_calc_backoff(attempt, options, retry_after))
+            current.backoff_ms = (time.perf_counter() - backoff_start) * 1000.0
             continue
 
-        status = _infer_status(last_error)
-        return RunResult(
-            sample_id=sample.id,
-            dataset_id=dataset.dataset_id,
-            backend=backend_name,
-            run_config=run_config,
-            request_messages=sample.messages,
-            request_context={
-                "sample_tags": sample.tags,
-                "sample_metadata": sample.metadata,
-                "attempt": attempt,
-            },
+        if hedges:
+            context_extra["hedges"] = hedges
+        return _make_result(
+            sample,
+            runtime,
+            trace_id=trace_id,
+            attempt=attempt,
             response=None,
-            status=status,
+            status=_infer_status(last_error),
             latency_ms=latency_ms,
             started_at=started_at,
             completed_at=completed_at,
-            attempts=attempt,
-            trace_id=trace_id,
+            context_extra=context_extra,
             error=last_error,
+            phases=phases,
         )
 
     # Should never reach here
     raise RuntimeError("Execution loop exited unexpectedly")
 
 
-def _calc_backoff(attempt: int, options: RunnerConfig) -> float:
-    base = options.retry_backoff_factor ** max(0, attempt - 1)
+def _make_result(
+    sample: TestSample,
+    runtime: _JobRuntime,
+    *,
+    trace_id: str,
+    attempt: int,
+    response: Optional[ChatResponse],
+    status: RunResultStatus,
+    latency_ms: float,
+    started_at: datetime,
+    completed_at: datetime,
+    context_extra: Optional[Dict[str, Any]] = None,
+    error: Optional[RunError] = None,
+    phases: Optional[List[AttemptPhases]] = None,
+) -> RunResult:
+    request_context: Dict[str, Any] = {
+        "sample_tags": sample.tags,
+        "sample_metadata": sample.metadata,
+        "attempt": attempt,
+    }
+    if context_extra:
+        request_context.update(context_extra)
+    return RunResult(
+        sample_id=sample.id,
+        dataset_id=runtime.dataset.dataset_id,
+        backend=runtime.backend_name,
+        run_config=runtime.run_config,
+        request_messages=sample.messages,
+        request_context=request_context,
+        response=response,
+        status=status,
+        latency_ms=latency_ms,
+        started_at=started_at,
+        completed_at=completed_at,
+        attempts=attempt,
+        trace_id=trace_id,
+        error=error,
+        phases=list(phases or ()),
+    )
+
+
+async def _lookup_cache(
+    runtime: _JobRuntime, key: str
+) -> Tuple[Optional[ChatResponse], str, Optional["asyncio.Future[Any]"]]:
+    """Return ``(response, cache_status, leader_future)`` for a cache-enabled request.
+
+    A hit or a coalesced in-flight request returns a response. Otherwise the caller
+    becomes the leader for ``key`` and must settle the returned future.
+    """
+    assert runtime.cache is not None
+    try:
+        cached = await runtime.cache.aget(key)
+    except sqlite3.Error:
+        runtime.logger.warning("cache read failed for %s; treating it as a miss", key, exc_info=True)
+        cached = None
+    if cached is not None:
+        return cached, "hit", None
+    inflight = runtime.inflight.get(key)
+    if inflight is not None:
+        response, exc = await asyncio.shield(inflight)
+        if exc is not None:
+            raise exc
+        return response, "coalesced", None
+    leader = asyncio.get_running_loop().create_future()
+    runtime.inflight[key] = leader
+    return None, "miss", leader
+
+
+async def _store_cache(runtime: _JobRuntime, key: str, response: ChatResponse) -> None:
+    """Write a fresh response to the cache; a failed write never fails the sample."""
+    assert runtime.cache is not None
+    try:
+        await runtime.cache.aput(key, response)
+    except sqlite3.Error:
+        runtime.logger.warning("cache write failed for %s", key, exc_info=True)
+
+
+def _settle_inflight(
+    runtime: _JobRuntime,
+    key: Optional[str],
+    leader: Optional["asyncio.Future[Any]"],
+    response: Optional[ChatResponse],
+    exc: Optional[BaseException],
+) -> None:
+    if key is None or leader is None:
+        return
+    runtime.inflight.pop(key, None)
+    if not leader.done():
+        if isinstance(exc, asyncio.CancelledError):
+            exc = BackendError("Coalesced request was cancelled", error_type="cancelled", retryable=True)
+        leader.set_result((response, exc))
+
+
+# Errors that say nothing about whether the backend is up.
+_BREAKER_NEUTRAL_ERRORS = frozenset({"rate_limit", "circuit_open", "cancelled", "exception"})
+
+
+def _settle_breaker(breaker: CircuitBreaker, probe: bool, error: RunError) -> None:
+    if error.error_type in _BREAKER_NEUTRAL_ERRORS:
+        breaker.release(probe)
+    elif error.retryable:
+        breaker.record_failure(probe)
+    else:
+        # a non-retryable error (bad request, auth) means the endpoint answered
+        breaker.record_success(probe)
+
+
+def _build_rate_limiter(options: RunnerConfig) -> RateLimiter:
+    return RateLimiter(
+        requests_per_second=options.rate_limit_per_second,
+        request_burst=options.rate_limit_burst,
+        tokens_per_minute=options.tokens_per_minute,
+        token_burst=options.token_burst,
+    )
+
+
+def _calc_backoff(attempt: int, options: RunnerConfig, retry_after: Optional[float] = None) -> float:
+    """Exponential backoff with jitter; a server ``Retry-After`` hint replaces the schedule."""
+    if retry_after is not None:
+        base = min(retry_after, options.retry_after_max_seconds)
+    else:
+        base = options.retry_backoff_factor ** max(0, attempt - 1)
     jitter = random.random() * options.retry_backoff_jitter
     return base + jitter
 
@@ -327,4 +1086,14 @@ def _build_trace_id(prefix: str, sample_id: str) -> str:
     return f"{safe_prefix}-{sample_id}-{uuid.uuid4().hex[:8]}"
 
 
-__all__ = ["RunnerConfig", "run_async_job", "run_job"]
+__all__ = [
+    "JobControl",
+    "graceful_shutdown",
+    "RunnerConfig",
+    "run_async_job",
+    "run_async_matrix_stream_job",
+    "run_async_stream_job",
+    "run_job",
+    "run_matrix_stream_job",
+    "run_stream_job",
+]
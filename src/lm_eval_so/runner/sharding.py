@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import multiprocessing
+import os
+import shutil
+import signal
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from lm_eval_so.core.logging import configure_logging
+from lm_eval_so.core.storage import LocalFileSystemStorage
+
+from ..config import RunnerConfig
+from .dataset import load_dataset
+from .journal import ResultJournal, iter_journal_records
+from .metrics import serve_metrics
+from .models import RunConfig
+from .runner_core import JobControl, graceful_shutdown, run_stream_job
+
+SHARDS_DIRNAME = "shards"
+_SHARD_STATE_KEY = "shard_state.json"
+
+
+def shard_of(sample_id: str, num_shards: int) -> int:
+    """Stable shard index for ``sample_id`` (independent of PYTHONHASHSEED)."""
+    digest = hashlib.sha1(sample_id.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % max(1, num_shards)
+
+
+def scale_options_for_shards(options: RunnerConfig, num_shards: int) -> RunnerConfig:
+    """Split global concurrency, rate and spend budgets evenly across ``num_shards`` processes.
+
+    Rates are divided exactly so the per-process limits sum to the global budget;
+    concurrency and bursts are rounded up so every shard can make progress.
+    """
+    n = max(1, num_shards)
+    update: Dict[str, Any] = {"max_concurrency": max(1, math.ceil(options.max_concurrency / n))}
+    if options.rate_limit_per_second:
+        update["rate_limit_per_second"] = options.rate_limit_per_second / n
+    if options.rate_limit_burst:
+        update["rate_limit_burst"] = max(1, math.ceil(options.rate_limit_burst / n))
+    if options.tokens_per_minute:
+        update["tokens_per_minute"] = options.tokens_per_minute / n
+    if options.token_burst:
+        update["token_burst"] = max(1, math.ceil(options.token_burst / n))
+    if options.max_tokens_budget:
+        update["max_tokens_budget"] = max(1, options.max_tokens_budget // n)
+    if options.max_cost is not None:
+        update["max_cost"] = options.max_cost / n
+    if options.adaptive_max_concurrency:
+        update["adaptive_max_concurrency"] = max(1, math.ceil(options.adaptive_max_concurrency / n))
+    return options.model_copy(update=update)
+
+
+@dataclass
+class ShardSpec:
+    """Everything a worker process needs to run one shard."""
+
+    index: int
+    count: int
+    dataset_path: Path
+    metadata_path: Optional[Path]
+    backend_name: str
+    run_config: RunConfig
+    options: RunnerConfig
+    shard_dir: Path
+    skip_ids: Set[str] = field(default_factory=set)
+    log_level: int = logging.INFO
+    metrics_port: Optional[int] = None
+
+
+def _shard_worker(spec: ShardSpec) -> None:
+    # Ctrl-C reaches the whole process group; workers only react to the SIGTERM the
+    # parent forwards, so one interrupt means one drain request per worker.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    configure_logging(level=spec.log_level)
+    logger = logging.getLogger(f"lm_eval_so.runner.shard{spec.index}")
+    dataset_info, samples = load_dataset(spec.dataset_path, spec.metadata_path)
+    mine = (
+        s for s in samples
+        if shard_of(s.id, spec.count) == spec.index and s.id not in spec.skip_ids
+    )
+
+    storage = LocalFileSystemStorage(spec.shard_dir)
+    journal = ResultJournal(storage.get_path("run_results.jsonl"))
+    control = JobControl()
+    with serve_metrics(spec.metrics_port) as metrics, graceful_shutdown(
+        control, logger, signals=(signal.SIGTERM,)
+    ), journal:
+        control.metrics = metrics
+        for result in run_stream_job(
+            dataset=dataset_info,
+            samples=mine,
+            backend_name=spec.backend_name,
+            run_config=spec.run_config,
+            options=spec.options,
+            logger=logger,
+            control=control,
+        ):
+            journal.append(result)
+
+    storage.save_json(
+        _SHARD_STATE_KEY,
+        {
+            "shard": spec.index,
+            "executed_samples": journal.appended,
+            "stop_reason": control.stop_reason,
+            **control.metadata,
+        },
+    )
+
+
+def run_sharded_job(
+    dataset_path: Path,
+    metadata_path: Optional[Path],
+    backend_name: str,
+    run_config: RunConfig,
+    options: RunnerConfig,
+    output_dir: Path,
+    workers: int,
+    skip_ids: Optional[Set[str]] = None,
+    logger: Optional[logging.Logger] = None,
+    metrics_port: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Run one job across ``workers`` processes, each with its own event loop and backend.
+
+    Samples are assigned by ``shard_of(sample.id)``, budgets are split with
+    ``scale_options_for_shards``, and every worker journals into
+    ``output_dir/shards/shard-<i>/``. Existing shard directories are removed first
+    (merge them beforehand to keep their results); call ``merge_shard_results``
+    afterwards to fold the shard journals into ``output_dir/run_results.jsonl``.
+    With ``metrics_port``, worker ``i`` serves its metrics on ``metrics_port + i``.
+
+    Returns:
+        Per-shard state dicts (executed count, stop reason, job metadata).
+    """
+    logger = logger or logging.getLogger("lm_eval_so.runner")
+    shard_options = scale_options_for_shards(options, workers)
+    shards_root = output_dir / SHARDS_DIRNAME
+    if shards_root.exists():
+        shutil.rmtree(shards_root)
+    processes: List[multiprocessing.Process] = []
+    for index in range(workers):
+        shard_dir = shards_root / f"shard-{index}"
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        spec = ShardSpec(
+            index=index,
+            count=workers,
+            dataset_path=dataset_path,
+            metadata_path=metadata_path,
+            backend_name=backend_name,
+            run_config=run_config,
+            options=shard_options.model_copy(update={"output_dir": shard_dir}),
+            shard_dir=shard_dir,
+            skip_ids=set(skip_ids or ()),
+            log_level=logging.getLogger().level,
+            metrics_port=metrics_port + index if metrics_port is not None else None,
+        )
+        proc = multiprocessing.Process(target=_shard_worker, args=(spec,), name=f"lm-eval-shard-{index}")
+        proc.start()
+        processes.append(proc)
+    logger.info("Started %d shard workers", workers)
+
+    def _forward(signum: int, frame: Any) -> None:
+        logger.warning("received %s; asking shard workers to drain", signal.Signals(signum).name)
+        for proc in processes:
+            if proc.is_alive() and proc.pid is not None:
+                os.kill(proc.pid, signal.SIGTERM)
+
+    previous = {sig: signal.signal(sig, _forward) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        for proc in processes:
+            proc.join()
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+
+    states: List[Dict[str, Any]] = []
+    for index, proc in enumerate(processes):
+        state_path = shards_root / f"shard-{index}" / _SHARD_STATE_KEY
+        if state_path.exists():
+            states.append(json.loads(state_path.read_text(encoding="utf-8")))
+        else:
+            states.append({"shard": index, "stop_reason": f"worker_exit_{proc.exitcode}"})
+        if proc.exitcode:
+            logger.error("shard %d exited with code %s", index, proc.exitcode)
+    return states
+
+
+def merge_shard_results(output_dir: Path, journal: ResultJournal) -> int:
+    """Append every shard journal under ``output_dir/shards`` to ``journal`` and remove them.
+
+    Also recovers shard journals left behind by a crashed sharded run, so call it
+    before computing resume state.
+
+    Returns:
+        Number of merged records.
+    """
+    shards_root = output_dir / SHARDS_DIRNAME
+    if not shards_root.exists():
+        return 0
+    merged = 0
+    for shard_dir in sorted(p for p in shards_root.iterdir() if p.is_dir()):
+        for record in iter_journal_records(shard_dir / "run_results.jsonl"):
+            journal.append(record)
+            merged += 1
+    shutil.rmtree(shards_root)
+    return merged
+
+
+__all__ = ["merge_shard_results", "run_sharded_job", "scale_options_for_shards", "shard_of"]
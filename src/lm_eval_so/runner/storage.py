@@ -3,10 +3,11 @@ from __future__ import annotations
 import json
 from collections import Counter
 from datetime import datetime, timezone
-from statistics import mean
-from typing import Iterable, List, Optional, Dict, Any, TYPE_CHECKING
+from typing import Any, Dict, Iterable, List, Mapping, Optional, TYPE_CHECKING, Union
 
-from .models import DatasetInfo, RunConfig, RunResult
+from lm_eval_so.core.utils import percentile
+
+from .models import AttemptPhases, DatasetInfo, RunConfig, RunResult
 
 if TYPE_CHECKING:  # pragma: no cover
     from ..config import RunnerConfig
@@ -22,10 +23,17 @@ def write_run_metadata(
     dataset: DatasetInfo,
     run_config: RunConfig,
     options: "RunnerConfig",
-    results: List[RunResult],
+    results: Iterable[Union[RunResult, Mapping[str, Any]]],
     storage: StorageBackend,
     key: str = "run_metadata.json",
+    extra: Optional[Mapping[str, Any]] = None,
 ) -> str:
+    """Write ``run_metadata.json``.
+
+    ``results`` may be ``RunResult`` objects or already-serialized records, e.g. the
+    output of ``iter_journal_records`` so the summary is computed by streaming over
+    the journal instead of holding every result in memory.
+    """
     payload = {
         "generated_at": datetime.now(timezone.utc).isoformat(),
         "dataset": dataset.to_dict(),
@@ -33,35 +41,139 @@ def write_run_metadata(
         "options": options.to_metadata_dict(),
         "summary": _build_summary(results),
     }
+    if extra:
+        payload.update(extra)
     path = storage.save_json(key, payload, indent=2)
     return path
 
 
-def _build_summary(results: List[RunResult]) -> Dict[str, Any]:
-    status_counter = Counter(r.status.value for r in results)
-    latencies = [r.latency_ms for r in results if r.latency_ms is not None]
-    tokens = [
-        r.response.usage.total_tokens
-        for r in results
-        if r.response and r.response.usage and r.response.usage.total_tokens is not None
-    ]
+class _StatAccumulator:
+    """Streaming min/max/avg accumulator; keeps values only when percentiles are wanted."""
+
+    def __init__(self, percentiles: bool = False) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._values: Optional[List[float]] = [] if percentiles else None
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if self._values is not None:
+            self._values.append(value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"min": self.min, "max": self.max, "avg": self.total / self.count}
+        if self._values is not None:
+            out["p50"] = percentile(self._values, 50)
+            out["p90"] = percentile(self._values, 90)
+            out["p99"] = percentile(self._values, 99)
+        return out
+
+
+# StreamTimings fields aggregated across samples under summary["streaming"].
+_STREAM_TIMING_FIELDS = ("ttft_ms", "itl_mean_ms", "itl_p99_ms", "output_tokens_per_second")
+
+# Phases counted as harness-induced waiting rather than backend service time.
+# pool_wait_ms is measured inside send_ms but is client-side starvation, not server time.
+_HARNESS_PHASES = (
+    "queue_wait_ms",
+    "circuit_wait_ms",
+    "rate_limit_wait_ms",
+    "semaphore_wait_ms",
+    "backoff_ms",
+    "pool_wait_ms",
+)
+
+# Results served without a backend call; their latency says nothing about the service.
+_CACHED_STATUSES = frozenset({"hit", "coalesced"})
+
+
+def _build_summary(results: Iterable[Union[RunResult, Mapping[str, Any]]]) -> Dict[str, Any]:
+    total = 0
+    status_counter: Counter = Counter()
+    latencies = _StatAccumulator()
+    tokens = _StatAccumulator()
+    cache_counter: Counter = Counter()
+    hedge_counter: Counter = Counter()
+    streaming = {name: _StatAccumulator(percentiles=True) for name in _STREAM_TIMING_FIELDS}
+    phases = {name: _StatAccumulator(percentiles=True) for name in AttemptPhases.PHASES + ("harness_wait_ms",)}
+    warmup = _StatAccumulator(percentiles=True)
+    warmup_count = 0
+    measured_ok = 0
+    window_start: Optional[str] = None
+    window_end: Optional[str] = None
+    for item in results:
+        record = item.to_record() if isinstance(item, RunResult) else item
+        total += 1
+        status_counter[record.get("status")] += 1
+        context = (record.get("request") or {}).get("context") or {}
+        if context.get("warmup"):
+            # cold-start samples are reported on their own, not in the headline stats
+            warmup_count += 1
+            if record.get("status") == "ok" and record.get("latency_ms") is not None:
+                warmup.add(record["latency_ms"])
+            continue
+        if record.get("status") == "ok":
+            measured_ok += 1
+            # ISO-8601 UTC timestamps compare correctly as strings
+            started, completed = record.get("started_at"), record.get("completed_at")
+            if started and (window_start is None or started < window_start):
+                window_start = started
+            if completed and (window_end is None or completed > window_end):
+                window_end = completed
+        cache_status = context.get("cache")
+        if cache_status is not None:
+            cache_counter[cache_status] += 1
+        if context.get("hedges"):
+            hedge_counter["hedged_samples"] += 1
+            hedge_counter["hedges"] += context["hedges"]
+            hedge_counter["hedge_wins"] += 1 if context.get("hedge_won") else 0
+        if record.get("latency_ms") is not None and cache_status not in _CACHED_STATUSES:
+            latencies.add(record["latency_ms"])
+        response = record.get("response") or {}
+        total_tokens = (response.get("tokens") or {}).get("total")
+        if total_tokens is not None:
+            tokens.add(total_tokens)
+        attempt_phases = record.get("phases")
+        if attempt_phases and cache_status not in _CACHED_STATUSES:
+            totals = {name: sum(p.get(name) or 0.0 for p in attempt_phases) for name in AttemptPhases.PHASES}
+            totals["harness_wait_ms"] = sum(totals[name] for name in _HARNESS_PHASES)
+            for name, acc in phases.items():
+                acc.add(totals[name])
+        timings = response.get("timings")
+        if timings and cache_status not in _CACHED_STATUSES:
+            for name, acc in streaming.items():
+                if timings.get(name) is not None:
+                    acc.add(timings[name])
 
     summary: Dict[str, Any] = {
-        "total": len(results),
+        "total": total,
         "status_counts": dict(status_counter),
     }
-    if latencies:
-        summary["latency_ms"] = {
-            "min": min(latencies),
-            "max": max(latencies),
-            "avg": mean(latencies),
-        }
-    if tokens:
-        summary["total_tokens"] = {
-            "min": min(tokens),
-            "max": max(tokens),
-            "avg": mean(tokens),
-        }
+    if latencies.count:
+        summary["latency_ms"] = latencies.to_dict()
+    if measured_ok and window_start and window_end:
+        window = (datetime.fromisoformat(window_end) - datetime.fromisoformat(window_start)).total_seconds()
+        if window > 0:
+            summary["throughput"] = {"ok_per_second": measured_ok / window, "window_seconds": window}
+    if tokens.count:
+        summary["total_tokens"] = tokens.to_dict()
+    if cache_counter:
+        summary["cache"] = dict(cache_counter)
+    if hedge_counter:
+        summary["hedging"] = dict(hedge_counter)
+    if phases["send_ms"].count:
+        summary["phases"] = {name: acc.to_dict() for name, acc in phases.items()}
+    if any(acc.count for acc in streaming.values()):
+        summary["streaming"] = {name: acc.to_dict() for name, acc in streaming.items() if acc.count}
+    if warmup_count:
+        summary["warmup"] = {"count": warmup_count}
+        if warmup.count:
+            summary["warmup"]["latency_ms"] = warmup.to_dict()
     return summary
 
 
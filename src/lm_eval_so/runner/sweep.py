@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from lm_eval_so.core.logging import configure_logging
+from lm_eval_so.core.utils import percentile
+
+from ..config import RunnerConfig
+from .dataset import load_dataset
+from .models import DatasetInfo, RunConfig, RunResultStatus, TestSample
+from .runner_core import run_async_stream_job
+
+DEFAULT_LEVELS = (1, 2, 4, 8, 16, 32, 64)
+
+
+@dataclass
+class SweepStep:
+    """Throughput and latency measured at one concurrency level."""
+
+    concurrency: int
+    samples: int
+    ok: int
+    errors: int
+    elapsed_seconds: float
+    throughput: float
+    latency_p50_ms: Optional[float]
+    latency_p90_ms: Optional[float]
+    latency_p99_ms: Optional[float]
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.samples if self.samples else 0.0
+
+
+@dataclass
+class SweepReport:
+    steps: List[SweepStep] = field(default_factory=list)
+    knee: Optional[int] = None
+    recommended_max_concurrency: Optional[int] = None
+    reason: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "steps": [asdict(step) for step in self.steps],
+            "knee": self.knee,
+            "recommended_max_concurrency": self.recommended_max_concurrency,
+            "reason": self.reason,
+        }
+
+    def to_table(self) -> str:
+        header = f"{'conc':>5} {'ok':>5} {'err':>5} {'thru/s':>8} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}"
+        rows = [header]
+        for s in self.steps:
+            rows.append(
+                f"{s.concurrency:>5} {s.ok:>5} {s.errors:>5} {s.throughput:>8.2f} "
+                f"{_fmt(s.latency_p50_ms):>9} {_fmt(s.latency_p90_ms):>9} {_fmt(s.latency_p99_ms):>9}"
+            )
+        rows.append(f"recommended max_concurrency: {self.recommended_max_concurrency} ({self.reason})")
+        return "\n".join(rows)
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+def find_knee(
+    steps: Sequence[SweepStep],
+    min_throughput_gain: float = 0.1,
+    max_error_rate: float = 0.05,
+) -> Optional[int]:
+    """Index of the first step past the saturation knee, or ``None``.
+
+    A step is past the knee when it raised concurrency but gained less than
+    ``min_throughput_gain`` (relative) throughput over the best step so far while p50
+    latency grew, or when its error rate exceeds ``max_error_rate``.
+    """
+    best: Optional[SweepStep] = None
+    for index, step in enumerate(steps):
+        if step.error_rate > max_error_rate:
+            return index
+        if best is not None:
+            gained = step.throughput > best.throughput * (1.0 + min_throughput_gain)
+            slower = (
+                step.latency_p50_ms is not None
+                and best.latency_p50_ms is not None
+                and step.latency_p50_ms > best.latency_p50_ms
+            )
+            if not gained and slower:
+                return index
+        if best is None or step.throughput > best.throughput:
+            best = step
+    return None
+
+
+async def run_concurrency_sweep(
+    dataset: DatasetInfo,
+    samples: Sequence[TestSample],
+    backend_name: str,
+    run_config: RunConfig,
+    options: RunnerConfig,
+    levels: Sequence[int] = DEFAULT_LEVELS,
+    sample_size: Optional[int] = None,
+    seed: Optional[int] = None,
+    min_throughput_gain: float = 0.1,
+    max_error_rate: float = 0.05,
+    stop_at_knee: bool = True,
+    logger: Optional[logging.Logger] = None,
+) -> SweepReport:
+    """Run the same sampled subset at each concurrency level and locate the knee.
+
+    Each step is a normal ``run_async_stream_job`` with ``max_concurrency`` fixed to
+    the level (adaptive concurrency and the response cache are disabled so every
+    step really hits the backend). Latency percentiles are backend service time (the
+    attempts' ``send_ms``), not time spent queueing in the harness. The recommendation
+    is the last level before the knee, or the best-throughput level when no knee was
+    found.
+    """
+    logger = logger or logging.getLogger("lm_eval_so.runner.sweep")
+    subset = list(samples)
+    if sample_size is not None and sample_size < len(subset):
+        subset = random.Random(seed).sample(subset, sample_size)
+    report = SweepReport()
+    for level in sorted(set(int(x) for x in levels if int(x) > 0)):
+        step_options = options.model_copy(
+            # a wider task window only adds semaphore queueing in front of each request
+            update={
+                "max_concurrency": level,
+                "adaptive_concurrency": False,
+                "cache_path": None,
+                "task_window_factor": 1,
+            }
+        )
+        # a step needs at least a few full windows to measure a steady state
+        step_samples = subset if len(subset) >= level * 2 else (subset * ((level * 2) // max(1, len(subset)) + 1))
+        latencies: List[float] = []
+        ok = errors = 0
+        started = time.perf_counter()
+        async for result in run_async_stream_job(
+            dataset, step_samples, backend_name, run_config, step_options, logger=logger
+        ):
+            if result.status == RunResultStatus.OK:
+                ok += 1
+                # backend service time only, so the curve is not skewed by harness queueing
+                if result.phases:
+                    latencies.append(sum(phase.send_ms for phase in result.phases))
+                elif result.latency_ms is not None:
+                    latencies.append(result.latency_ms)
+            else:
+                errors += 1
+        elapsed = time.perf_counter() - started
+        step = SweepStep(
+            concurrency=level,
+            samples=len(step_samples),
+            ok=ok,
+            errors=errors,
+            elapsed_seconds=elapsed,
+            throughput=ok / elapsed if elapsed > 0 else 0.0,
+            latency_p50_ms=percentile(latencies, 50),
+            latency_p90_ms=percentile(latencies, 90),
+            latency_p99_ms=percentile(latencies, 99),
+        )
+        report.steps.append(step)
+        logger.info(
+            "sweep concurrency=%d throughput=%.2f/s p50=%s ms errors=%d",
+            level,
+            step.throughput,
+            _fmt(step.latency_p50_ms),
+            errors,
+        )
+        if stop_at_knee and find_knee(report.steps, min_throughput_gain, max_error_rate) is not None:
+            break
+
+    knee_index = find_knee(report.steps, min_throughput_gain, max_error_rate)
+    if knee_index is not None:
+        report.knee = report.steps[knee_index].concurrency
+        previous = report.steps[knee_index - 1] if knee_index > 0 else report.steps[0]
+        report.recommended_max_concurrency = previous.concurrency
+        report.reason = f"throughput stopped scaling at concurrency {report.knee}"
+        if knee_index == 0:
+            report.reason = "errors at the lowest level; backend may be unhealthy"
+    elif report.steps:
+        best = max(report.steps, key=lambda s: s.throughput)
+        report.recommended_max_concurrency = best.concurrency
+        report.reason = "no knee found; best throughput level (try higher levels)"
+    return report
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="lm-eval-runner sweep",
+        description="Step through concurrency levels and recommend max_concurrency",
+    )
+    p.add_argument("--dataset", required=True, help="Dataset JSONL path or dataset directory")
+    p.add_argument("--metadata", default=None, help="Optional metadata.json path (if not in dataset dir)")
+    p.add_argument("--backend", required=True, help="Backend name (e.g. openai, adb-cli)")
+    p.add_argument("--model", default=None, help="Model id/name for the backend")
+    p.add_argument("--param", action="append", default=[], help="Run parameter key=value (can repeat)")
+    p.add_argument("--backend-opt", action="append", default=[], help="Backend option key=value (can repeat)")
+    p.add_argument(
+        "--levels",
+        default=",".join(str(x) for x in DEFAULT_LEVELS),
+        help="Comma-separated concurrency levels (default 1,2,4,...,64)",
+    )
+    p.add_argument("--sample-size", type=int, default=None, help="Random subset size used at every level")
+    p.add_argument("--seed", type=int, default=None, help="Seed for the sampled subset")
+    p.add_argument("--min-gain", type=float, default=0.1, help="Relative throughput gain that still counts as scaling")
+    p.add_argument("--max-error-rate", type=float, default=0.05, help="Error rate treated as saturation")
+    p.add_argument("--all-levels", action="store_true", help="Keep sweeping after the knee is found")
+    p.add_argument("--timeout", type=float, default=60.0, help="Per-sample timeout in seconds")
+    p.add_argument("--max-retries", type=int, default=0, help="Retries per sample (default 0 to measure raw behaviour)")
+    p.add_argument("--format", choices=["table", "json"], default="table", help="Output format on stdout")
+    p.add_argument("--output", default=None, help="Also write the JSON report to this path")
+    p.add_argument("--log-level", default="WARNING", help="Logging level (DEBUG, INFO, WARNING, ERROR)")
+    return p
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from .cli import _ensure_backend, _parse_kv_list
+
+    args = _build_parser().parse_args(argv)
+    configure_logging(level=getattr(logging, str(args.log_level).upper(), logging.WARNING))
+    _ensure_backend(args.backend)
+    dataset_info, samples = load_dataset(
+        Path(args.dataset).resolve(), Path(args.metadata).resolve() if args.metadata else None
+    )
+    run_config = RunConfig(
+        backend=args.backend,
+        model=args.model,
+        parameters=_parse_kv_list(list(args.param or [])),
+        backend_options=_parse_kv_list(list(args.backend_opt or [])),
+    )
+    options = RunnerConfig(timeout_seconds=args.timeout, max_retries=args.max_retries)
+    report = asyncio.run(
+        run_concurrency_sweep(
+            dataset_info,
+            samples,
+            args.backend,
+            run_config,
+            options,
+            levels=[int(x) for x in str(args.levels).split(",") if x.strip()],
+            sample_size=args.sample_size,
+            seed=args.seed,
+            min_throughput_gain=args.min_gain,
+            max_error_rate=args.max_error_rate,
+            stop_at_knee=not args.all_levels,
+        )
+    )
+    if args.output:
+        Path(args.output).write_text(json.dumps(report.to_dict(), indent=2) + "\n", encoding="utf-8")
+    print(report.to_table() if args.format == "table" else json.dumps(report.to_dict(), indent=2))
+
+
+__all__ = ["DEFAULT_LEVELS", "SweepReport", "SweepStep", "find_knee", "run_concurrency_sweep"]
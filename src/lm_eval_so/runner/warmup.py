@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from lm_eval_so.core.utils import percentile
+
+from .models import Message, TestSample
+
+WARMUP_MODES = ("synthetic", "tagged")
+
+
+def synthetic_warmup_sample(index: int, prompt: str) -> TestSample:
+    """Throwaway sample sent before the dataset; never journaled or evaluated."""
+    return TestSample(id=f"__warmup_{index}", messages=[Message(role="user", content=prompt)])
+
+
+class WarmupGate:
+    """Decides whether the next dispatched sample still belongs to the warmup.
+
+    With ``requests`` the first N samples are warmup; otherwise samples dispatched
+    within ``seconds`` of the first call are.
+    """
+
+    def __init__(self, requests: int = 0, seconds: float = 0.0) -> None:
+        self.requests = max(0, requests)
+        self.seconds = max(0.0, seconds)
+        self.issued = 0
+        self._started: Optional[float] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.requests or self.seconds)
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        if self._started is None:
+            self._started = now
+        if self.requests:
+            warm = self.issued < self.requests
+        else:
+            warm = now - self._started < self.seconds
+        if warm:
+            self.issued += 1
+        return warm
+
+
+@dataclass
+class WarmupReport:
+    """Outcome of the warmup requests, reported apart from the run summary."""
+
+    mode: str
+    requests: int = 0
+    ok: int = 0
+    errors: int = 0
+    latencies_ms: List[float] = field(default_factory=list)
+
+    def observe(self, latency_ms: float, ok: bool) -> None:
+        self.requests += 1
+        if ok:
+            self.ok += 1
+            self.latencies_ms.append(latency_ms)
+        else:
+            self.errors += 1
+
+    def to_metadata(self) -> Dict[str, Any]:
+        values = self.latencies_ms
+        return {
+            "mode": self.mode,
+            "requests": self.requests,
+            "ok": self.ok,
+            "errors": self.errors,
+            "latency_ms": {
+                "first": values[0] if values else None,
+                "p50": percentile(values, 50),
+                "max": max(values) if values else None,
+            },
+        }
+
+
+__all__ = ["WARMUP_MODES", "WarmupGate", "WarmupReport", "synthetic_warmup_sample"]
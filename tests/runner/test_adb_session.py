@@ -0,0 +1,154 @@
+import asyncio
+import os
+import stat
+import sys
+import textwrap
+
+import pytest
+
+from lm_eval_so.core.backends.base import backend_registry
+from lm_eval_so.core.context import RunnerContext
+from lm_eval_so.runner.models import DatasetInfo, Message, RunConfig, RunRequest, RunResultStatus, TestSample
+from lm_eval_so.runner.runner_core import JobControl, RunnerConfig, run_job
+
+# Stands in for ``adb -s <id> shell <binary> [args]``: ``--serve`` answers one JSON line
+# per request line, otherwise it answers the whole of stdin once. Every start is logged,
+# and the first "crash" prompt kills the serving process.
+FAKE_ADB = textwrap.dedent(
+    """\
+    #!{python}
+    import json, os, sys
+    args = sys.argv[sys.argv.index("shell") + 2:]
+    with open({log!r}, "a") as log:
+        log.write(" ".join(args) + "\\n")
+    with open({log!r} + ".pid", "a") as pids:
+        pids.write(str(os.getpid()) + "\\n")
+    if "--broken" in args:
+        sys.stderr.write("serve mode unsupported\\n")
+        sys.exit(1)
+    def reply(request):
+        prompt = request["messages"][-1]["content"]
+        out = {{"text": "echo: " + prompt, "usage": {{"input": 2, "output": 3}}}}
+        if "id" in request:
+            out["id"] = request["id"]
+        return json.dumps(out)
+    if "--serve" not in args:
+        print(reply(json.loads(sys.stdin.read())))
+        sys.exit(0)
+    print("llm server ready", flush=True)
+    for line in sys.stdin:
+        request = json.loads(line)
+        if request["messages"][-1]["content"] == "crash" and not os.path.exists({log!r} + ".crashed"):
+            open({log!r} + ".crashed", "w").close()
+            sys.exit(3)
+        print(reply(request), flush=True)
+    """
+)
+
+
+@pytest.fixture
+def fake_adb(tmp_path):
+    log = tmp_path / "starts.log"
+    log.touch()
+    script = tmp_path / "adb"
+    script.write_text(FAKE_ADB.format(python=sys.executable, log=str(log)))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return script, log
+
+
+def _backend(adb_path, **options):
+    options = {"session_args": "--serve", **options}
+    return backend_registry.create(
+        "adb-cli",
+        context=RunnerContext(),
+        adb_path=str(adb_path),
+        device_id="emulator-5554",
+        binary="/data/local/tmp/llm",
+        persistent_session=True,
+        **options,
+    )
+
+
+def _request(content):
+    return RunRequest(
+        sample=TestSample(id="s1", messages=[Message(role="user", content=content)]),
+        run_config=RunConfig(backend="adb-cli", model="m"),
+        dataset_info=DatasetInfo(dataset_id="d", name="d", version="1", source="test"),
+        trace_id="t-1",
+        attempt=1,
+        timeout_seconds=10,
+    )
+
+
+@pytest.mark.asyncio
+async def test_session_is_reused_across_samples(fake_adb):
+    adb, log = fake_adb
+    backend = _backend(adb)
+
+    responses = await asyncio.gather(*(backend.send(_request(f"q{i}")) for i in range(5)))
+
+    assert [r.text for r in responses] == [f"echo: q{i}" for i in range(5)]
+    assert responses[0].usage.output_tokens == 3
+    assert log.read_text().splitlines() == ["--serve"]
+    assert backend.to_metadata() == {
+        "adb_session": {"starts": 1, "requests": 5, "crashes": 0, "fallback": False}
+    }
+
+
+@pytest.mark.asyncio
+async def test_crashed_session_is_restarted(fake_adb):
+    adb, log = fake_adb
+    backend = _backend(adb)
+
+    texts = [(await backend.send(_request(prompt))).text for prompt in ("before", "crash", "after")]
+
+    assert texts == ["echo: before", "echo: crash", "echo: after"]
+    # the crashed request was resent on a fresh session, which then kept serving
+    assert log.read_text().splitlines() == ["--serve", "--serve"]
+    assert backend.to_metadata() == {
+        "adb_session": {"starts": 2, "requests": 4, "crashes": 1, "fallback": False}
+    }
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_per_call_when_session_mode_fails(fake_adb):
+    adb, log = fake_adb
+    backend = _backend(adb, session_args="--serve --broken", session_max_restarts=2)
+
+    first = await backend.send(_request("one"))
+    second = await backend.send(_request("two"))
+
+    assert (first.text, second.text) == ("echo: one", "echo: two")
+    assert log.read_text().splitlines() == ["--serve --broken"] * 3 + ["", ""]
+    assert backend.to_metadata()["adb_session"]["fallback"] is True
+
+
+def test_session_process_exits_when_the_job_ends(fake_adb):
+    adb, log = fake_adb
+    samples = [TestSample(id=f"s{i}", messages=[Message(role="user", content=f"q{i}")]) for i in range(3)]
+    run_config = RunConfig(
+        backend="adb-cli",
+        model="m",
+        backend_options={
+            "adb_path": str(adb),
+            "binary": "/data/local/tmp/llm",
+            "persistent_session": True,
+            "session_args": "--serve",
+        },
+    )
+    control = JobControl()
+
+    results = run_job(
+        DatasetInfo(dataset_id="d", name="d", version="1", source="test"),
+        samples,
+        "adb-cli",
+        run_config,
+        RunnerConfig(max_concurrency=2),
+        control=control,
+    )
+
+    assert all(r.status == RunResultStatus.OK for r in results)
+    assert control.metadata["backend"]["adb_session"]["starts"] == 1
+    (pid,) = [int(line) for line in open(str(log) + ".pid")]
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
@@ -0,0 +1,102 @@
+import asyncio
+import json
+
+import pytest
+
+from lm_eval_so.core.backends.base import ChatBackend, backend_registry
+from lm_eval_so.runner.budget import JobBudget, lookup_price
+from lm_eval_so.runner.cli import main
+from lm_eval_so.runner.models import (
+    ChatResponse,
+    DatasetInfo,
+    Message,
+    RunConfig,
+    RunRequest,
+    TestSample,
+    TokenUsage,
+)
+from lm_eval_so.runner.runner_core import JobControl, RunnerConfig, run_async_stream_job
+
+
+class PaidBackend(ChatBackend):
+    async def send(self, request: RunRequest) -> ChatResponse:
+        await asyncio.sleep(0.01)
+        return ChatResponse(text="ok", usage=TokenUsage(input_tokens=60, output_tokens=40, total_tokens=100))
+
+
+backend_registry.register("budget_paid", PaidBackend)
+
+DATASET = DatasetInfo(dataset_id="d", name="d", version="1", source="test")
+SAMPLES = [TestSample(id=f"s{i}", messages=[Message(role="user", content="hi")]) for i in range(50)]
+PRICES = {"gpt-x": {"input": 1.0, "output": 2.0}}
+
+
+def test_price_lookup_prefers_exact_then_longest_prefix():
+    prices = {"gpt-x": {"input": 1, "output": 1}, "gpt-x-mini": {"input": 2, "output": 2}}
+    assert lookup_price(prices, "gpt-x-mini-2024") == prices["gpt-x-mini"]
+    assert lookup_price(prices, "gpt-x") == prices["gpt-x"]
+    assert lookup_price(prices, "other") is None
+    with pytest.raises(ValueError):
+        JobBudget(model="other", max_cost=1.0, prices=prices)
+
+
+async def _run(options, model="gpt-x"):
+    control = JobControl()
+    results = [
+        r
+        async for r in run_async_stream_job(
+            DATASET, SAMPLES, "budget_paid", RunConfig(backend="budget_paid", model=model), options, control=control
+        )
+    ]
+    return results, control.metadata["budget"]
+
+
+@pytest.mark.asyncio
+async def test_token_budget_stops_scheduling_and_drains():
+    results, budget = await _run(RunnerConfig(max_concurrency=2, task_window_factor=1, max_tokens_budget=1000))
+
+    # 10 samples hit the limit; at most the two in flight drain past it
+    assert 10 <= len(results) <= 12
+    assert budget["truncated"] is True and budget["truncated_by"] == "tokens"
+    assert budget["total_tokens"] == len(results) * 100
+
+
+@pytest.mark.asyncio
+async def test_cost_budget_uses_price_table():
+    options = RunnerConfig(max_concurrency=1, task_window_factor=1, max_cost=0.00069, price_table=PRICES)
+    results, budget = await _run(options)
+
+    # each sample costs (60 * 1 + 40 * 2) / 1M = 0.00014
+    assert len(results) == 5
+    assert budget["truncated_by"] == "cost"
+    assert budget["cost"] == pytest.approx(0.0007)
+
+
+@pytest.mark.asyncio
+async def test_untruncated_run_reports_spend():
+    results, budget = await _run(RunnerConfig(max_concurrency=4, price_table=PRICES, deadline_seconds=30))
+
+    assert len(results) == len(SAMPLES)
+    assert budget["truncated"] is False
+    assert budget["cost"] == pytest.approx(0.00014 * len(SAMPLES))
+
+
+def test_cli_rejects_max_cost_without_a_price_before_touching_results(tmp_path, capsys):
+    prices = tmp_path / "prices.json"
+    prices.write_text(json.dumps({"gpt-4o-mini": {"input": 0.15, "output": 0.6}}))
+    variants = tmp_path / "variants.json"
+    variants.write_text(
+        json.dumps([{"backend": "openai", "model": "gpt-4o-mini"}, {"backend": "openai", "model": "gpt-x"}])
+    )
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "run_results.jsonl").write_text('{"sample_id": "s0"}\n')
+    base = ["--dataset", str(tmp_path / "d.jsonl"), "--output-dir", str(out), "--max-cost", "1"]
+
+    single = ["--backend", "openai", "--model", "gpt-x"]
+    matrix = ["--matrix", str(variants), "--price-table", str(prices)]
+    for extra in (single, matrix):
+        with pytest.raises(SystemExit):
+            main(base + extra)
+        assert "price-table entry for model 'gpt-x'" in capsys.readouterr().err
+    assert (out / "run_results.jsonl").read_text() == '{"sample_id": "s0"}\n'
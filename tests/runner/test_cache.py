@@ -0,0 +1,104 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from lm_eval_so.core.backends.base import ChatBackend, backend_registry
+from lm_eval_so.runner.cache import ResponseCache, build_cache_key
+from lm_eval_so.runner.models import (
+    ChatResponse,
+    DatasetInfo,
+    Message,
+    RunConfig,
+    RunResultStatus,
+    TestSample,
+    TokenUsage,
+)
+from lm_eval_so.runner.runner_core import RunnerConfig, run_async_job
+from lm_eval_so.runner.storage import _build_summary
+
+
+class CountingBackend(ChatBackend):
+    calls = 0
+
+    async def send(self, request):
+        CountingBackend.calls += 1
+        await asyncio.sleep(0.01)
+        return ChatResponse(text=f"echo {request.messages[-1].content}", usage=TokenUsage(1, 2, 3))
+
+
+backend_registry.register("cache_counting", CountingBackend)
+
+
+def test_cache_roundtrip_and_lru_eviction(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite", max_bytes=200)
+    key_a = build_cache_key("b", "m", {"temperature": 0}, [Message(role="user", content="a")])
+    key_b = build_cache_key("b", "m", {"temperature": 0}, [Message(role="user", content="b ")])
+    assert key_a != key_b
+    assert key_b == build_cache_key("b", "m", {"temperature": 0}, [Message(role="user", content="b")])
+
+    cache.put(key_a, ChatResponse(text="x" * 100, usage=TokenUsage(1, 2, 3)))
+    hit = cache.get(key_a)
+    assert hit.text == "x" * 100 and hit.usage.total_tokens == 3
+
+    cache.put(key_b, ChatResponse(text="y" * 100))
+    assert cache.get(key_a) is None
+    assert cache.get(key_b) is not None
+
+
+@pytest.mark.asyncio
+async def test_runner_coalesces_inflight_duplicates_and_reuses_cache(tmp_path):
+    CountingBackend.calls = 0
+    dataset = DatasetInfo(dataset_id="d", name=None, version=None, source=None)
+    samples = [
+        TestSample(id=f"s{i}", messages=[Message(role="user", content="same question")]) for i in range(4)
+    ]
+    run_config = RunConfig(backend="cache_counting")
+    options = RunnerConfig(max_concurrency=4, cache_path=tmp_path / "cache.sqlite")
+
+    first = await run_async_job(dataset, samples, "cache_counting", run_config, options)
+    assert CountingBackend.calls == 1
+    assert sorted(r.request_context["cache"] for r in first) == ["coalesced"] * 3 + ["miss"]
+
+    second = await run_async_job(dataset, samples, "cache_counting", run_config, options)
+    assert CountingBackend.calls == 1
+    assert all(r.request_context["cache"] == "hit" for r in second)
+
+    summary = _build_summary(first)
+    assert summary["cache"] == {"miss": 1, "coalesced": 3}
+    assert summary["latency_ms"]["min"] == summary["latency_ms"]["max"]
+
+
+@pytest.mark.asyncio
+async def test_cache_write_failure_keeps_the_sample_and_runs_off_the_loop(tmp_path, monkeypatch):
+    loop_thread = threading.get_ident()
+    write_threads = []
+
+    def failing_put(self, key, response):
+        write_threads.append(threading.get_ident())
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(ResponseCache, "put", failing_put)
+    dataset = DatasetInfo(dataset_id="d", name=None, version=None, source=None)
+    samples = [TestSample(id=f"s{i}", messages=[Message(role="user", content=f"q{i}")]) for i in range(3)]
+    options = RunnerConfig(max_concurrency=3, cache_path=tmp_path / "cache.sqlite")
+
+    results = await run_async_job(dataset, samples, "cache_counting", RunConfig(backend="cache_counting"), options)
+
+    assert [r.status for r in results] == [RunResultStatus.OK] * 3
+    assert len(write_threads) == 3 and loop_thread not in write_threads
+
+
+def test_cache_key_separates_endpoints_but_ignores_secrets_and_pool_tuning():
+    messages = [Message(role="user", content="hi")]
+
+    def key(**options):
+        return build_cache_key("http-json", None, {}, messages, options)
+
+    assert key(url="http://bot-a/chat") != key(url="http://bot-b/chat")
+    assert key(endpoints=[{"url": "a"}]) != key(endpoints=[{"url": "b"}])
+    assert key(url="http://bot-a/chat", headers={"Authorization": "x"}, max_connections=8) == key(
+        url="http://bot-a/chat", headers={"Authorization": "y"}
+    )
+    assert key() == build_cache_key("http-json", None, {}, messages)
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from lm_eval_so.core.backends.base import ChatBackend, backend_registry
+from lm_eval_so.core.exceptions import BackendError
+from lm_eval_so.runner.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from lm_eval_so.runner.models import ChatResponse, DatasetInfo, Message, RunConfig, RunRequest, TestSample
+from lm_eval_so.runner.runner_core import JobControl, RunnerConfig, run_async_stream_job
+
+
+class DownBackend(ChatBackend):
+    calls = 0
+
+    async def send(self, request: RunRequest) -> ChatResponse:
+        DownBackend.calls += 1
+        raise BackendError("503", error_type="server_error", status_code=503, retryable=True)
+
+
+backend_registry.register("circuit_down", DownBackend)
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_then_probe_closes_it():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.05)
+    for _ in range(2):
+        assert await breaker.acquire() is False
+        breaker.record_failure(False)
+    assert breaker.state == OPEN
+
+    await asyncio.sleep(0.06)
+    probe = await breaker.acquire()
+    assert probe is True and breaker.state == HALF_OPEN
+    waiter = asyncio.create_task(breaker.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()  # only one probe while half-open
+
+    breaker.record_success(True)
+    assert breaker.state == CLOSED
+    assert await asyncio.wait_for(waiter, 1) is False
+    meta = breaker.to_metadata()
+    assert meta["trips"] == 1
+    assert [e["to"] for e in meta["events"]] == [OPEN, HALF_OPEN, CLOSED]
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_stops_job_instead_of_burning_retries():
+    DownBackend.calls = 0
+    dataset = DatasetInfo(dataset_id="d", name="d", version="1", source="test")
+    samples = [TestSample(id=f"s{i}", messages=[Message(role="user", content="hi")]) for i in range(50)]
+    options = RunnerConfig(
+        max_concurrency=2,
+        max_retries=5,
+        retry_backoff_factor=0.0,
+        retry_backoff_jitter=0.0,
+        circuit_breaker_threshold=3,
+        circuit_breaker_reset_seconds=0.05,
+        circuit_breaker_max_open_seconds=0.2,
+    )
+    control = JobControl()
+
+    results = [
+        r
+        async for r in run_async_stream_job(
+            dataset, samples, "circuit_down", RunConfig(backend="circuit_down"), options, control=control
+        )
+    ]
+
+    assert control.stop_reason == "circuit_open"
+    assert len(results) < len(samples)
+    assert DownBackend.calls < 50
+    assert any(r.error.error_type == "circuit_open" for r in results)
+    meta = control.metadata["circuit_breaker"]
+    assert meta["gave_up"] is True and meta["trips"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_give_up_without_retries_fails_samples_instead_of_the_job():
+    # with max_retries=0 the circuit_open error comes from acquire() before any probe exists
+    dataset = DatasetInfo(dataset_id="d", name="d", version="1", source="test")
+    samples = [TestSample(id=f"s{i}", messages=[Message(role="user", content="hi")]) for i in range(30)]
+    options = RunnerConfig(
+        max_concurrency=2,
+        max_retries=0,
+        circuit_breaker_threshold=2,
+        circuit_breaker_reset_seconds=0.05,
+        circuit_breaker_max_open_seconds=0.12,
+    )
+    control = JobControl()
+
+    results = [
+        r
+        async for r in run_async_stream_job(
+            dataset, samples, "circuit_down", RunConfig(backend="circuit_down"), options, control=control
+        )
+    ]
+
+    assert control.stop_reason == "circuit_open"
+    assert any(r.error.error_type == "circuit_open" for r in results)
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from lm_eval_so.runner.concurrency import AdaptiveConcurrencyController, ConcurrencyLimiter
+
+
+@pytest.mark.asyncio
+async def test_limiter_admits_waiters_when_limit_is_raised():
+    limiter = ConcurrencyLimiter(1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    limiter.set_limit(2)
+    await asyncio.wait_for(waiter, timeout=1)
+    assert limiter.in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_limiter_cancelled_waiter_does_not_leak_slot():
+    limiter = ConcurrencyLimiter(1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    limiter.release()
+    assert limiter.in_flight == 0
+
+
+def test_controller_grows_on_success_and_shrinks_on_rate_limit():
+    controller = AdaptiveConcurrencyController(ConcurrencyLimiter(4), min_limit=1, max_limit=16)
+    for _ in range(4):
+        controller.on_success(100.0)
+    assert controller.limit == 5
+
+    controller.on_error("rate_limit")
+    assert controller.limit == 3
+    # a second 429 from the same burst does not shrink again
+    controller.on_error("rate_limit")
+    assert controller.limit == 3
+
+    meta = controller.to_metadata()
+    assert [c["reason"] for c in meta["changes"]] == ["additive_increase", "rate_limit"]
+    assert meta["peak"] == 5
+
+
+def test_controller_holds_when_ratelimit_headers_show_no_headroom():
+    controller = AdaptiveConcurrencyController(ConcurrencyLimiter(2), min_limit=1, max_limit=16)
+    for _ in range(4):
+        controller.on_success(100.0, {"x-ratelimit-remaining-requests": "1"})
+    assert controller.limit == 2
+
+    controller.on_success(100.0, {"x-ratelimit-remaining-tokens": "0"})
+    assert controller.limit == 1
+
+
+@pytest.mark.asyncio
+async def test_deferred_waiters_queue_behind_fresh_work():
+    limiter = ConcurrencyLimiter(1)
+    await limiter.acquire()
+    order = []
+
+    async def _take(name, deferred):
+        await limiter.acquire(deferred=deferred)
+        order.append(name)
+        limiter.release()
+
+    retry = asyncio.create_task(_take("retry", True))
+    await asyncio.sleep(0)
+    fresh = asyncio.create_task(_take("fresh", False))
+    await asyncio.sleep(0)
+    limiter.release()
+    await asyncio.wait_for(asyncio.gather(retry, fresh), timeout=1)
+    assert order == ["fresh", "retry"]
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from lm_eval_so.runner.hedging import HedgePolicy, hedged_send
+from lm_eval_so.runner.models import ChatResponse, TokenUsage
+from lm_eval_so.runner.rate_limit import RateLimiter
+
+
+def _policy(**kwargs):
+    policy = HedgePolicy(percentile=90, min_samples=5, **kwargs)
+    for latency in (10, 10, 10, 10, 20):
+        policy.observe(latency)
+    return policy
+
+
+@pytest.mark.asyncio
+async def test_slow_attempt_is_hedged_and_loser_cancelled():
+    policy = _policy(budget=1.0)
+    calls = []
+    cancelled = []
+
+    async def send():
+        calls.append(len(calls))
+        try:
+            await asyncio.sleep(1.0 if len(calls) == 1 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return ChatResponse(text=f"call{len(calls)}")
+
+    hedges = []
+    response, won = await asyncio.wait_for(hedged_send(policy, send, lambda: hedges.append(1)), 0.5)
+    await asyncio.sleep(0)
+
+    assert won is True and response.text == "call2"
+    assert hedges == [1] and cancelled == [True]
+    assert policy.to_metadata()["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedges_respect_budget():
+    policy = _policy(budget=0.5)
+
+    async def send():
+        await asyncio.sleep(0.03)
+        return ChatResponse(text="ok")
+
+    await asyncio.gather(*(hedged_send(policy, send) for _ in range(6)))
+
+    assert policy.primaries == 6
+    assert policy.hedges == 3
+
+
+@pytest.mark.asyncio
+async def test_hedge_is_skipped_without_a_rate_limit_permit():
+    policy = _policy(budget=1.0)
+    limiter = RateLimiter(requests_per_second=1.0, request_burst=1)
+    assert limiter.try_acquire() is not None
+    calls = []
+
+    async def send():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return ChatResponse(text="ok")
+
+    response, won = await hedged_send(policy, send, admit=lambda: limiter.try_acquire() is not None)
+
+    assert (response.text, won, len(calls)) == ("ok", False, 1)
+    assert policy.hedges == 0 and policy.to_metadata()["rate_limited"] == 1
+
+
+@pytest.mark.asyncio
+async def test_loser_that_completes_is_reported():
+    policy = _policy(budget=1.0)
+    losers = []
+    gate = asyncio.Event()
+
+    async def send():
+        # the hedge releases the stalled primary, so both finish before any cancel lands
+        if policy.hedges == 0:
+            await gate.wait()
+        gate.set()
+        return ChatResponse(text="ok", usage=TokenUsage(input_tokens=3, output_tokens=4, total_tokens=7))
+
+    response, _ = await hedged_send(policy, send, on_loser=losers.append)
+
+    assert policy.hedges == 1
+    assert [loser.usage.total_tokens for loser in losers] == [7]
+    assert losers[0] is not response
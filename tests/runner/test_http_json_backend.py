@@ -0,0 +1,135 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from lm_eval_so.core.backends.http_json_backend import JsonTemplate, extract_path
+from lm_eval_so.core.context import RunnerContext
+from lm_eval_so.core.exceptions import BackendError
+from lm_eval_so.runner.models import DatasetInfo, Message, RunConfig, RunRequest, TestSample
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    seen = []
+
+    def do_POST(self):  # noqa: N802 - http.server API
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        payload = json.loads(body)
+        _StubHandler.seen.append((self.client_address[1], payload))
+        if payload.get("query") == "busy":
+            self._reply(429, {"error": "slow down"}, {"Retry-After": "2"})
+            return
+        self._reply(200, {"data": {"reply": f"echo: {payload['query']}"}, "usage": {"in": 3, "out": 5}})
+
+    def _reply(self, status, data, headers=None):
+        raw = gzip.compress(json.dumps(data).encode())
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(raw)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _StubHandler.seen = []
+    yield f"http://127.0.0.1:{server.server_address[1]}/chat"
+    server.shutdown()
+    server.server_close()
+
+
+def _request(content):
+    return RunRequest(
+        sample=TestSample(id="s1", messages=[Message(role="user", content=content)]),
+        run_config=RunConfig(backend="http-json", model="bot-1"),
+        dataset_info=DatasetInfo(dataset_id="d", name="d", version="1", source="test"),
+        trace_id="t-1",
+        attempt=1,
+        timeout_seconds=5,
+    )
+
+
+def _backend(url, **options):
+    from lm_eval_so.core.backends.base import backend_registry
+
+    return backend_registry.create(
+        "http-json",
+        context=RunnerContext(options={"max_concurrency": 4}),
+        url=url,
+        request_template='{"query": {{ prompt | tojson }}, "bot": {{ model | tojson }}}',
+        text_path="$.data.reply",
+        input_tokens_path="usage.in",
+        output_tokens_path="usage.out",
+        **options,
+    )
+
+
+def test_extract_path_handles_dots_indices_and_missing():
+    data = {"choices": [{"message": {"content": "hi"}}]}
+    assert extract_path(data, "choices.0.message.content") == "hi"
+    assert extract_path(data, "$.choices[0].message.content") == "hi"
+    assert extract_path(data, "choices.3.message") is None
+    assert extract_path(data, "nope.x") is None
+
+
+def test_mapping_template_escapes_prompt_values():
+    template = JsonTemplate(
+        {"q": "{{ prompt }}", "n": "{{ parameters.n }}", "tag": "bot-{{ model }}", "history": ["{{ messages }}"]}
+    )
+    prompt = 'say "hi"\nthen \\ stop'
+    request = _request(prompt)
+    request.run_config.parameters = {"n": 2}
+
+    body = template.render(request)
+
+    assert body == {
+        "q": prompt,
+        "n": 2,
+        "tag": "bot-bot-1",
+        "history": [[{"role": "user", "content": prompt}]],
+    }
+    with pytest.raises(BackendError) as info:
+        JsonTemplate({"q": "{{ missing }}"}).render(request)
+    assert info.value.error_type == "config"
+
+
+@pytest.mark.asyncio
+async def test_templated_request_and_response_paths_over_shared_pool(stub_url):
+    pytest.importorskip("httpx")
+    backend = _backend(stub_url, gzip_request=True)
+
+    first = await backend.send(_request("hello"))
+    second = await backend.send(_request("again"))
+
+    assert first.text == "echo: hello" and second.text == "echo: again"
+    assert first.usage.input_tokens == 3 and first.usage.total_tokens == 8
+    assert _StubHandler.seen[0][1] == {"query": "hello", "bot": "bot-1"}
+    # keep-alive: both requests arrived over the same client connection
+    assert _StubHandler.seen[0][0] == _StubHandler.seen[1][0]
+    assert first.pool_wait_ms is not None
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_maps_to_retryable_error_with_headers(stub_url):
+    pytest.importorskip("httpx")
+    backend = _backend(stub_url, limit_per_host=1)
+
+    with pytest.raises(BackendError) as info:
+        await backend.send(_request("busy"))
+
+    assert info.value.error_type == "rate_limit" and info.value.retryable
+    assert info.value.details == {"headers": {"retry-after": "2"}}
@@ -0,0 +1,49 @@
+import json
+
+from lm_eval_so.runner.journal import (
+    ResultJournal,
+    compact_journal,
+    iter_journal_records,
+    load_completed_sample_ids,
+)
+
+
+def _record(sample_id, status):
+    return {"sample_id": sample_id, "status": status, "latency_ms": 1.0, "response": None}
+
+
+def test_journal_resume_drops_torn_tail_and_appends(tmp_path):
+    path = tmp_path / "run_results.jsonl"
+    with ResultJournal(path) as journal:
+        journal.append(_record("s1", "ok"))
+        journal.append(_record("s2", "timeout"))
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"sample_id": "s3", "sta')  # simulated crash mid-write
+
+    with ResultJournal(path, resume=True) as journal:
+        journal.append(_record("s3", "ok"))
+
+    assert [r["sample_id"] for r in iter_journal_records(path)] == ["s1", "s2", "s3"]
+
+
+def test_load_completed_sample_ids_honours_rerun_statuses(tmp_path):
+    path = tmp_path / "run_results.jsonl"
+    with ResultJournal(path) as journal:
+        journal.append(_record("s1", "ok"))
+        journal.append(_record("s2", "timeout"))
+        journal.append(_record("s3", "error"))
+
+    assert load_completed_sample_ids(path) == {"s1", "s2", "s3"}
+    assert load_completed_sample_ids(path, rerun_statuses=["timeout", "error"]) == {"s1"}
+
+
+def test_compact_journal_keeps_latest_record_per_sample(tmp_path):
+    path = tmp_path / "run_results.jsonl"
+    with ResultJournal(path) as journal:
+        journal.append(_record("s1", "ok"))
+        journal.append(_record("s2", "timeout"))
+        journal.append(_record("s2", "ok"))
+
+    assert compact_journal(path) == 1
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [(r["sample_id"], r["status"]) for r in lines] == [("s1", "ok"), ("s2", "ok")]
@@ -0,0 +1,50 @@
+import urllib.request
+
+import pytest
+
+from lm_eval_so.core.backends.base import ChatBackend, backend_registry
+from lm_eval_so.core.exceptions import BackendError
+from lm_eval_so.runner.metrics import MetricsServer, RunMetrics
+from lm_eval_so.runner.models import ChatResponse, DatasetInfo, Message, RunConfig, RunRequest, TestSample, TokenUsage
+from lm_eval_so.runner.runner_core import JobControl, RunnerConfig, run_async_stream_job
+
+
+class MeteredBackend(ChatBackend):
+    async def send(self, request: RunRequest) -> ChatResponse:
+        if request.sample.id == "bad":
+            raise BackendError("nope", error_type="bad_request", retryable=False)
+        return ChatResponse(text="ok", usage=TokenUsage(input_tokens=3, output_tokens=2, total_tokens=5))
+
+
+backend_registry.register("metered", MeteredBackend)
+
+
+def _value(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_prefix} not found in\n{text}")
+
+
+@pytest.mark.asyncio
+async def test_runner_feeds_metrics_and_server_exposes_them():
+    dataset = DatasetInfo(dataset_id="d", name="d", version="1", source="test")
+    samples = [TestSample(id=i, messages=[Message(role="user", content="hi")]) for i in ("a", "b", "bad")]
+    control = JobControl(metrics=RunMetrics())
+
+    async for _ in run_async_stream_job(
+        dataset, samples, "metered", RunConfig(backend="metered"), RunnerConfig(max_concurrency=3), control=control
+    ):
+        pass
+
+    with MetricsServer(control.metrics, port=0) as server:
+        body = urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5).read().decode()
+
+    assert _value(body, 'lm_eval_runner_samples_total{lane="metered",status="ok"}') == 2
+    assert _value(body, 'lm_eval_runner_samples_failed_total{lane="metered"}') == 1
+    assert _value(body, 'lm_eval_runner_tokens_total{lane="metered",kind="output"}') == 4
+    assert _value(body, 'lm_eval_runner_sample_latency_seconds_count{lane="metered"}') == 3
+    assert _value(body, 'lm_eval_runner_sample_latency_seconds_bucket{lane="metered",le="+Inf"}') == 3
+    assert _value(body, 'lm_eval_runner_concurrency_limit{lane="metered"}') == 3
+    assert _value(body, 'lm_eval_runner_in_flight_requests{lane="metered"}') == 0
+    assert "# TYPE lm_eval_runner_rate_limit_wait_seconds histogram" in body
@@ -0,0 +1,193 @@
+import asyncio
+import collections
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+from lm_eval_so.core.backends.base import ChatBackend, backend_registry
+from lm_eval_so.core.context import RunnerContext
+from lm_eval_so.core.exceptions import BackendError
+from lm_eval_so.runner.models import (
+    ChatResponse,
+    DatasetInfo,
+    Message,
+    RunConfig,
+    RunRequest,
+    RunResultStatus,
+    TestSample,
+)
+from lm_eval_so.runner.runner_core import JobControl, RunnerConfig, run_async_job
+
+DATASET = DatasetInfo(dataset_id="d", name="d", version="1", source="test")
+
+
+class _ReplicaBackend(ChatBackend):
+    """Fake replica: ``url`` names it, ``delay`` sets its speed, ``fail`` makes it 503
+    and ``fail_every`` makes every n-th call 503."""
+
+    calls = 0
+
+    async def send(self, request):
+        self.calls += 1
+        await asyncio.sleep(float(self.backend_options.get("delay", 0.01)))
+        fail_every = self.backend_options.get("fail_every")
+        if self.backend_options.get("fail") or (fail_every and self.calls % fail_every == 0):
+            raise BackendError("HTTP 503", error_type="server_error", status_code=503, retryable=True)
+        return ChatResponse(text=f"from {self.backend_options['url']}")
+
+
+backend_registry.register("mock_replica", _ReplicaBackend)
+
+
+def _samples(n):
+    return [TestSample(id=f"s{i}", messages=[Message(role="user", content="hi")]) for i in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_slow_replica_gets_less_traffic_and_stats_are_recorded():
+    run_config = RunConfig(
+        backend="load-balanced",
+        backend_options={
+            "backend": "mock_replica",
+            "endpoints": [{"name": "fast", "url": "a", "delay": 0.01}, {"name": "slow", "url": "b", "delay": 0.1}],
+        },
+    )
+    control = JobControl()
+
+    results = await run_async_job(
+        DATASET, _samples(40), "load-balanced", run_config, RunnerConfig(max_concurrency=4), control=control
+    )
+
+    assert all(r.status == RunResultStatus.OK for r in results)
+    served = collections.Counter(r.response.replica for r in results)
+    assert served["fast"] > 2 * served["slow"]
+    replicas = {stats["name"]: stats for stats in control.metadata["backend"]["replicas"]}
+    assert replicas["fast"]["ok"] == served["fast"] and replicas["slow"]["requests"] == served["slow"]
+    assert replicas["slow"]["latency_ewma_ms"] > replicas["fast"]["latency_ewma_ms"]
+    assert results[0].to_record()["response"]["replica"] in {"fast", "slow"}
+
+
+def _request(timeout_seconds=5):
+    return RunRequest(
+        sample=_samples(1)[0],
+        run_config=RunConfig(backend="load-balanced"),
+        dataset_info=DATASET,
+        trace_id="t",
+        attempt=1,
+        timeout_seconds=timeout_seconds,
+    )
+
+
+async def _send_all(backend, n, timeout_seconds=5):
+    failures = []
+    for _ in range(n):
+        try:
+            await backend.send(_request(timeout_seconds))
+        except BackendError as exc:
+            failures.append(exc.details["replica"])
+    return failures
+
+
+@pytest.mark.asyncio
+async def test_failures_push_a_replica_behind_healthy_ones():
+    backend = backend_registry.create(
+        "load-balanced",
+        context=RunnerContext(),
+        backend="mock_replica",
+        endpoints=[{"name": "bad", "url": "a", "fail": True}, {"name": "good", "url": "b"}],
+    )
+
+    failures = await _send_all(backend, 20)
+
+    # the first failure scores like a timeout, so "bad" loses every later comparison
+    assert failures in ([], ["bad"])
+    bad = backend.to_metadata()["replicas"][0]
+    assert bad["latency_ewma_ms"] is None or bad["latency_ewma_ms"] >= 5000
+
+
+@pytest.mark.asyncio
+async def test_replica_failing_every_other_request_is_ejected():
+    backend = backend_registry.create(
+        "load-balanced",
+        context=RunnerContext(),
+        backend="mock_replica",
+        endpoints=[{"name": "flaky", "url": "a", "fail_every": 2, "delay": 0}],
+        eject_min_requests=4,
+        eject_seconds=60,
+    )
+
+    failures = await _send_all(backend, 8)
+
+    assert failures == ["flaky"] * 4
+    assert backend.to_metadata()["replicas"][0]["ejections"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cancellation_is_neutral_unless_it_is_the_request_timeout():
+    backend = backend_registry.create(
+        "load-balanced",
+        context=RunnerContext(),
+        backend="mock_replica",
+        endpoints=[{"name": "r", "url": "a", "delay": 0.2}],
+    )
+
+    # a hedge loser or an early stop cancels well before the request timeout
+    task = asyncio.ensure_future(backend.send(_request(timeout_seconds=5)))
+    await asyncio.sleep(0.02)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    stats = backend.to_metadata()["replicas"][0]
+    assert (stats["cancelled"], stats["errors"], stats["latency_ewma_ms"]) == (1, 0, None)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(backend.send(_request(timeout_seconds=0.05)), timeout=0.05)
+    stats = backend.to_metadata()["replicas"][0]
+    assert stats["errors"] == 1 and stats["latency_ewma_ms"] >= 50
+
+
+@pytest.mark.asyncio
+async def test_openai_connection_errors_and_5xx_eject_the_replica():
+    backend = backend_registry.create(
+        "load-balanced",
+        context=RunnerContext(),
+        endpoints=["http://127.0.0.1:9/v1"],
+        api_key="k",
+        model="m",
+        eject_min_requests=4,
+        eject_seconds=60,
+    )
+    errors = [
+        openai.APIConnectionError(request=None),
+        openai.InternalServerError("down", response=SimpleNamespace(status_code=503, headers={}, request=None), body=None),
+    ]
+
+    calls = []
+
+    async def create(**params):
+        calls.append(1)
+        raise errors[len(calls) % 2]
+
+    (replica,) = backend.replicas
+    replica.backend._client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(with_raw_response=SimpleNamespace(create=create)))
+    )
+
+    with pytest.raises(BackendError) as info:
+        await backend.send(_request(timeout_seconds=2))
+    # the openai backend reports these as generic api errors, not server/connection errors
+    assert (info.value.error_type, info.value.status_code) == ("api_error", 503)
+    failures = await _send_all(backend, 3, timeout_seconds=2)
+
+    assert len(failures) == 3
+    stats = backend.to_metadata()["replicas"][0]
+    assert stats["ejections"] == 1
+    assert stats["latency_ewma_ms"] >= 2000
+
+
+def test_endpoints_are_required():
+    backend = backend_registry.create("load-balanced", context=RunnerContext(), backend="mock_replica")
+    with pytest.raises(BackendError) as info:
+        asyncio.run(backend.send(None))
+    assert info.value.error_type == "config"
@@ -0,0 +1,70 @@
+import asyncio
+import random
+
+import pytest
+
+from lm_eval_so.core.backends.base import ChatBackend, backend_registry
+from lm_eval_so.runner.loadgen import LoadTestConfig, arrival_offsets, run_load_test
+from lm_eval_so.runner.models import ChatResponse, DatasetInfo, Message, RunConfig, RunRequest, TestSample
+
+
+class SlowBackend(ChatBackend):
+    seen_options = None
+
+    async def send(self, request: RunRequest) -> ChatResponse:
+        SlowBackend.seen_options = dict(self.context.options)
+        await asyncio.sleep(float(self.backend_options.get("delay", 0.01)))
+        return ChatResponse(text="ok")
+
+
+backend_registry.register("loadgen_slow", SlowBackend)
+
+DATASET = DatasetInfo(dataset_id="d", name="d", version="1", source="test")
+SAMPLES = [TestSample(id=f"s{i}", messages=[Message(role="user", content="hi")]) for i in range(3)]
+
+
+def test_poisson_arrivals_match_rate_on_average():
+    offsets = arrival_offsets(100.0, "poisson", random.Random(3))
+    times = [next(offsets) for _ in range(5000)]
+    assert times[-1] / len(times) == pytest.approx(0.01, rel=0.1)
+    constant = arrival_offsets(4.0, "constant", random.Random(0))
+    assert [next(constant) for _ in range(3)] == [0.0, 0.25, 0.5]
+    # no accumulated drift: the 10th arrival at 100/s lands exactly on a 0.1 s warmup edge
+    fast = arrival_offsets(100.0, "constant", random.Random(0))
+    assert [next(fast) for _ in range(11)][10] == 0.1
+
+
+@pytest.mark.asyncio
+async def test_open_loop_issues_at_rate_regardless_of_completions():
+    config = LoadTestConfig(rate=100.0, duration_seconds=0.3, arrival="constant", warmup_seconds=0.1)
+    run_config = RunConfig(backend="loadgen_slow", backend_options={"delay": 0.05})
+
+    report = await run_load_test(DATASET, SAMPLES, "loadgen_slow", run_config, config)
+
+    # 30 measured arrivals even though each request takes 5 arrival intervals
+    assert report.issued == 30
+    assert report.ok == 30 and report.dropped == 0
+    assert report.latency_ms["p50"] >= 50
+    assert report.achieved_throughput > 50
+
+
+@pytest.mark.asyncio
+async def test_arrivals_beyond_max_outstanding_are_dropped():
+    config = LoadTestConfig(rate=100.0, duration_seconds=0.2, arrival="constant", max_outstanding=2)
+    run_config = RunConfig(backend="loadgen_slow", backend_options={"delay": 0.2})
+
+    report = await run_load_test(DATASET, SAMPLES, "loadgen_slow", run_config, config)
+
+    assert report.ok == 2
+    assert report.dropped == report.issued - 2
+
+
+@pytest.mark.asyncio
+async def test_backend_pool_is_sized_for_max_outstanding():
+    config = LoadTestConfig(rate=50.0, duration_seconds=0.05, max_outstanding=256, timeout_seconds=7.0)
+    run_config = RunConfig(backend="loadgen_slow")
+
+    await run_load_test(DATASET, SAMPLES, "loadgen_slow", run_config, config)
+
+    assert SlowBackend.seen_options["max_concurrency"] == 256
+    assert SlowBackend.seen_options["timeout_seconds"] == 7.0
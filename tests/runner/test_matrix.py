@@ -0,0 +1,61 @@
+import asyncio
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from lm_eval_so.config import RunnerConfig, TesterConfig
+from lm_eval_so.core.backends.base import ChatBackend, backend_registry
+from lm_eval_so.runner.matrix import build_matrix_variants, load_variant_file
+from lm_eval_so.runner.models import ChatResponse, DatasetInfo, Message, TestSample
+from lm_eval_so.runner.runner_core import run_async_matrix_stream_job
+
+
+class TaggingBackend(ChatBackend):
+    async def send(self, request):
+        await asyncio.sleep(0.001)
+        return ChatResponse(text=f"{request.run_config.model}:{request.sample.id}")
+
+
+backend_registry.register("matrix_tagging", TaggingBackend)
+
+
+def test_tester_config_expresses_matrix_and_names_are_unique(tmp_path):
+    config_file = tmp_path / "tester.yaml"
+    config_file.write_text(
+        "runner:\n"
+        "  max_concurrency: 4\n"
+        "  variants:\n"
+        "    - {backend: matrix_tagging, model: m1, parameters: {temperature: 0.2}}\n"
+        "    - {backend: matrix_tagging, model: m1, parameters: {temperature: 0.2}, max_concurrency: 1}\n",
+        encoding="utf-8",
+    )
+    config = TesterConfig.load(config_file)
+    assert len(config.runner.variants) == 2
+    assert len(load_variant_file(config_file)) == 2
+
+    options = config.runner.model_copy(update={"output_dir": Path("/out")})
+    variants = build_matrix_variants(options)
+    assert [v.name for v in variants] == ["matrix_tagging_m1_temperature-0.2", "matrix_tagging_m1_temperature-0.2-1"]
+    assert [v.options.max_concurrency for v in variants] == [4, 1]
+    assert variants[1].options.output_dir == Path("/out") / variants[1].name
+
+
+@pytest.mark.asyncio
+async def test_matrix_job_runs_every_variant_sample_pair():
+    dataset = DatasetInfo(dataset_id="d", name=None, version=None, source=None)
+    samples = [TestSample(id=f"s{i}", messages=[Message(role="user", content="hi")]) for i in range(5)]
+    options = RunnerConfig(
+        max_concurrency=2,
+        variants=[
+            {"name": "a", "backend": "matrix_tagging", "model": "a"},
+            {"name": "b", "backend": "matrix_tagging", "model": "b", "max_concurrency": 1},
+        ],
+    )
+
+    seen = Counter()
+    async for name, result in run_async_matrix_stream_job(dataset, samples, build_matrix_variants(options)):
+        assert result.response.text == f"{name}:{result.sample_id}"
+        seen[name] += 1
+
+    assert seen == {"a": 5, "b": 5}
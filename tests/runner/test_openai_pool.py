@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from lm_eval_so.core.backends.base import ChatBackend, backend_registry
+from lm_eval_so.core.backends.http_pool import PoolTrace, pool_settings
+from lm_eval_so.runner.models import ChatResponse, DatasetInfo, Message, RunConfig, RunRequest, TestSample
+from lm_eval_so.runner.runner_core import RunnerConfig, _peak_concurrency, run_async_job
+from lm_eval_so.runner.storage import _build_summary
+
+
+class PooledBackend(ChatBackend):
+    async def send(self, request: RunRequest) -> ChatResponse:
+        assert self.context.options["max_concurrency"] == 3
+        await asyncio.sleep(0.01)
+        return ChatResponse(text="ok", pool_wait_ms=4.0)
+
+
+backend_registry.register("pool_reporting", PooledBackend)
+
+
+def test_pool_defaults_follow_runner_concurrency():
+    settings = pool_settings({}, {"max_concurrency": 200, "timeout_seconds": 30})
+    assert settings["max_connections"] == 200
+    assert settings["max_keepalive_connections"] == 200
+    assert settings["read_timeout"] == 30.0 and settings["pool_timeout"] == 30.0
+    assert settings["http2"] is False
+
+    overridden = pool_settings({"max_connections": 50, "http2": True, "read_timeout": 5}, {"max_concurrency": 200})
+    assert overridden["max_connections"] == 50 and overridden["max_keepalive_connections"] == 50
+    assert overridden["http2"] is True and overridden["read_timeout"] == 5.0
+
+
+def test_peak_concurrency_covers_adaptive_and_hedging():
+    assert _peak_concurrency(RunnerConfig(max_concurrency=8)) == 8
+    assert _peak_concurrency(RunnerConfig(max_concurrency=8, adaptive_concurrency=True)) == 32
+    assert _peak_concurrency(RunnerConfig(max_concurrency=100, hedge_percentile=95, hedge_budget=0.05)) == 105
+
+
+@pytest.mark.asyncio
+async def test_pool_trace_stops_at_first_connection_event():
+    trace = PoolTrace()
+    trace.start()
+    await asyncio.sleep(0.02)
+    await trace("connection.connect_tcp.started", {})
+    waited = trace.pool_wait_ms
+    await trace("http11.send_request_headers.started", {})
+    assert waited is not None and waited >= 15
+    assert trace.pool_wait_ms == waited
+
+
+@pytest.mark.asyncio
+async def test_pool_wait_is_recorded_as_a_phase():
+    dataset = DatasetInfo(dataset_id="d", name="d", version="1", source="test")
+    samples = [TestSample(id=f"s{i}", messages=[Message(role="user", content="hi")]) for i in range(3)]
+
+    results = await run_async_job(
+        dataset, samples, "pool_reporting", RunConfig(backend="pool_reporting"), RunnerConfig(max_concurrency=3)
+    )
+
+    assert all(r.phases[0].pool_wait_ms == 4.0 for r in results)
+    assert _build_summary(results)["phases"]["pool_wait_ms"]["avg"] == 4.0
@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from lm_eval_so.runner.journal import iter_journal_records, sort_journal
+from lm_eval_so.runner.models import Message, TestSample
+from lm_eval_so.runner.ordering import load_latency_history, order_samples
+
+
+def _sample(sample_id, chars):
+    return TestSample(id=sample_id, messages=[Message(role="user", content="x" * chars)])
+
+
+def test_lpt_orders_by_prompt_size_then_history():
+    samples = [_sample("short", 10), _sample("long", 4000), _sample("mid", 800)]
+
+    assert [s.id for s in order_samples(samples, "lpt")] == ["long", "mid", "short"]
+
+    history = {"short": 900.0, "long": 100.0}
+    # unknown cost ("mid") goes first, then slowest known
+    assert [s.id for s in order_samples(samples, "lpt", history=history)] == ["mid", "short", "long"]
+
+
+def test_shuffle_is_reproducible_and_unknown_order_rejected():
+    samples = [_sample(f"s{i}", 10) for i in range(20)]
+
+    first = [s.id for s in order_samples(samples, "shuffle", seed=7)]
+    assert first == [s.id for s in order_samples(samples, "shuffle", seed=7)]
+    assert sorted(first) == sorted(s.id for s in samples)
+    with pytest.raises(ValueError):
+        order_samples(samples, "fastest")
+
+
+def test_history_prefers_send_phases_and_sort_journal_restores_order(tmp_path):
+    path = tmp_path / "run_results.jsonl"
+    records = [
+        {"sample_id": "b", "status": "ok", "latency_ms": 500.0, "phases": [{"send_ms": 40.0}, {"send_ms": 60.0}]},
+        {"sample_id": "c", "status": "error", "latency_ms": 5.0},
+        {"sample_id": "a", "status": "ok", "latency_ms": 30.0},
+    ]
+    path.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+
+    assert load_latency_history(path) == {"b": 100.0, "a": 30.0}
+
+    sort_journal(path, ["a", "b", "c"])
+    assert [r["sample_id"] for r in iter_journal_records(path)] == ["a", "b", "c"]
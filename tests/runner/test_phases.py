@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from lm_eval_so.core.backends.base import ChatBackend, backend_registry
+from lm_eval_so.core.exceptions import BackendError
+from lm_eval_so.runner.models import ChatResponse, DatasetInfo, Message, RunConfig, RunRequest, TestSample
+from lm_eval_so.runner.runner_core import RunnerConfig, run_async_stream_job
+from lm_eval_so.runner.storage import _build_summary
+
+
+class FlakyBackend(ChatBackend):
+    async def send(self, request: RunRequest) -> ChatResponse:
+        await asyncio.sleep(0.05)
+        if request.sample.id == "flaky" and request.attempt == 1:
+            raise BackendError("overloaded", error_type="server_error", retryable=True)
+        return ChatResponse(text="ok")
+
+
+backend_registry.register("phases_flaky", FlakyBackend)
+
+
+@pytest.mark.asyncio
+async def test_phases_separate_service_time_from_harness_waits():
+    dataset = DatasetInfo(dataset_id="d", name="d", version="1", source="test")
+    samples = [TestSample(id=i, messages=[Message(role="user", content="hi")]) for i in ("a", "flaky")]
+    options = RunnerConfig(max_concurrency=1, retry_backoff_factor=0.1, retry_backoff_jitter=0.0)
+
+    results = {
+        r.sample_id: r
+        async for r in run_async_stream_job(dataset, samples, "phases_flaky", RunConfig(backend="phases_flaky"), options)
+    }
+
+    flaky = results["flaky"]
+    assert [p.attempt for p in flaky.phases] == [1, 2]
+    assert flaky.phases[0].semaphore_wait_ms >= 40
+    assert flaky.phases[0].send_ms >= 40
+    assert flaky.phases[0].backoff_ms > 0
+    assert flaky.phases[1].backoff_ms == 0
+    assert results["a"].phases[0].semaphore_wait_ms < 40
+
+    summary = _build_summary(results.values())
+    phases = summary["phases"]
+    assert phases["send_ms"]["min"] >= 40
+    assert phases["harness_wait_ms"]["max"] >= phases["semaphore_wait_ms"]["max"]
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from lm_eval_so.core.models import Message
+from lm_eval_so.runner.rate_limit import RateLimiter, TokenBucket, estimate_request_tokens
+
+
+def test_token_bucket_allows_burst_then_spaces_requests():
+    bucket = TokenBucket(rate_per_sec=10.0, capacity=3)
+    waits = [bucket.reserve(1) for _ in range(5)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.1, abs=0.01)
+    assert waits[4] == pytest.approx(0.2, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_settles_token_estimate_with_actual_usage():
+    limiter = RateLimiter(tokens_per_minute=6000, token_burst=1000)
+    permit = await limiter.acquire(estimated_tokens=800)
+    assert permit.wait_seconds == 0.0
+
+    limiter.settle(permit, actual_tokens=100)
+    # 700 tokens were refunded, so a second 800-token request fits without waiting
+    second = await limiter.acquire(estimated_tokens=800)
+    assert second.wait_seconds == 0.0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_does_not_serialize_concurrent_callers():
+    limiter = RateLimiter(requests_per_second=20.0, request_burst=5)
+    permits = await asyncio.gather(*(limiter.acquire() for _ in range(5)))
+    assert all(p.wait_seconds == 0.0 for p in permits)
+
+
+def test_estimate_request_tokens_uses_max_tokens_parameter():
+    messages = [Message(role="user", content="x" * 400)]
+    assert estimate_request_tokens(messages, {"max_tokens": 50}, 256) == 100 + 4 + 50
+    assert estimate_request_tokens(messages, {}, 256) == 100 + 4 + 256
+
+
+def test_try_acquire_never_goes_into_debt():
+    limiter = RateLimiter(requests_per_second=1.0, request_burst=2, tokens_per_minute=600, token_burst=100)
+    assert limiter.try_acquire(estimated_tokens=60) is not None
+    # 40 tokens left: a second 60-token permit is refused without debiting either bucket
+    assert limiter.try_acquire(estimated_tokens=60) is None
+    assert limiter.try_acquire(estimated_tokens=30) is not None
+    assert limiter.try_acquire(estimated_tokens=1) is None
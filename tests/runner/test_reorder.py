@@ -0,0 +1,83 @@
+import asyncio
+import random
+
+import pytest
+
+from lm_eval_so.core.backends.base import ChatBackend, backend_registry
+from lm_eval_so.runner.models import ChatResponse, DatasetInfo, Message, RunConfig, RunRequest, TestSample
+from lm_eval_so.runner.reorder import ReorderBuffer
+from lm_eval_so.runner.runner_core import JobControl, RunnerConfig, run_async_stream_job
+
+
+class JitterBackend(ChatBackend):
+    async def send(self, request: RunRequest) -> ChatResponse:
+        await asyncio.sleep(random.random() * 0.02)
+        return ChatResponse(text="x" * 200)
+
+
+backend_registry.register("reorder_jitter", JitterBackend)
+
+DATASET = DatasetInfo(dataset_id="d", name="d", version="1", source="test")
+SAMPLES = [TestSample(id=f"s{i}", messages=[Message(role="user", content="hi")]) for i in range(40)]
+
+
+def test_buffer_releases_in_sequence_and_spills_past_cap(tmp_path):
+    buffer = ReorderBuffer(max_bytes=1, spill=True, spill_dir=tmp_path)
+    assert buffer.push(2, "c") == []
+    assert buffer.push(1, "b") == []
+    assert buffer.spilled_items == 2 and len(list(tmp_path.iterdir())) == 1
+    assert buffer.push(0, "a") == ["a", "b", "c"]
+    assert buffer.push(4, "e") == []
+    assert buffer.drain() == ["e"]
+    buffer.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_throttle_mode_reports_over_capacity():
+    buffer = ReorderBuffer(max_bytes=1, spill=False)
+    buffer.push(1, "b")
+    assert buffer.over_capacity
+    assert buffer.push(0, "a") == ["a", "b"]
+    assert not buffer.over_capacity
+
+
+@pytest.mark.asyncio
+async def test_zero_cap_still_schedules_every_sample():
+    assert not ReorderBuffer(max_bytes=0).over_capacity
+    options = RunnerConfig(max_concurrency=4, ordered_output=True, reorder_buffer_max_bytes=0)
+
+    results = [
+        r
+        async for r in run_async_stream_job(
+            DATASET, SAMPLES[:5], "reorder_jitter", RunConfig(backend="reorder_jitter"), options
+        )
+    ]
+
+    assert [r.sample_id for r in results] == [s.id for s in SAMPLES[:5]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("overflow", ["throttle", "spill"])
+async def test_ordered_output_yields_dataset_order(overflow, tmp_path):
+    options = RunnerConfig(
+        max_concurrency=8,
+        ordered_output=True,
+        reorder_buffer_max_bytes=2048,
+        reorder_overflow=overflow,
+        output_dir=tmp_path,
+    )
+    control = JobControl()
+
+    results = [
+        r
+        async for r in run_async_stream_job(
+            DATASET, SAMPLES, "reorder_jitter", RunConfig(backend="reorder_jitter"), options, control=control
+        )
+    ]
+
+    assert [r.sample_id for r in results] == [s.id for s in SAMPLES]
+    meta = control.metadata["reorder_buffer"]
+    assert meta["overflow"] == overflow
+    if overflow == "throttle":
+        assert meta["spilled_items"] == 0
+    assert list(tmp_path.iterdir()) == []
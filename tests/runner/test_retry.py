@@ -0,0 +1,109 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+from lm_eval_so.core.backends.base import ChatBackend, backend_registry
+from lm_eval_so.core.context import RunnerContext
+from lm_eval_so.core.exceptions import BackendError
+from lm_eval_so.runner.models import ChatResponse, DatasetInfo, Message, RunConfig, RunRequest, TestSample
+from lm_eval_so.runner.retry import RetryBudget, parse_retry_after
+from lm_eval_so.runner.runner_core import JobControl, RunnerConfig, _calc_backoff, run_async_stream_job
+
+
+class FlakyBackend(ChatBackend):
+    calls = 0
+
+    async def send(self, request: RunRequest) -> ChatResponse:
+        FlakyBackend.calls += 1
+        raise BackendError(
+            "429",
+            error_type="rate_limit",
+            status_code=429,
+            retryable=True,
+            details={"headers": {"retry-after-ms": "1"}},
+        )
+
+
+backend_registry.register("retry_flaky", FlakyBackend)
+
+
+def test_parse_retry_after_variants():
+    now = datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert parse_retry_after({"Retry-After": "3"}) == 3.0
+    assert parse_retry_after({"retry-after-ms": "250", "retry-after": "9"}) == 0.25
+    assert parse_retry_after({"retry-after": "Thu, 01 Jan 2026 12:00:05 GMT"}, now=now) == 5.0
+    assert parse_retry_after({"retry-after": "soon"}) is None
+    assert parse_retry_after(None) is None
+
+
+def test_backoff_honors_retry_after_with_cap():
+    options = RunnerConfig(retry_backoff_jitter=0.0, retry_after_max_seconds=10.0)
+    assert _calc_backoff(1, options, retry_after=4.0) == 4.0
+    assert _calc_backoff(1, options, retry_after=120.0) == 10.0
+    assert _calc_backoff(3, options) == 4.0
+
+
+@pytest.mark.asyncio
+async def test_openai_5xx_forwards_retry_after():
+    response = SimpleNamespace(status_code=503, headers={"Retry-After": "3", "Content-Type": "json"}, request=None)
+
+    async def create(**params):
+        raise openai.InternalServerError("overloaded", response=response, body=None)
+
+    backend = backend_registry.create("openai", context=RunnerContext(), model="m")
+    backend._client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(with_raw_response=SimpleNamespace(create=create)))
+    )
+    request = RunRequest(
+        sample=TestSample(id="s1", messages=[Message(role="user", content="hi")]),
+        run_config=RunConfig(backend="openai"),
+        dataset_info=DatasetInfo(dataset_id="d", name="d", version="1", source="test"),
+        trace_id="t",
+        attempt=1,
+        timeout_seconds=5,
+    )
+
+    with pytest.raises(BackendError) as info:
+        await backend.send(request)
+
+    assert (info.value.status_code, info.value.retryable) == (503, True)
+    assert info.value.details == {"headers": {"retry-after": "3"}}
+    assert parse_retry_after(info.value.details["headers"]) == 3.0
+
+
+def test_retry_budget_allows_min_then_ratio():
+    budget = RetryBudget(ratio=0.5, min_retries=1)
+    budget.record_request()
+    assert budget.try_acquire() is True
+    assert budget.try_acquire() is False
+    budget.record_request()
+    budget.record_request()
+    assert budget.try_acquire() is True
+    assert budget.to_metadata()["denied"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_caps_retries_across_the_job():
+    FlakyBackend.calls = 0
+    dataset = DatasetInfo(dataset_id="d", name="d", version="1", source="test")
+    samples = [TestSample(id=f"s{i}", messages=[Message(role="user", content="hi")]) for i in range(20)]
+    options = RunnerConfig(
+        max_concurrency=4, max_retries=5, retry_backoff_jitter=0.0, retry_budget_ratio=0.1, retry_budget_min=2
+    )
+    control = JobControl()
+
+    results = [
+        r
+        async for r in run_async_stream_job(
+            dataset, samples, "retry_flaky", RunConfig(backend="retry_flaky"), options, control=control
+        )
+    ]
+
+    meta = control.metadata["retry_budget"]
+    assert meta["requests"] == 20
+    assert meta["retries"] <= 2 + 0.1 * 20
+    # without the budget this would be 20 * 6 calls
+    assert FlakyBackend.calls == 20 + meta["retries"]
+    assert sum(1 for r in results if r.request_context.get("retry_budget_exhausted")) >= 15
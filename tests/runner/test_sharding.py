@@ -0,0 +1,77 @@
+import argparse
+
+import pytest
+
+from lm_eval_so.config import RunnerConfig
+from lm_eval_so.core.storage import LocalFileSystemStorage
+from lm_eval_so.runner.cli import _finish_run, main
+from lm_eval_so.runner.journal import ResultJournal, iter_journal_records
+from lm_eval_so.runner.models import DatasetInfo, Message, RunConfig, TestSample
+from lm_eval_so.runner.runner_core import JobControl
+from lm_eval_so.runner.sharding import SHARDS_DIRNAME, merge_shard_results, scale_options_for_shards, shard_of
+
+
+def test_shard_of_is_deterministic_and_covers_all_shards():
+    ids = [f"sample-{i}" for i in range(400)]
+    first = [shard_of(i, 4) for i in ids]
+    assert first == [shard_of(i, 4) for i in ids]
+    assert set(first) == {0, 1, 2, 3}
+
+
+def test_scaled_rate_limits_sum_to_global_budget():
+    options = RunnerConfig(max_concurrency=10, rate_limit_per_second=9.0, tokens_per_minute=90000)
+    scaled = scale_options_for_shards(options, 3)
+    assert scaled.rate_limit_per_second * 3 == pytest.approx(9.0)
+    assert scaled.tokens_per_minute * 3 == pytest.approx(90000)
+    assert scaled.max_concurrency == 4
+
+
+def test_merge_shard_results_appends_and_removes_shard_dirs(tmp_path):
+    for index, ids in enumerate([["a", "c"], ["b"]]):
+        with ResultJournal(tmp_path / SHARDS_DIRNAME / f"shard-{index}" / "run_results.jsonl") as journal:
+            for sample_id in ids:
+                journal.append({"sample_id": sample_id, "status": "ok"})
+
+    with ResultJournal(tmp_path / "run_results.jsonl") as journal:
+        assert merge_shard_results(tmp_path, journal) == 3
+
+    assert sorted(r["sample_id"] for r in iter_journal_records(tmp_path / "run_results.jsonl")) == ["a", "b", "c"]
+    assert not (tmp_path / SHARDS_DIRNAME).exists()
+
+
+def test_ordered_output_restores_dataset_order_after_a_sharded_merge(tmp_path):
+    for index, ids in enumerate([["a", "c"], ["b"]]):
+        with ResultJournal(tmp_path / SHARDS_DIRNAME / f"shard-{index}" / "run_results.jsonl") as journal:
+            for sample_id in ids:
+                journal.append({"sample_id": sample_id, "status": "ok"})
+    with ResultJournal(tmp_path / "run_results.jsonl") as journal:
+        merge_shard_results(tmp_path, journal)
+    samples = [TestSample(id=i, messages=[Message(role="user", content=i)]) for i in ("a", "b", "c")]
+
+    _finish_run(
+        argparse.Namespace(resume=False, workers=2),
+        LocalFileSystemStorage(tmp_path),
+        DatasetInfo(dataset_id="d", name="d", version="1", source="test"),
+        RunConfig(backend="mock"),
+        RunnerConfig(ordered_output=True),
+        control=JobControl(),
+        samples=samples,
+        skipped=0,
+        executed=3,
+        extra={"workers": 2, "shards": []},
+    )
+
+    assert [r["sample_id"] for r in iter_journal_records(tmp_path / "run_results.jsonl")] == ["a", "b", "c"]
+
+
+def test_workers_are_rejected_for_matrix_runs(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        main(
+            [
+                "--dataset", str(tmp_path / "d.jsonl"),
+                "--output-dir", str(tmp_path / "out"),
+                "--matrix", str(tmp_path / "m.yaml"),
+                "--workers", "2",
+            ]
+        )
+    assert "--workers is not supported with --matrix" in capsys.readouterr().err
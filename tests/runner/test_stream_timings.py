@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+
+import pytest
+
+from lm_eval_so.core.backends.openai_backend import OpenAIChatBackend
+from lm_eval_so.core.context import RunnerContext
+from lm_eval_so.runner.models import (
+    ChatResponse,
+    DatasetInfo,
+    Message,
+    RunConfig,
+    RunRequest,
+    StreamTimings,
+    TestSample,
+)
+from lm_eval_so.runner.storage import _build_summary
+
+
+def _chunk(content=None, finish_reason=None, usage=None):
+    choices = [] if content is None and finish_reason is None else [
+        SimpleNamespace(index=0, delta=SimpleNamespace(content=content), finish_reason=finish_reason)
+    ]
+    return SimpleNamespace(id="cmpl-1", model="m", choices=choices, usage=usage)
+
+
+class _FakeStream:
+    def __init__(self, chunks):
+        self._chunks = list(chunks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._chunks:
+            raise StopAsyncIteration
+        return self._chunks.pop(0)
+
+
+class _FakeClient:
+    def __init__(self, chunks):
+        self.params = None
+        self._chunks = chunks
+        self.chat = SimpleNamespace(
+            completions=SimpleNamespace(with_raw_response=SimpleNamespace(create=self._create))
+        )
+
+    async def _create(self, **params):
+        self.params = params
+        return SimpleNamespace(headers={"x-request-id": "r1"}, parse=lambda: _FakeStream(self._chunks))
+
+
+def test_stream_timings_from_chunk_times():
+    timings = StreamTimings.from_chunk_times(0.0, [0.2, 0.25, 0.3, 0.4], 0.5, output_tokens=4)
+
+    assert timings.ttft_ms == pytest.approx(200.0)
+    assert timings.itl_mean_ms == pytest.approx(200.0 / 3)
+    assert timings.output_tokens_per_second == pytest.approx(15.0)
+    assert timings.chunks == 4
+    assert StreamTimings.from_dict(timings.to_dict()) == timings
+
+
+@pytest.mark.asyncio
+async def test_openai_stream_mode_assembles_text_and_timings():
+    usage = SimpleNamespace(prompt_tokens=3, completion_tokens=2, total_tokens=5)
+    client = _FakeClient([_chunk("Hel"), _chunk("lo", finish_reason="stop"), _chunk(usage=usage)])
+    backend = OpenAIChatBackend(context=RunnerContext())
+    backend.configure(stream=True)
+    backend._client = client
+    request = RunRequest(
+        sample=TestSample(id="s1", messages=[Message(role="user", content="hi")]),
+        run_config=RunConfig(backend="openai", model="m"),
+        dataset_info=DatasetInfo(dataset_id="d", name="d", version="1", source="test"),
+        trace_id="t1",
+        attempt=1,
+        timeout_seconds=None,
+    )
+
+    response = await backend.send(request)
+
+    assert client.params["stream"] is True
+    assert client.params["stream_options"] == {"include_usage": True}
+    assert response.text == "Hello"
+    assert response.finish_reason == "stop"
+    assert response.usage.total_tokens == 5
+    assert response.timings.chunks == 2
+    assert response.timings.ttft_ms is not None
+    assert ChatResponse.from_dict(response.to_dict()).timings == response.timings
+
+
+def test_summary_aggregates_stream_timings():
+    records = [
+        {"status": "ok", "response": {"timings": {"ttft_ms": float(v), "itl_mean_ms": 10.0}}}
+        for v in range(1, 101)
+    ]
+    records.append({"status": "ok", "response": {}})
+
+    summary = _build_summary(records)
+
+    ttft = summary["streaming"]["ttft_ms"]
+    assert ttft["min"] == 1.0 and ttft["max"] == 100.0
+    assert ttft["p50"] == pytest.approx(50.5)
+    assert "output_tokens_per_second" not in summary["streaming"]
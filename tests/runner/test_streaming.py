@@ -9,7 +9,7 @@ from unittest.mock import MagicMock
 sys.modules["openai"] = MagicMock()
 
 from typing import List, AsyncIterator
-from lm_eval_so.runner.runner_core import run_async_stream_job, run_job, RunnerConfig
+from lm_eval_so.runner.runner_core import run_async_stream_job, run_job, run_stream_job, RunnerConfig
 from lm_eval_so.runner.models import DatasetInfo, RunConfig, TestSample, RunResultStatus, RunResult, RunRequest, ChatResponse
 from lm_eval_so.core.backends.base import ChatBackend, backend_registry
 from lm_eval_so.core.context import RunnerContext
@@ -21,7 +21,7 @@ class MockStreamingBackend(ChatBackend):
 
     async def send(self, request: RunRequest) -> ChatResponse:
         # Simulate delay
-        await asyncio.sleep(self.delay)
+        await asyncio.sleep(self.backend_options.get("delay", self.delay))
         return ChatResponse(text=f"Response for {request.sample.id}")
 
 import pytest
@@ -70,6 +70,83 @@ def test_run_job_sync_wrapper():
     assert len(results) == 3
     assert all(r.status == RunResultStatus.OK for r in results)
 
+@pytest.mark.asyncio
+async def test_run_async_stream_job_bounds_live_tasks_for_lazy_samples():
+    dataset = DatasetInfo(dataset_id="test_ds_lazy", name="Lazy", version="1.0", source="test")
+    pulled = 0
+    completed = 0
+    max_outstanding = 0
+
+    def sample_gen():
+        nonlocal pulled, max_outstanding
+        for i in range(50):
+            pulled += 1
+            max_outstanding = max(max_outstanding, pulled - completed)
+            yield TestSample(id=f"s{i}", messages=[{"role": "user", "content": "hello"}])
+
+    run_config = RunConfig(backend="mock_streaming", backend_options={"delay": 0.001})
+    options = RunnerConfig(max_concurrency=2, task_window_factor=3)
+
+    async for _ in run_async_stream_job(dataset, sample_gen(), "mock_streaming", run_config, options):
+        completed += 1
+
+    assert completed == 50
+    # one extra pull is allowed: the sample that is about to fill a freed slot
+    assert max_outstanding <= 2 * 3 + 1
+
+
+def test_run_stream_job_keeps_requests_flowing_while_consumer_is_busy():
+    dataset = DatasetInfo(dataset_id="test_ds_bridge", name="Bridge", version="1.0", source="test")
+    samples = [TestSample(id=f"s{i}", messages=[{"role": "user", "content": "hello"}]) for i in range(4)]
+    run_config = RunConfig(backend="mock_streaming", backend_options={"delay": 0.05})
+    options = RunnerConfig(max_concurrency=1)
+
+    completed_at = []
+    consumer_done = None
+    for result in run_stream_job(dataset, samples, "mock_streaming", run_config, options):
+        completed_at.append(result.completed_at.timestamp())
+        if consumer_done is None:
+            time.sleep(0.3)  # slow consumer, e.g. writing files
+            consumer_done = time.time()
+
+    assert len(completed_at) == 4
+    # the remaining samples ran (sequentially) while the consumer was blocked
+    assert sum(1 for t in completed_at[1:] if t < consumer_done) >= 2
+
+
+def test_run_stream_job_applies_backpressure_and_stops_early():
+    dataset = DatasetInfo(dataset_id="test_ds_bp", name="Backpressure", version="1.0", source="test")
+    pulled = 0
+
+    def sample_gen():
+        nonlocal pulled
+        for i in range(100):
+            pulled += 1
+            yield TestSample(id=f"s{i}", messages=[{"role": "user", "content": "hello"}])
+
+    run_config = RunConfig(backend="mock_streaming", backend_options={"delay": 0.001})
+    options = RunnerConfig(max_concurrency=2, task_window_factor=1, result_buffer_size=3)
+
+    stream = run_stream_job(dataset, sample_gen(), "mock_streaming", run_config, options)
+    next(stream)
+    time.sleep(0.2)
+    # buffer (3) + live window (2) + the sample about to be scheduled, plus the one consumed
+    assert pulled <= 1 + 3 + 2 + 1
+    stream.close()
+    assert pulled < 100
+
+
+@pytest.mark.asyncio
+async def test_run_job_works_inside_running_event_loop():
+    dataset = DatasetInfo(dataset_id="test_ds_nested", name="Nested", version="1.0", source="test")
+    samples = [TestSample(id=f"s{i}", messages=[{"role": "user", "content": "hello"}]) for i in range(3)]
+    run_config = RunConfig(backend="mock_streaming", backend_options={"delay": 0.01})
+
+    results = run_job(dataset, samples, "mock_streaming", run_config, RunnerConfig(max_concurrency=3))
+
+    assert len(results) == 3
+
+
 if __name__ == "__main__":
     # Allow running this file directly for manual verification
     asyncio.run(test_run_async_stream_job_yields_results())
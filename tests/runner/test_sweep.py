@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from lm_eval_so.config import RunnerConfig
+from lm_eval_so.core.backends.base import ChatBackend, backend_registry
+from lm_eval_so.runner.models import ChatResponse, DatasetInfo, Message, RunConfig, RunRequest, TestSample
+from lm_eval_so.runner.sweep import SweepStep, find_knee, run_concurrency_sweep
+
+_CAPACITY = asyncio.Semaphore(4)
+
+
+class SaturatingBackend(ChatBackend):
+    """Serves at most 4 requests at a time; extra requests queue inside the backend."""
+
+    async def send(self, request: RunRequest) -> ChatResponse:
+        async with _CAPACITY:
+            await asyncio.sleep(0.02)
+        return ChatResponse(text="ok")
+
+
+class FixedLatencyBackend(ChatBackend):
+    async def send(self, request: RunRequest) -> ChatResponse:
+        await asyncio.sleep(0.02)
+        return ChatResponse(text="ok")
+
+
+backend_registry.register("sweep_saturating", SaturatingBackend)
+backend_registry.register("sweep_fixed", FixedLatencyBackend)
+
+DATASET = DatasetInfo(dataset_id="d", name="d", version="1", source="test")
+SAMPLES = [TestSample(id=f"s{i}", messages=[Message(role="user", content="hi")]) for i in range(48)]
+
+
+def _step(concurrency, throughput, p50, errors=0):
+    return SweepStep(concurrency, 10, 10 - errors, errors, 1.0, throughput, p50, p50, p50)
+
+
+def test_knee_is_first_level_without_throughput_gain():
+    steps = [_step(1, 10, 100), _step(2, 19, 105), _step(4, 20, 200), _step(8, 20, 400)]
+    assert find_knee(steps) == 2
+    assert find_knee(steps[:2]) is None
+    assert find_knee([_step(1, 10, 100), _step(2, 19, 100, errors=3)]) == 1
+
+
+@pytest.mark.asyncio
+async def test_sweep_recommends_backend_capacity():
+    run_config = RunConfig(backend="sweep_saturating")
+    options = RunnerConfig(max_retries=0)
+
+    report = await run_concurrency_sweep(
+        DATASET, SAMPLES, "sweep_saturating", run_config, options, levels=[1, 2, 4, 8, 16]
+    )
+
+    assert [s.concurrency for s in report.steps][:3] == [1, 2, 4]
+    assert report.recommended_max_concurrency == 4
+    assert report.knee == 8
+    assert report.steps[0].ok == len(SAMPLES)
+    assert "recommended max_concurrency: 4" in report.to_table()
+    assert report.to_dict()["steps"][0]["concurrency"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sweep_latency_is_backend_service_time():
+    report = await run_concurrency_sweep(
+        DATASET,
+        SAMPLES[:16],
+        "sweep_fixed",
+        RunConfig(backend="sweep_fixed"),
+        RunnerConfig(max_retries=0),
+        levels=[1, 2, 4],
+        stop_at_knee=False,
+    )
+
+    for step in report.steps:
+        assert 18 <= step.latency_p50_ms < 35, step
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from lm_eval_so.core.backends.base import ChatBackend, backend_registry
+from lm_eval_so.runner.models import ChatResponse, DatasetInfo, Message, RunConfig, RunRequest, TestSample
+from lm_eval_so.runner.runner_core import JobControl, RunnerConfig, run_async_stream_job
+from lm_eval_so.runner.storage import _build_summary
+
+
+class ColdStartBackend(ChatBackend):
+    """First two requests are slow (cold), the rest fast; remembers what it was sent."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.sent = []
+
+    async def send(self, request: RunRequest) -> ChatResponse:
+        self.sent.append(request.sample.id)
+        await asyncio.sleep(0.1 if len(self.sent) <= 2 else 0.005)
+        return ChatResponse(text="ok")
+
+
+backend_registry.register("warmup_cold", ColdStartBackend)
+
+DATASET = DatasetInfo(dataset_id="d", name="d", version="1", source="test")
+SAMPLES = [TestSample(id=f"s{i}", messages=[Message(role="user", content="hi")]) for i in range(10)]
+
+
+async def _run(options):
+    control = JobControl()
+    results = [
+        r
+        async for r in run_async_stream_job(
+            DATASET, SAMPLES, "warmup_cold", RunConfig(backend="warmup_cold"), options, control=control
+        )
+    ]
+    return results, control.metadata
+
+
+@pytest.mark.asyncio
+async def test_synthetic_warmup_is_sent_first_and_not_yielded():
+    results, metadata = await _run(RunnerConfig(max_concurrency=1, warmup_requests=2))
+
+    assert sorted(r.sample_id for r in results) == sorted(s.id for s in SAMPLES)
+    assert metadata["warmup"]["mode"] == "synthetic"
+    assert metadata["warmup"]["requests"] == 2 and metadata["warmup"]["ok"] == 2
+    summary = _build_summary(results)
+    assert summary["latency_ms"]["max"] < 100
+    assert "warmup" not in summary
+
+
+@pytest.mark.asyncio
+async def test_tagged_warmup_results_are_excluded_from_headline_stats():
+    results, metadata = await _run(RunnerConfig(max_concurrency=1, task_window_factor=1, warmup_requests=2, warmup_mode="tagged"))
+
+    assert len(results) == len(SAMPLES)
+    warm = [r for r in results if r.request_context.get("warmup")]
+    assert [r.sample_id for r in warm] == ["s0", "s1"]
+    summary = _build_summary(results)
+    assert summary["warmup"]["count"] == 2
+    assert summary["warmup"]["latency_ms"]["min"] >= 100
+    assert summary["latency_ms"]["max"] < 100
+    assert summary["throughput"]["ok_per_second"] > 0
+    assert metadata["warmup"]["requests"] == 2
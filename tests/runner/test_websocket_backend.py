@@ -0,0 +1,131 @@
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+
+from lm_eval_so.core.backends.base import backend_registry
+from lm_eval_so.core.context import RunnerContext
+from lm_eval_so.core.exceptions import BackendError
+from lm_eval_so.runner.models import DatasetInfo, Message, RunConfig, RunRequest, RunResultStatus, TestSample
+from lm_eval_so.runner.runner_core import RunnerConfig, run_async_job
+
+websockets_server = pytest.importorskip("websockets.asyncio.server")
+websockets_exceptions = pytest.importorskip("websockets.exceptions")
+
+DATASET = DatasetInfo(dataset_id="d", name="d", version="1", source="test")
+
+
+class _Stub:
+    """Streams each prompt back word by word; ``slow`` stalls for a while first."""
+
+    def __init__(self):
+        self.connections = 0
+
+    async def handler(self, ws):
+        self.connections += 1
+        tasks = []
+        async for raw in ws:
+            tasks.append(asyncio.ensure_future(self._reply(ws, json.loads(raw))))
+
+    async def _reply(self, ws, payload):
+        rid = payload.get("id")
+        if payload["query"] == "slow":
+            await asyncio.sleep(0.5)
+        words = payload["query"].split()
+        try:
+            for word in words:
+                await ws.send(json.dumps({"id": rid, "delta": word + " "}))
+                await asyncio.sleep(0.01)
+            await ws.send(json.dumps({"id": rid, "done": True, "usage": {"out": len(words)}}))
+        except websockets_exceptions.ConnectionClosed:
+            pass  # the client gave up on this request
+
+
+@pytest_asyncio.fixture
+async def stub():
+    server = _Stub()
+    async with websockets_server.serve(server.handler, "127.0.0.1", 0) as ws_server:
+        port = ws_server.sockets[0].getsockname()[1]
+        server.url = f"ws://127.0.0.1:{port}/chat"
+        yield server
+
+
+def _options(url, **extra):
+    return {
+        "url": url,
+        "request_template": '{"query": {{ prompt | tojson }}}',
+        "chunk_path": "delta",
+        "done_path": "done",
+        "output_tokens_path": "usage.out",
+        **extra,
+    }
+
+
+def _request(content):
+    return RunRequest(
+        sample=TestSample(id="s1", messages=[Message(role="user", content=content)]),
+        run_config=RunConfig(backend="websocket", model="bot"),
+        dataset_info=DATASET,
+        trace_id="t-1",
+        attempt=1,
+        timeout_seconds=5,
+    )
+
+
+@pytest.mark.asyncio
+async def test_multiplexes_streams_over_one_connection_and_records_timings(stub):
+    backend = backend_registry.create(
+        "websocket", context=RunnerContext(options={"max_concurrency": 4}), **_options(stub.url, id_field="id")
+    )
+
+    responses = await asyncio.gather(*(backend.send(_request(f"reply number {i}")) for i in range(4)))
+
+    assert [r.text for r in responses] == [f"reply number {i} " for i in range(4)]
+    assert stub.connections == 1
+    timings = responses[0].timings
+    assert timings.ttft_ms is not None and timings.ttft_ms > 0
+    assert timings.chunks == 3 and timings.itl_p50_ms is not None
+
+
+@pytest.mark.asyncio
+async def test_exclusive_connections_are_pooled_and_reused(stub):
+    backend = backend_registry.create(
+        "websocket", context=RunnerContext(options={"max_concurrency": 4}), **_options(stub.url, pool_size=2)
+    )
+
+    for _ in range(2):
+        responses = await asyncio.gather(*(backend.send(_request("a b")) for _ in range(5)))
+        assert all(r.text == "a b " for r in responses)
+
+    assert stub.connections == 2
+
+
+@pytest.mark.asyncio
+async def test_runner_timeout_discards_connection_and_pool_recovers(stub):
+    samples = [TestSample(id="s0", messages=[Message(role="user", content="slow")])]
+    run_config = RunConfig(backend="websocket", model="bot", backend_options=_options(stub.url, pool_size=1))
+    options = RunnerConfig(max_concurrency=1, timeout_seconds=0.2, max_retries=1, retry_backoff_jitter=0.0)
+
+    result = await run_async_job(DATASET, samples, "websocket", run_config, options)
+
+    record = result[0]
+    assert record.status == RunResultStatus.TIMEOUT and record.attempts == 2
+    # the timed-out exclusive connection still had frames in flight, so each attempt got a fresh one
+    assert stub.connections == 2
+
+    samples = [TestSample(id="s1", messages=[Message(role="user", content="fine now")])]
+    result = await run_async_job(DATASET, samples, "websocket", run_config, options)
+    assert result[0].status == RunResultStatus.OK and result[0].response.text == "fine now "
+
+
+@pytest.mark.asyncio
+async def test_chunked_replies_require_done_path(stub):
+    options = _options(stub.url)
+    del options["done_path"]
+    backend = backend_registry.create("websocket", context=RunnerContext(), **options)
+
+    with pytest.raises(BackendError) as info:
+        await backend.send(_request("a b"))
+
+    assert info.value.error_type == "config" and stub.connections == 0